@@ -0,0 +1,182 @@
+"""
+Headless benchmark of floor generation over every floor in gamedata.db.
+
+Every floor of every dungeon is built with FloorFactory.create_floor a number
+of times under a fixed seed, and per Structure latency percentiles, retry
+counts and peak memory are reported as JSON:
+
+    python -m app.benchmark.floor_generation --runs 10 --seed 0 -o out.json
+
+With --cache, layouts are loaded from a LayoutCache in the given directory,
+and only generated and stored on a miss, so a second run with the same seed
+skips building the floor structures.
+"""
+
+import argparse
+from collections import defaultdict
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from app.benchmark.stats import percentile
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory, GenerationStats, floor_seed
+from app.dungeon.layout_cache import LayoutCache
+from app.dungeon.structure import Structure
+from app.pokemon.party import Party
+from app.pokemon.pokemon_factory import user_pokemon_factory
+import app.db.dungeon_data as dungeon_data_db
+import app.db.floor_data as floor_data_db
+
+
+def load_floors(dungeon_ids: list[int] = None) -> list[tuple[int, FloorData]]:
+    """
+    :param dungeon_ids: The dungeons to load, or None for every dungeon.
+    :return: (dungeon id, floor data) for every floor with a generated layout.
+    """
+    if dungeon_ids is None:
+        dungeon_ids = [d.dungeon_id for d in dungeon_data_db.all_dungeons()]
+    return [
+        (dungeon_id, data)
+        for dungeon_id in dungeon_ids
+        for data in floor_data_db.load_floor_list(dungeon_id)
+        if data.fixed_floor_id == 0
+    ]
+
+
+def build_floor(
+    dungeon_id: int,
+    data: FloorData,
+    party: Party,
+    seed: int,
+    cache: LayoutCache = None,
+) -> FloorFactory:
+    """
+    :param cache: The cache to load the layout from, or None to generate it.
+    """
+    seed = floor_seed(seed, dungeon_id, data.floor_number)
+    factory = FloorFactory(data, party, random.Random(seed))
+    layout = None
+    if cache is not None:
+        layout = cache.get_or_generate(data, dungeon_id, seed)
+    factory.create_floor(layout)
+    return factory
+
+
+def run(
+    floors: list[tuple[int, FloorData]],
+    party: Party,
+    runs: int,
+    seed: int,
+    cache: LayoutCache = None,
+):
+    """
+    Builds every floor `runs` times, run r using seed + r. Peak memory is
+    measured in a separate traced pass so that tracing does not skew timings.
+
+    :param cache: The cache to load layouts from, or None to generate them.
+
+    :return: The report as a JSON serialisable dict.
+    """
+    latencies: dict[Structure, list[float]] = defaultdict(list)
+    stats: dict[Structure, GenerationStats] = defaultdict(GenerationStats)
+
+    start_time = time.perf_counter()
+    for r in range(runs):
+        for dungeon_id, data in floors:
+            t0 = time.perf_counter()
+            factory = build_floor(dungeon_id, data, party, seed + r, cache)
+            latencies[data.structure].append(time.perf_counter() - t0)
+            stats[data.structure].add(factory.stats)
+    elapsed = time.perf_counter() - start_time
+
+    peak_memory: dict[Structure, int] = defaultdict(int)
+    tracemalloc.start()
+    for dungeon_id, data in floors:
+        tracemalloc.reset_peak()
+        build_floor(dungeon_id, data, party, seed, cache)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_memory[data.structure] = max(peak_memory[data.structure], peak)
+    tracemalloc.stop()
+
+    structures = {}
+    for structure, samples in sorted(latencies.items(), key=lambda x: x[0].value):
+        samples.sort()
+        s = stats[structure]
+        structures[structure.name] = {
+            "floors": len(samples),
+            "mean_ms": 1000 * sum(samples) / len(samples),
+            "p50_ms": 1000 * percentile(samples, 50),
+            "p95_ms": 1000 * percentile(samples, 95),
+            "p99_ms": 1000 * percentile(samples, 99),
+            "attempts": s.attempts,
+            "regenerations": s.regenerations,
+            "repairs": s.repairs,
+            "repaired_floors": s.repaired_floors,
+            "discarded_ms": 1000 * s.discarded_time,
+            "peak_memory_bytes": peak_memory[structure],
+        }
+
+    total = sum(len(samples) for samples in latencies.values())
+    report = {
+        "runs": runs,
+        "seed": seed,
+        "floors": total,
+        "elapsed_s": elapsed,
+        "floors_per_second": total / elapsed if elapsed else 0,
+        "peak_memory_bytes": max(peak_memory.values(), default=0),
+        "structures": structures,
+    }
+    if cache is not None:
+        report["cache_hits"] = cache.hits
+        report["cache_misses"] = cache.misses
+    return report
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "-d",
+        "--dungeon",
+        type=int,
+        action="append",
+        dest="dungeons",
+        help="Only benchmark this dungeon. May be repeated.",
+    )
+    parser.add_argument("-o", "--output", help="Write the report here.")
+    parser.add_argument(
+        "-c",
+        "--cache",
+        metavar="DIR",
+        help="Load layouts from a layout cache in this directory.",
+    )
+    args = parser.parse_args(argv)
+
+    # SDL reads the drivers when it is initialised.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    party = Party([user_pokemon_factory(0), user_pokemon_factory(1)])
+
+    cache = None if args.cache is None else LayoutCache(args.cache)
+    report = run(load_floors(args.dungeons), party, args.runs, args.seed, cache)
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Micro-benchmark of floor structure generation, i.e. the grid, room and
+hallway work done by FloorFactory.build_floor_structure, for each Structure.
+Each structure is timed with and without water, as the water tiles are
+placed tile by tile and would otherwise dominate. It does not need the
+display, but FloorFactory loads the move data from gamedata.db on import, so
+the database must have been built:
+
+    python -m app.benchmark.floor_structure --floors 500
+"""
+
+import argparse
+import random
+import time
+
+from app.dungeon.darkness_level import DarknessLevel
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory
+from app.dungeon.structure import Structure
+from app.dungeon.weather import Weather
+
+
+# Structures with a generator; the others are not implemented yet.
+STRUCTURES = (
+    Structure.SMALL,
+    Structure.RING,
+    Structure.CROSSROADS,
+    Structure.LINE,
+    Structure.CROSS,
+    Structure.BEETLE,
+    Structure.MEDIUM,
+    Structure.SMALL_MEDIUM,
+    Structure.MEDIUM_LARGE,
+)
+
+
+def make_floor_data(structure: Structure, secondary_used: bool = True) -> FloorData:
+    return FloorData(
+        floor_number=1,
+        structure=structure,
+        tileset=0,
+        bgm=0,
+        weather=Weather.CLEAR,
+        fixed_floor_id=0,
+        darkness_level=DarknessLevel.NO_DARKNESS,
+        room_density=6,
+        floor_connectivity=15,
+        initial_enemy_density=0,
+        dead_ends=0,
+        item_density=0,
+        trap_density=0,
+        extra_hallway_density=10,
+        buried_item_density=0,
+        water_density=3,
+        max_coin_amount=0,
+        shop=0,
+        monster_house=0,
+        sticky_item=0,
+        empty_monster_house=0,
+        hidden_stairs=0,
+        secondary_used=int(secondary_used),
+        secondary_percentage=20,
+        imperfect_rooms=0,
+        unkE=0,
+        kecleon_shop_item_positions=0,
+        hidden_stairs_type=0,
+        enemy_iq=0,
+        iq_booster_boost=0,
+        monster_list=[],
+        trap_list=[],
+        trap_weights=[],
+        item_list=[],
+        item_categories=[],
+    )
+
+
+def time_structure(
+    structure: Structure, floors: int, seed: int, secondary_used: bool = True
+) -> float:
+    """
+    :return: The mean time in seconds to build one floor structure.
+    """
+    data = make_floor_data(structure, secondary_used)
+    total = 0
+    for i in range(floors):
+        factory = FloorFactory(data, None, random.Random(seed + i))
+        t0 = time.perf_counter()
+        factory.build_floor_structure()
+        total += time.perf_counter() - t0
+    return total / floors
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--floors", type=int, default=200)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'structure':<14}{'us/floor':>10}{'no water':>10}")
+    for structure in STRUCTURES:
+        mean = time_structure(structure, args.floors, args.seed)
+        dry = time_structure(structure, args.floors, args.seed, False)
+        print(f"{structure.name:<14}{mean * 1e6:>10.0f}{dry * 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Headless benchmark of large floors, to check that frame time and memory stay
+flat as the floor grows.
+
+For each floor size a MEDIUM_LARGE floor is generated, then the camera is
+swept across the ground tiles of the floor, rendering the DungeonMap and the
+Minimap each frame. Frame time percentiles and the peak memory allocated while
+rendering are reported as JSON:
+
+    python -m app.benchmark.large_floor --size 56x32 --size 256x256 --frames 300
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from app.benchmark.stats import percentile
+from app.benchmark.floor_structure import make_floor_data
+from app.common import constants
+from app.dungeon.chunk import CHUNK_SIZE
+from app.dungeon.dungeon_map import DungeonMap
+from app.dungeon.floor import Floor
+from app.dungeon.floor_factory import FloorFactory
+from app.dungeon.minimap import Minimap
+from app.dungeon.structure import Structure
+from app.pokemon.party import Party
+from app.pokemon.pokemon_factory import user_pokemon_factory
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    w, h = size.lower().split("x")
+    return int(w), int(h)
+
+
+def get_cameras(floor: Floor, frames: int) -> list[pygame.Rect]:
+    """
+    :return: A camera centred on each of `frames` ground tiles, spread evenly
+             over the floor.
+    """
+    TILE_SIZE = floor.tileset.tile_size
+    ground = floor.get_valid_spawn_locations()
+    step = max(1, len(ground) // frames)
+    cameras = []
+    for x, y in ground[::step][:frames]:
+        camera = pygame.Rect((0, 0), constants.DISPLAY_SIZE)
+        camera.center = (
+            (x + DungeonMap.MARGIN) * TILE_SIZE,
+            (y + DungeonMap.MARGIN) * TILE_SIZE,
+        )
+        cameras.append(camera)
+    return cameras
+
+
+def render_frames(
+    dungeon_map: DungeonMap, minimap: Minimap, cameras: list[pygame.Rect]
+) -> tuple[list[float], list[float]]:
+    """
+    :return: The sorted times to render the map and the minimap each frame.
+    """
+    TILE_SIZE = dungeon_map.floor.tileset.tile_size
+    map_times, minimap_times = [], []
+    for camera in cameras:
+        t0 = time.perf_counter()
+        dungeon_map.render(camera)
+        t1 = time.perf_counter()
+        position = (
+            camera.centerx // TILE_SIZE - DungeonMap.MARGIN,
+            camera.centery // TILE_SIZE - DungeonMap.MARGIN,
+        )
+        minimap.set_visible(position)
+        minimap.render()
+        t2 = time.perf_counter()
+        map_times.append(t1 - t0)
+        minimap_times.append(t2 - t1)
+    return sorted(map_times), sorted(minimap_times)
+
+
+def run(size: tuple[int, int], party: Party, frames: int, seed: int) -> dict:
+    data = make_floor_data(Structure.MEDIUM_LARGE)
+    t0 = time.perf_counter()
+    floor = FloorFactory(data, party, random.Random(seed), size=size).create_floor()
+    generation_time = time.perf_counter() - t0
+    cameras = get_cameras(floor, frames)
+
+    dungeon_map = DungeonMap(floor, True)
+    minimap = Minimap(floor, floor.tileset.minimap_color)
+    map_times, minimap_times = render_frames(dungeon_map, minimap, cameras)
+
+    # Trace a second sweep over fresh surfaces, so that tracing does not skew
+    # the timings and chunks are built again.
+    dungeon_map = DungeonMap(floor, True)
+    minimap = Minimap(floor, floor.tileset.minimap_color)
+    tracemalloc.start()
+    render_frames(dungeon_map, minimap, cameras)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "size": f"{size[0]}x{size[1]}",
+        "frames": len(cameras),
+        "generation_ms": 1000 * generation_time,
+        "map_mean_ms": 1000 * sum(map_times) / len(map_times),
+        "map_p95_ms": 1000 * percentile(map_times, 95),
+        "minimap_mean_ms": 1000 * sum(minimap_times) / len(minimap_times),
+        "minimap_p95_ms": 1000 * percentile(minimap_times, 95),
+        "render_peak_memory_bytes": peak,
+        "map_chunks": len(dungeon_map.chunks),
+        "minimap_chunks": len(minimap.chunks),
+        "floor_chunks": -(-size[0] // CHUNK_SIZE) * -(-size[1] // CHUNK_SIZE),
+    }
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        action="append",
+        dest="sizes",
+        help="Floor size as WIDTHxHEIGHT. May be repeated.",
+    )
+    parser.add_argument("-n", "--frames", type=int, default=200)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    sizes = args.sizes or [(56, 32), (128, 128), (256, 256)]
+
+    # SDL reads the drivers when it is initialised.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    party = Party([user_pokemon_factory(0), user_pokemon_factory(1)])
+
+    report = [run(size, party, args.frames, args.seed) for size in sizes]
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
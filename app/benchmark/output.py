@@ -0,0 +1,83 @@
+"""
+Benchmark of the output stage, which takes each frame to the window.
+
+A frame of noise is presented a number of times in each output mode and
+scale, and the mean and 95th percentile time of Output.present are reported
+as JSON. Run it under the video driver to compare, as the dummy driver skips
+the display:
+
+    python -m app.benchmark.output --frames 600 --scale 4 --scale 3.5
+"""
+
+import argparse
+from collections import deque
+import json
+import random
+import sys
+
+import pygame
+
+from app.benchmark.stats import percentile
+from app.common import constants
+from app.gui.output import Output, OutputMode
+
+
+def run(mode: OutputMode, scale: float, frames: int, seed: int) -> dict:
+    output = Output(scale, mode)
+    output.times = deque(maxlen=frames)
+    surface = output.get_surface()
+    rng = random.Random(seed)
+    for _ in range(frames):
+        # Touch a few pixels so that the frame is not the same every time.
+        for _ in range(16):
+            x = rng.randrange(constants.DISPLAY_WIDTH)
+            y = rng.randrange(constants.DISPLAY_HEIGHT)
+            surface.set_at((x, y), (rng.randrange(256), 0, 0))
+        output.present()
+        pygame.event.pump()
+    times = sorted(output.times)
+    return {
+        "mode": mode.value,
+        "scale": scale,
+        "video_driver": pygame.display.get_driver(),
+        "window_size": list(pygame.display.get_window_size()),
+        "frames": frames,
+        "present_mean_ms": 1000 * output.cost,
+        "present_p95_ms": 1000 * percentile(times, 95),
+    }
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scale",
+        type=float,
+        action="append",
+        dest="scales",
+        help="Window scale. May be repeated.",
+    )
+    parser.add_argument(
+        "--mode",
+        type=OutputMode,
+        action="append",
+        dest="modes",
+        help="Output mode, software or scaled. May be repeated.",
+    )
+    parser.add_argument("-n", "--frames", type=int, default=600)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = []
+    for mode in args.modes or list(OutputMode):
+        # The SCALED window size is chosen by the display, not the scale.
+        scales = [None] if mode is OutputMode.SCALED else args.scales or [4]
+        for scale in scales:
+            pygame.init()
+            report.append(run(mode, scale, args.frames, args.seed))
+            pygame.quit()
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Statistics shared by the benchmarks. Kept free of game imports, so that a
+benchmark importing it loads nothing else.
+"""
+
+import math
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    :param samples: Sorted samples.
+    :param q: The percentile, between 0 and 100.
+    :return: The nearest-rank percentile of the samples.
+    """
+    rank = max(1, math.ceil(q / 100 * len(samples)))
+    return samples[rank - 1]
@@ -0,0 +1,100 @@
+"""
+Headless benchmark of tile fetches from a tileset.
+
+Random (tile type, mask, variation) triples are fetched the way DungeonMap did
+before tiles were pre-sliced, checking the variation against the invalid
+colour and taking a subsurface on every fetch, and from the table built by
+the tileset loader. Fetches per second of each are reported as JSON:
+
+    python -m app.benchmark.tileset_lookup --tileset 0 --fetches 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import pygame
+
+from app.dungeon.tile_type import TileType
+from app.gui.tileset import (
+    NUM_MASKS,
+    NUM_VARIATIONS,
+    Tileset,
+    tile_index,
+    tile_masks,
+)
+import app.db.tileset as tileset_db
+
+
+def sliced_fetch(
+    tileset: Tileset, tile_type: TileType, mask: int, variation: int
+) -> pygame.Surface:
+    """
+    Fetches a tile by slicing the sheet, as before the table.
+    """
+    x, y = tile_masks[mask]
+    x += 6 * tile_type.value
+    topleft = (x * tileset.tile_size, y * tileset.tile_size)
+    v = variation
+    if v and tileset.tileset_surfaces[v].get_at(topleft) == tileset.invalid_color:
+        v = 0
+    return tileset.tileset_surfaces[v].subsurface(
+        topleft, (tileset.tile_size, tileset.tile_size)
+    )
+
+
+def table_fetch(
+    tileset: Tileset, tile_type: TileType, mask: int, variation: int
+) -> tuple[pygame.Surface, pygame.Rect]:
+    return tileset[tile_index(tile_type, mask, variation)]
+
+
+def fetches_per_second(fetch, tileset: Tileset, keys: list) -> float:
+    t0 = time.perf_counter()
+    for tile_type, mask, variation in keys:
+        fetch(tileset, tile_type, mask, variation)
+    return len(keys) / (time.perf_counter() - t0)
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-t", "--tileset", type=int, default=0)
+    parser.add_argument("-n", "--fetches", type=int, default=100000)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # SDL reads the drivers when it is initialised.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    tileset = tileset_db.load(args.tileset)
+    rng = random.Random(args.seed)
+    keys = [
+        (
+            rng.choice(list(TileType)),
+            rng.randrange(NUM_MASKS),
+            rng.randrange(NUM_VARIATIONS),
+        )
+        for _ in range(args.fetches)
+    ]
+
+    sliced = fetches_per_second(sliced_fetch, tileset, keys)
+    table = fetches_per_second(table_fetch, tileset, keys)
+    report = {
+        "tileset": args.tileset,
+        "fetches": args.fetches,
+        "sliced_fetches_per_second": sliced,
+        "table_fetches_per_second": table,
+        "speedup": table / sliced,
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -52,3 +52,4 @@ FONT_DIRECTORY = os.path.join(ASSETS_DIRECTORY, "font")
 DATA_DIRECTORY = os.path.join(BASE_DIRECTORY, "data")
 USERDATA_DIRECTORY = os.path.join(DATA_DIRECTORY, "debug_userdata")
 GAMEDATA_DIRECTORY = os.path.join(DATA_DIRECTORY, "gamedata")
+CACHE_DIRECTORY = os.path.join(DATA_DIRECTORY, "cache")
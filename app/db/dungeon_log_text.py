@@ -1,3 +1,6 @@
+from collections import OrderedDict
+import functools
+
 from pygame import Color
 
 from app.common import constants
@@ -8,6 +11,32 @@ from app.pokemon.stat import Stat
 from app.dungeon.weather import Weather
 
 
+# The same messages recur all the time, so the last ones built are kept by
+# template and arguments, and the Text of each is only rendered once.
+MAX_MESSAGES = 256
+messages: OrderedDict[tuple, text.Text] = OrderedDict()
+
+
+def cached(template):
+    """
+    Keeps the messages built by the template in the messages cache. The
+    arguments of the template must be hashable.
+    """
+
+    @functools.wraps(template)
+    def cached_template(*args) -> text.Text:
+        key = template.__name__, *args
+        if key in messages:
+            messages.move_to_end(key)
+            return messages[key]
+        message = messages[key] = template(*args)
+        if len(messages) > MAX_MESSAGES:
+            messages.popitem(last=False)
+        return message
+
+    return cached_template
+
+
 def get_name_gender_text(pokemon: Pokemon) -> str:
     symbol = pokemon.gender.get_font_string()
     return symbol if pokemon.is_enemy and not pokemon.base.name.endswith(symbol) else ""
@@ -17,27 +46,52 @@ def get_name_color(pokemon: Pokemon) -> Color:
     return constants.CYAN if pokemon.is_enemy else pokemon.name_color
 
 
+def get_name(pokemon: Pokemon) -> tuple[str, tuple[int, ...], str]:
+    """
+    :return: The name of the Pokemon in messages, its colour and the gender
+             symbol after it.
+    """
+    return (
+        pokemon.base.name,
+        tuple(get_name_color(pokemon)),
+        get_name_gender_text(pokemon),
+    )
+
+
+def write_name(
+    builder: text.TextBuilder, name: str, color: tuple[int, ...], gender: str
+) -> text.TextBuilder:
+    return (
+        builder.set_color(color)
+        .write(name)
+        .set_color(constants.OFF_WHITE)
+        .write(gender)
+    )
+
+
+@cached
 def no_pp():
     return text.TextBuilder.build_white("You have ran out of PP for this move.")
 
 
 def use_move(pokemon: Pokemon, move: Move):
+    return _use_move(*get_name(pokemon), move.name)
+
+
+@cached
+def _use_move(name: str, color: tuple[int, ...], gender: str, move_name: str):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(pokemon))
-        .write(pokemon.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(pokemon))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" used ")
         .set_color(constants.LIME)
-        .write(move.name)
+        .write(move_name)
         .set_color(constants.OFF_WHITE)
         .write("!")
         .build()
     )
 
 
+@cached
 def move_fail():
     return (
         text.TextBuilder()
@@ -53,54 +107,54 @@ def move_fail():
 
 
 def move_miss(defender: Pokemon):
-    return (
+    return _move_miss(*get_name(defender))
+
+
+@cached
+def _move_miss(name: str, color: tuple[int, ...], gender: str):
+    builder = (
         text.TextBuilder()
         .set_shadow(True)
         .set_color(constants.OFF_WHITE)
         .write("The move missed ")
-        .set_color(get_name_color(defender))
-        .write(defender.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(defender))
-        .write("!")
-        .build()
     )
+    return write_name(builder, name, color, gender).write("!").build()
 
 
 def no_damage(defender: Pokemon):
+    return _no_damage(*get_name(defender))
+
+
+@cached
+def _no_damage(name: str, color: tuple[int, ...], gender: str):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(defender))
-        .write(defender.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(defender))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" took no damage!")
         .build()
     )
 
 
 def calamatous_damage(defender: Pokemon):
+    return _calamatous_damage(*get_name(defender))
+
+
+@cached
+def _calamatous_damage(name: str, color: tuple[int, ...], gender: str):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(defender))
-        .write(defender.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(defender))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write("took calamitous damage!")
         .build()
     )
 
 
 def damage(defender: Pokemon, amount: int):
+    return _damage(*get_name(defender), amount)
+
+
+@cached
+def _damage(name: str, color: tuple[int, ...], gender: str, amount: int):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(defender))
-        .write(defender.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(defender))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" took ")
         .set_color(constants.CYAN)
         .write(f"{amount} ")
@@ -111,26 +165,26 @@ def damage(defender: Pokemon, amount: int):
 
 
 def defeated(p: Pokemon):
+    return _defeated(*get_name(p))
+
+
+@cached
+def _defeated(name: str, color: tuple[int, ...], gender: str):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(p))
-        .write(p.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(p))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" was defeated!")
         .build()
     )
 
 
 def gain_xp(p: Pokemon, amount: int):
+    return _gain_xp(*get_name(p), amount)
+
+
+@cached
+def _gain_xp(name: str, color: tuple[int, ...], gender: str, amount: int):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(p))
-        .write(p.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(p))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" gained ")
         .set_color(constants.CYAN)
         .write(str(amount))
@@ -141,13 +195,13 @@ def gain_xp(p: Pokemon, amount: int):
 
 
 def level_up(p: Pokemon, level: int):
+    return _level_up(*get_name(p), level)
+
+
+@cached
+def _level_up(name: str, color: tuple[int, ...], gender: str, level: int):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(p))
-        .write(p.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(p))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" grew to Level ")
         .set_color(constants.CYAN)
         .write(str(level))
@@ -158,13 +212,13 @@ def level_up(p: Pokemon, level: int):
 
 
 def hp_up(p: Pokemon, amount: int):
+    return _hp_up(*get_name(p), amount)
+
+
+@cached
+def _hp_up(name: str, color: tuple[int, ...], gender: str, amount: int):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(p))
-        .write(p.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(p))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write("'s ")
         .set_color(constants.CYAN)
         .write("HP")
@@ -179,13 +233,13 @@ def hp_up(p: Pokemon, amount: int):
 
 
 def stat_up(p: Pokemon, stat: Stat, amount: int):
+    return _stat_up(*get_name(p), stat, amount)
+
+
+@cached
+def _stat_up(name: str, color: tuple[int, ...], gender: str, stat: Stat, amount: int):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(p))
-        .write(p.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(p))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(f"'s {stat.get_log_string()} went up ")
         .set_color(constants.CYAN)
         .write(str(amount))
@@ -196,17 +250,18 @@ def stat_up(p: Pokemon, stat: Stat, amount: int):
 
 
 def sent_flying(p: Pokemon):
+    return _sent_flying(*get_name(p))
+
+
+@cached
+def _sent_flying(name: str, color: tuple[int, ...], gender: str):
     return (
-        text.TextBuilder()
-        .set_shadow(True)
-        .set_color(get_name_color(p))
-        .write(p.base.name)
-        .set_color(constants.OFF_WHITE)
-        .write(get_name_gender_text(p))
+        write_name(text.TextBuilder().set_shadow(True), name, color, gender)
         .write(" was sent flying!")
         .build()
     )
 
 
+@cached
 def weather(weather: Weather):
     return text.TextBuilder.build_white(f" Weather: {weather.value.capitalize()}")
@@ -129,6 +129,17 @@ def load(dungeon_id: int, floor_id: int) -> FloorData:
     )
 
 
+def has_floor(dungeon_id: int, floor_id: int) -> bool:
+    cursor = db.main_db.cursor()
+    return (
+        cursor.execute(
+            "SELECT 1 FROM floors WHERE dungeon_id = ? AND floor_id = ?",
+            (dungeon_id, floor_id),
+        ).fetchone()
+        is not None
+    )
+
+
 def load_floor_list(dungeon_id: int) -> list[FloorData]:
     return [
         load(dungeon_id, floor_id)
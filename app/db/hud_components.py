@@ -17,8 +17,16 @@ def _hud_components():
     return surface
 
 
+# Components are sliced once and kept. A subsurface of an 8-bit surface has
+# its own copy of the palette, so palette changes are pushed to each of them.
+_components: dict[tuple[int, int], pygame.Surface] = {}
+
+
 def _get(x: int, y: int):
-    return _hud_components().subsurface(x * SIZE, y * SIZE, SIZE, SIZE)
+    if (x, y) not in _components:
+        surface = _hud_components().subsurface(x * SIZE, y * SIZE, SIZE, SIZE)
+        _components[x, y] = surface
+    return _components[x, y]
 
 
 def get_f() -> pygame.Surface:
@@ -57,6 +65,22 @@ def get_green_number(n: int) -> pygame.Surface:
     return _get(n, 1)
 
 
+def get_white_numbers() -> list[pygame.Surface]:
+    """
+    :return: The white digits, indexed by digit.
+    """
+    return [get_white_number(n) for n in range(10)]
+
+
+def get_green_numbers() -> list[pygame.Surface]:
+    """
+    :return: The green digits, indexed by digit.
+    """
+    return [get_green_number(n) for n in range(10)]
+
+
 # Sets the labelling text (e.g. B, F, Lv, HP)
 def set_palette_12(color: pygame.Color):
     _hud_components().set_palette_at(12, color)
+    for surface in _components.values():
+        surface.set_palette_at(12, color)
@@ -44,6 +44,8 @@ def load(bg_id: str) -> MapBackground:
         anim_root = ET.parse(palette_data_path).getroot()
         palette_num = get_palette_num(anim_root)
         palette_animation = get_palette_animation(anim_root)
+        # Updates only push the colours that change.
+        palette_animation.set_palette(lower_bg, palette_num)
 
     collisions = constants.EMPTY_SURFACE
     bg_sprites, bg_sprite_positions = [], []
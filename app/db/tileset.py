@@ -5,7 +5,7 @@ import xml.etree.ElementTree as ET
 import pygame
 
 from app.dungeon.tile_type import TileType
-from app.gui.tileset import Tileset
+from app.gui.tileset import Tileset, slice_tiles
 from app.common.constants import IMAGES_DIRECTORY
 from app.model.palette_animation import PaletteAnimation
 from app.dungeon.terrain import Terrain
@@ -62,6 +62,12 @@ def load(tileset_id: int) -> Tileset:
     else:
         animation_11 = None
 
+    # Updates only push the colours that change.
+    for animation, animation_index in ((animation_10, 10), (animation_11, 11)):
+        if animation is not None:
+            for surface in tileset_surfaces:
+                animation.set_palette(surface, animation_index)
+
     data_root = ET.parse(os.path.join(tileset_dir, "tileset_data.xml")).getroot()
     primary_type = Terrain(data_root.find("PrimaryType").text)
     secondary_type = Terrain(data_root.find("SecondaryType").text)
@@ -83,4 +89,5 @@ def load(tileset_id: int) -> Tileset:
         terrains,
         minimap_color,
         underwater,
+        slice_tiles(tileset_surfaces, tile_size, invalid_color),
     )
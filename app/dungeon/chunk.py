@@ -0,0 +1,60 @@
+"""
+Floors are split into square chunks of tiles so that the surfaces built from a
+floor can be built and updated a chunk at a time, only for the chunks near the
+camera or around a change. The work per frame then depends on the size of the
+view rather than the size of the floor.
+"""
+
+from typing import Iterator
+
+
+CHUNK_SIZE = 16
+
+
+def chunk_of(position: tuple[int, int]) -> tuple[int, int]:
+    """
+    :param position: A tile position.
+    :return: The chunk containing the tile.
+    """
+    x, y = position
+    return x // CHUNK_SIZE, y // CHUNK_SIZE
+
+
+def chunk_topleft(chunk: tuple[int, int]) -> tuple[int, int]:
+    """
+    :param chunk: A chunk.
+    :return: The position of the top-left tile of the chunk.
+    """
+    cx, cy = chunk
+    return cx * CHUNK_SIZE, cy * CHUNK_SIZE
+
+
+def chunks_in_rect(
+    topleft: tuple[int, int], size: tuple[int, int]
+) -> Iterator[tuple[int, int]]:
+    """
+    :param topleft: Top-left tile position of the rectangle.
+    :param size: The dimensions of the rectangle in tiles.
+    :return: The chunks overlapping the rectangle, row by row.
+    """
+    (x0, y0), (w, h) = topleft, size
+    if w <= 0 or h <= 0:
+        return
+    cx0, cy0 = chunk_of((x0, y0))
+    cx1, cy1 = chunk_of((x0 + w - 1, y0 + h - 1))
+    for cy in range(cy0, cy1 + 1):
+        for cx in range(cx0, cx1 + 1):
+            yield cx, cy
+
+
+def chunk_positions(
+    chunk: tuple[int, int], size: tuple[int, int]
+) -> Iterator[tuple[int, int]]:
+    """
+    :param chunk: A chunk.
+    :param size: The dimensions of the floor, to clip the chunk to.
+    :return: The positions of the tiles of the chunk on the floor.
+    """
+    x0, y0 = chunk_topleft(chunk)
+    x1, y1 = min(x0 + CHUNK_SIZE, size[0]), min(y0 + CHUNK_SIZE, size[1])
+    return ((x, y) for x in range(max(0, x0), x1) for y in range(max(0, y0), y1))
@@ -1,6 +1,9 @@
+from app.common.constants import SEED
 from app.dungeon.dungeon_data import DungeonData
+from app.dungeon.floor import FLOOR_HEIGHT, FLOOR_WIDTH
 from app.dungeon.floor_data import FloorData
 from app.dungeon.floor_factory import FloorFactory
+from app.dungeon.floor_layout import FloorLayout
 from app.dungeon.weather import Weather
 from app.model.bounded_int import BoundedInt
 from app.pokemon.party import Party
@@ -32,13 +35,19 @@ class Dungeon:
         floor_data: FloorData,
         party: Party,
         inventory: Inventory,
+        layout: FloorLayout = None,
+        run_seed: int = SEED,
+        floor_size: tuple[int, int] = (FLOOR_WIDTH, FLOOR_HEIGHT),
     ):
         self.dungeon_data = dungeon_data
         self.floor_data = floor_data
         self.party = party
         self.inventory = inventory
+        self.run_seed = run_seed
 
-        self.floor = FloorFactory(self.floor_data, self.party).create_floor()
+        self.floor = FloorFactory(
+            self.floor_data, self.party, size=floor_size
+        ).create_floor(layout)
         self.spawner = Spawner(self.floor, self.party, self.floor_data)
         self.turns = BoundedInt(0, 0, self.dungeon_data.turn_limit)
 
@@ -1,71 +1,248 @@
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 
+from app.common import constants
 from app.common.constants import RNG as random
 import app.db.trap as trap_db
 import app.db.tileset as tileset_db
-from app.dungeon.dungeon import Dungeon
+from app.dungeon.chunk import (
+    CHUNK_SIZE,
+    chunk_of,
+    chunk_positions,
+    chunk_topleft,
+    chunks_in_rect,
+)
+from app.dungeon.floor import Floor
+from app.gui.render_target import RenderTarget, allocate
+from app.gui.tileset import tile_index
+
+
+VARIANTS = (0, 0, 0, 0, 1, 1, 2, 2)
 
 
 class DungeonMap:
-    def __init__(self, dungeon: Dungeon):
-        self.floor = dungeon.floor
+    """
+    Draws the floor from a baked layer of its static contents. The layer is
+    split into chunks, each baked the first time it comes into view: the
+    tiles into an 8-bit surface sharing the palette of the tileset, so that
+    palette animations still apply, and the stairs, traps and items into a
+    list of blits drawn over it. Rendering is then a blit per chunk in view.
+    Palette animations are only pushed to the chunks showing the colours
+    changed.
+
+    Changes to the floor are read from floor.tiles.dirty, and only the dirty
+    tiles are baked again. Only the most recently drawn chunks are kept.
+    """
+
+    # Number of border tiles drawn around the floor.
+    MARGIN = 5
+    MAX_CHUNKS = 16
+
+    def __init__(self, floor: Floor, is_below: bool):
+        self.floor = floor
         self.tileset = self.floor.tileset
 
         self.stairs_surface = (
-            tileset_db.STAIRS_DOWN_IMAGE
-            if dungeon.dungeon_data.is_below
-            else tileset_db.STAIRS_UP_IMAGE
+            tileset_db.STAIRS_DOWN_IMAGE if is_below else tileset_db.STAIRS_UP_IMAGE
         )
-        self.map = self.build_map()
-
-    def build_map(self):
-        self.map = {}
-        for x in range(self.floor.WIDTH):
-            for y in range(self.floor.HEIGHT):
-                self.map[x, y] = self.get_tile_coordinate((x, y))
-        return self.map
-
-    def get_tile_coordinate(
-        self, position: tuple[int, int]
-    ) -> tuple[tuple[int, int], int]:
+        # Tile variants are a function of the position, so a chunk baked again
+        # after being dropped looks the same.
+        self.variant_seed = random.getrandbits(32)
+
+        # The layer is indexed by tile position including the margin.
+        self.size = (floor.WIDTH + 2 * self.MARGIN, floor.HEIGHT + 2 * self.MARGIN)
+        self.chunks: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self.objects: dict[
+            tuple[int, int], list[tuple[pygame.Surface, pygame.Rect]]
+        ] = {}
+        self.palette = self.tileset.tileset_surfaces[0].get_palette()
+        self.palette_version = 0
+        self.chunk_versions: dict[tuple[int, int], int] = {}
+        self.chunk_colors: dict[tuple[int, int], frozenset[int]] = {}
+        self.render_target = RenderTarget((0, 0))
+
+        # Everything is baked from scratch.
+        self.floor.tiles.dirty.clear()
+
+    def get_tile_coordinate(self, position: tuple[int, int]) -> int:
+        """
+        :return: The index in the tileset of the tile drawn at the position.
+        """
         mask = self.floor.get_tile_mask(position)
-        variant = random.choice([0, 0, 0, 0, 1, 1, 2, 2])
+        variant = VARIANTS[hash((self.variant_seed, position)) % len(VARIANTS)]
         tile_type = self.floor[position].tile_type
-        return self.tileset.get_tile_position(tile_type, mask, variant)
+        return tile_index(tile_type, mask, variant)
+
+    def get_tile(self, position: tuple[int, int]) -> tuple[pygame.Surface, pygame.Rect]:
+        """
+        :return: The tileset sheet and area of the tile drawn at the position.
+        """
+        if not self.floor.in_inner_bounds(position):
+            return self.tileset.get_border_tile()
+        return self.tileset[self.get_tile_coordinate(position)]
 
-    def __getitem__(self, position: tuple[int, int]) -> pygame.Surface:
+    def get_object_surface(self, position: tuple[int, int]) -> pygame.Surface:
+        """
+        :return: The stairs, shop or trap drawn over the tile, if any.
+        """
+        if not self.floor.in_inner_bounds(position):
+            return None
+        if position == self.floor.stairs_spawn:
+            return self.stairs_surface
+        if self.floor.has_shop and self.floor[position].is_shop:
+            return tileset_db.SHOP_IMAGE
+        if self.floor[position].trap is not None:
+            return trap_db.load(self.floor[position].trap)
+        return None
+
+    def _tile_rect(self, position: tuple[int, int]) -> pygame.Rect:
+        """
+        :return: The rect of the tile at the position in pixels, relative to
+                 the top-left of the margin.
+        """
+        TILE_SIZE = self.tileset.tile_size
+        x, y = position
+        return pygame.Rect(
+            (x + self.MARGIN) * TILE_SIZE,
+            (y + self.MARGIN) * TILE_SIZE,
+            TILE_SIZE,
+            TILE_SIZE,
+        )
+
+    def _positions(self, chunk: tuple[int, int]):
         return (
-            self.tileset.get_border_tile()
-            if not self.floor.in_inner_bounds(position)
-            else (
-                self.stairs_surface
-                if position == self.floor.stairs_spawn
-                else (
-                    tileset_db.SHOP_IMAGE
-                    if self.floor.has_shop and self.floor[position].is_shop
-                    else (
-                        trap_db.load(self.floor[position].trap)
-                        if self.floor[position].trap is not None
-                        else self.tileset[self.map[position]]
-                    )
-                )
-            )
+            (x - self.MARGIN, y - self.MARGIN)
+            for x, y in chunk_positions(chunk, self.size)
         )
 
-    def render(self, camera: pygame.Rect) -> pygame.Surface:
-        TILE_SIZE = self.floor.tileset.tile_size
+    def _chunk_of(self, position: tuple[int, int]) -> tuple[int, int]:
+        x, y = position
+        return chunk_of((x + self.MARGIN, y + self.MARGIN))
 
-        floor_surface = pygame.Surface(
-            pygame.Vector2(self.floor.WIDTH + 10, self.floor.HEIGHT + 10) * TILE_SIZE
+    def get_chunk(self, chunk: tuple[int, int]) -> pygame.Surface:
+        """
+        :param chunk: A chunk of the layer.
+        :return: The tiles of the chunk, baked if not already.
+        """
+        if chunk in self.chunks:
+            self.chunks.move_to_end(chunk)
+            return self.chunks[chunk]
+
+        TILE_SIZE = self.tileset.tile_size
+        surface = allocate((CHUNK_SIZE * TILE_SIZE,) * 2, 0, 8)
+        surface.set_palette(self.palette)
+        self.chunk_versions[chunk] = self.palette_version
+        self.chunks[chunk] = surface
+        for position in self._positions(chunk):
+            self._bake_tile(chunk, position)
+        self.chunk_colors[chunk] = self._get_colors(surface)
+        self.objects[chunk] = self._get_objects(chunk)
+
+        if len(self.chunks) > self.MAX_CHUNKS:
+            old, _ = self.chunks.popitem(last=False)
+            del self.objects[old]
+            del self.chunk_versions[old]
+            del self.chunk_colors[old]
+        return surface
+
+    def _bake_tile(self, chunk: tuple[int, int], position: tuple[int, int]):
+        # The palettes of the chunk and the tileset match, so the palette
+        # indices are copied unchanged.
+        x0, y0 = chunk_topleft(chunk)
+        rect = self._tile_rect(position).move(
+            -x0 * self.tileset.tile_size, -y0 * self.tileset.tile_size
         )
-        tile_rect = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)
-        for xi, x in enumerate(range(-5, self.floor.WIDTH + 5)):
-            for yi, y in enumerate(range(-5, self.floor.HEIGHT + 5)):
-                tile_rect.topleft = xi * TILE_SIZE, yi * TILE_SIZE
-                if tile_rect.colliderect(camera):
-                    tile_surface = self[x, y]
-                    floor_surface.blit(tile_surface, tile_rect)
-                    item = self.floor[x, y].item_ptr
-                    if item is not None:
-                        floor_surface.blit(item.surface, tile_rect.move(4, 4))
-        return floor_surface
+        sheet, area = self.get_tile(position)
+        self.chunks[chunk].blit(sheet, rect, area)
+
+    def _get_objects(
+        self, chunk: tuple[int, int]
+    ) -> list[tuple[pygame.Surface, pygame.Rect]]:
+        objects = []
+        for position in self._positions(chunk):
+            rect = self._tile_rect(position)
+            surface = self.get_object_surface(position)
+            if surface is not None:
+                objects.append((surface, rect))
+            item = self.floor.tiles.items.get(position)
+            if item is not None:
+                objects.append((item.surface, rect.move(4, 4)))
+        return objects
+
+    def _get_colors(self, surface: pygame.Surface) -> frozenset[int]:
+        """
+        :return: The palette indices used by the surface.
+        """
+        return frozenset(np.unique(pygame.surfarray.pixels2d(surface)).tolist())
+
+    def update_palette(self, changed: set[int]):
+        """
+        Follows the palette animations of the tileset. Chunks not showing the
+        changed colours are only given the new palette before they are baked
+        again.
+
+        :param changed: The palette indices changed, as returned by
+                        Tileset.update.
+        """
+        if not changed:
+            return
+        self.palette = self.tileset.tileset_surfaces[0].get_palette()
+        self.palette_version += 1
+        for chunk, colors in self.chunk_colors.items():
+            if not colors.isdisjoint(changed):
+                self._sync_palette(chunk)
+
+    def update_dirty(self):
+        """
+        Bakes the dirty tiles of the chunks kept again.
+        """
+        dirty = self.floor.tiles.dirty
+        stale = set()
+        for position in dirty:
+            chunk = self._chunk_of(position)
+            if chunk in self.chunks:
+                self._sync_palette(chunk)
+                self._bake_tile(chunk, position)
+                stale.add(chunk)
+        for chunk in stale:
+            self.chunk_colors[chunk] = self._get_colors(self.chunks[chunk])
+            self.objects[chunk] = self._get_objects(chunk)
+        dirty.clear()
+
+    def _sync_palette(self, chunk: tuple[int, int]):
+        # Blitting between 8-bit surfaces only copies the palette indices
+        # when both palettes match.
+        if self.chunk_versions[chunk] != self.palette_version:
+            self.chunks[chunk].set_palette(self.palette)
+            self.chunk_versions[chunk] = self.palette_version
+
+    def render(self, camera: pygame.Rect) -> pygame.Surface:
+        """
+        :param camera: The view in pixels, relative to the top-left of the
+                       margin around the floor.
+        :return: The floor in view. The surface is reused by the next call.
+        """
+        TILE_SIZE = self.tileset.tile_size
+
+        surface = self.render_target.resize(camera.size)
+        surface.fill(constants.BLACK)
+        self.update_dirty()
+
+        x0 = max(0, camera.left // TILE_SIZE)
+        y0 = max(0, camera.top // TILE_SIZE)
+        x1 = min(self.size[0], (camera.right - 1) // TILE_SIZE + 1)
+        y1 = min(self.size[1], (camera.bottom - 1) // TILE_SIZE + 1)
+        offset = -camera.x, -camera.y
+        for chunk in chunks_in_rect((x0, y0), (x1 - x0, y1 - y0)):
+            chunk_surface = self.get_chunk(chunk)
+            cx, cy = chunk_topleft(chunk)
+            surface.blit(
+                chunk_surface, (cx * TILE_SIZE - camera.x, cy * TILE_SIZE - camera.y)
+            )
+            surface.blits(
+                (object_surface, rect.move(offset))
+                for object_surface, rect in self.objects[chunk]
+            )
+        return surface
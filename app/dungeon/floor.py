@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import numpy as np
+
 from app.common import utils
 from app.common.direction import Direction
 from app.dungeon import tile
+from app.dungeon.occupancy import Occupancy
+from app.dungeon.room import Room
+from app.dungeon.spawn_locations import SpawnLocations
 from app.dungeon.terrain import Terrain
 from app.dungeon.tile_type import TileType
 from app.pokemon.party import Party
@@ -11,15 +16,27 @@ from app.gui.tileset import Tileset
 from app.dungeon.floor_status import FloorStatus
 
 
+# Neighbour order of the bits in a tile mask, most significant bit first.
+MASK_ORDER = sorted(Direction, key=lambda d: (d.y, d.x))
+CARDINAL_MASK_ORDER = tuple(MASK_ORDER[i] for i in (1, 3, 4, 6))
+
+# Size of a standard floor. The fixed coordinates used by the generators are
+# laid out for this size and scaled to the size of larger floors.
+FLOOR_WIDTH = 56
+FLOOR_HEIGHT = 32
+
+
 class Floor:
-    def __init__(self, WIDTH=56, HEIGHT=32):
+    def __init__(self, WIDTH=FLOOR_WIDTH, HEIGHT=FLOOR_HEIGHT):
         self.WIDTH = WIDTH
         self.HEIGHT = HEIGHT
         self.SIZE = (WIDTH, HEIGHT)
 
-        self._floor = tuple(tile.Tile() for _ in range(WIDTH * HEIGHT))
+        self.tiles = tile.TileArrays(WIDTH, HEIGHT)
+        self.spawn_locations = SpawnLocations()
+        self.occupancy = Occupancy(self.tiles, self.spawn_locations)
 
-        self.room_exits: dict[int, list[tuple[int, int]]] = {}
+        self.rooms: dict[int, Room] = {}
         self.stairs_spawn = (0, 0)
         self.has_shop = False
 
@@ -32,20 +49,39 @@ class Floor:
 
     def __getitem__(self, position: tuple[int, int]) -> tile.Tile:
         if not self.in_bounds(position):
-            t = tile.Tile()
-            t.impassable_tile()
-            return t
+            return tile.Tile.border()
         x, y = position
-        return self._floor[x + y * self.WIDTH]
+        return tile.Tile(self.tiles, x, y)
 
     def __iter__(self):
-        return iter(self._floor)
+        return (
+            tile.Tile(self.tiles, x, y)
+            for y in range(self.HEIGHT)
+            for x in range(self.WIDTH)
+        )
+
+    def get_tile_type(self, position: tuple[int, int]) -> TileType:
+        if not self.in_bounds(position):
+            return TileType.PRIMARY
+        return tile.TILE_TYPES[self.tiles.tile_type[position]]
+
+    def get_room_index(self, position: tuple[int, int]) -> int:
+        if not self.in_bounds(position):
+            return 0
+        return int(self.tiles.room_index[position])
 
     def get_tile_mask(self, position: tuple[int, int]) -> int:
-        return self[position].tile_mask
+        if not self.in_bounds(position):
+            return tile.BORDER_VALUE
+        return int(self.tiles.tile_mask[position])
 
     def get_cardinal_tile_mask(self, position: tuple[int, int]) -> int:
-        return self[position].cardinal_tile_mask
+        if not self.in_bounds(position):
+            return tile.CARDINAL_BORDER_VALUE
+        return int(self.tiles.cardinal_tile_mask[position])
+
+    def get_room(self, position: tuple[int, int]) -> Room | None:
+        return self.rooms.get(self.get_room_index(position))
 
     def in_bounds(self, position: tuple[int, int]) -> bool:
         x, y = position
@@ -56,30 +92,52 @@ class Floor:
         return 0 < x < self.WIDTH - 1 and 0 < y < self.HEIGHT - 1
 
     def is_room(self, p: tuple[int, int]) -> bool:
-        return self[p].room_index
+        return self.get_room_index(p) != 0
 
     def in_same_room(self, p1: tuple[int, int], p2: tuple[int, int]) -> bool:
-        return self.is_room(p1) and self[p1].room_index == self[p2].room_index
+        return self.is_room(p1) and self.get_room_index(p1) == self.get_room_index(p2)
 
     def is_tertiary(self, position: tuple[int, int]):
-        return self[position].tile_type is TileType.TERTIARY
+        return self.get_tile_type(position) is TileType.TERTIARY
 
     def is_primary(self, position: tuple[int, int]):
-        return self[position].tile_type is TileType.PRIMARY
+        return self.get_tile_type(position) is TileType.PRIMARY
 
     def is_valid_spawn_location(self, position):
-        return self[position].can_spawn and self[position].pokemon_ptr is None
+        return (
+            self.in_bounds(position)
+            and self.tiles.can_spawn[position]
+            and position not in self.tiles.pokemon
+        )
 
     def get_valid_spawn_locations(self):
         return [
-            (x, y)
-            for x in range(self.WIDTH)
-            for y in range(self.HEIGHT)
-            if self.is_valid_spawn_location((x, y))
+            p
+            for p in positions(self.tiles.can_spawn)
+            if p not in self.tiles.pokemon
         ]
 
+    def update_spawn_locations(self):
+        """
+        Rebuilds the free spawn locations from the tiles. Only needed when
+        tiles change, as the occupancy index keeps it up to date as Pokemon
+        spawn, move and faint.
+        """
+        self.spawn_locations.reset(self.get_valid_spawn_locations())
+
     def get_terrain(self, position: tuple[int, int]) -> Terrain:
-        return self.tileset.get_terrain(self[position].tile_type)
+        return self.tileset.get_terrain(self.get_tile_type(position))
+
+    def get_terrain_mask(self, terrain: Terrain) -> np.ndarray:
+        """
+        :param terrain: The terrain to look for.
+        :return: A (WIDTH, HEIGHT) boolean array, True where the tileset maps
+                 the tile to the given terrain.
+        """
+        tile_types = [
+            t.value for t in TileType if self.tileset.get_terrain(t) is terrain
+        ]
+        return np.isin(self.tiles.tile_type, tile_types)
 
     def is_ground(self, position: tuple[int, int]) -> bool:
         return self.get_terrain(position) is Terrain.GROUND
@@ -97,7 +155,7 @@ class Floor:
         return self.get_terrain(position) is Terrain.VOID
 
     def is_impassable(self, position: tuple[int, int]) -> bool:
-        return self[position].is_impassable
+        return not self.in_bounds(position) or bool(self.tiles.is_impassable[position])
 
     def cuts_corner(self, p: tuple[int, int], d: Direction) -> bool:
         x, y = p
@@ -108,55 +166,124 @@ class Floor:
         return self.party.leader.position == self.stairs_spawn
 
     def is_occupied(self, position: tuple[int, int]) -> bool:
-        return self[position].pokemon_ptr is not None
+        return position in self.tiles.pokemon
 
     def can_see(self, p1: tuple[int, int], p2: tuple[int, int]) -> bool:
         return self.in_same_room(p1, p2) or utils.dist_inf_norm(p1, p2) <= 2
 
+    def get_visible_mask(self, position: tuple[int, int]) -> np.ndarray:
+        """
+        :param position: The position being viewed from.
+        :return: A (WIDTH, HEIGHT) boolean array, True where can_see holds.
+        """
+        x, y = position
+        visible = np.zeros(self.SIZE, dtype=bool)
+        if self.is_room(position):
+            visible |= self.tiles.room_index == self.get_room_index(position)
+        visible[max(0, x - 2) : max(0, x + 3), max(0, y - 2) : max(0, y + 3)] = True
+        return visible
+
     def get_local_ground_tiles_positions(self, position: tuple[int, int]):
-        return [
-            (x, y)
-            for x in range(self.WIDTH)
-            for y in range(self.HEIGHT)
-            if self.can_see(position, (x, y)) and self.is_ground((x, y))
-        ]
+        return positions(
+            self.get_visible_mask(position) & self.get_terrain_mask(Terrain.GROUND)
+        )
 
     def get_local_pokemon_positions(self, position: tuple[int, int]):
-        return [
-            pos
-            for pos in self.get_local_ground_tiles_positions(position)
-            if self[pos].pokemon_ptr
-        ]
-
-    def update_tile_masks(self):
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                self.update_tile_mask(x, y)
-
-    def update_tile_mask(self, x, y):
-        this_tile = self[x, y]
-
-        mask = tuple(
-            this_tile.tile_type is self[x + d.x, y + d.y].tile_type
-            for d in sorted(Direction, key=lambda d: (d.y, d.x))
+        nearby = set(self.occupancy.within(position, 2))
+        if self.is_room(position):
+            nearby.update(self.occupancy.in_room(self.get_room_index(position)))
+        return sorted(p.position for p in nearby if self.is_ground(p.position))
+
+    def update_tile_masks(
+        self, topleft: tuple[int, int] = (0, 0), size: tuple[int, int] = None
+    ):
+        """
+        Recomputes the tile masks of every tile whose mask can depend on the
+        given rectangle, i.e. the rectangle grown by one tile on each side.
+        Masks are computed for the whole area at once by comparing the tile
+        types against shifted copies of a padded tile type array.
+
+        When a rectangle is given, the recomputed tiles are also marked dirty,
+        so that a map already drawn redraws them.
+
+        :param topleft: Top-left coordinate of the rectangle of changed tiles.
+        :param size: The dimensions of the rectangle. Defaults to the whole
+                     floor.
+        """
+        mark_dirty = size is not None
+        if size is None:
+            size = self.SIZE
+        x0 = max(0, topleft[0] - 1)
+        y0 = max(0, topleft[1] - 1)
+        x1 = min(self.WIDTH, topleft[0] + size[0] + 1)
+        y1 = min(self.HEIGHT, topleft[1] + size[1] + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        w, h = x1 - x0, y1 - y0
+
+        # Out of bounds tiles are treated as primary, as in Tile.border.
+        padded = np.full((w + 2, h + 2), TileType.PRIMARY.value, dtype=np.uint8)
+        px0, py0 = max(0, x0 - 1), max(0, y0 - 1)
+        px1, py1 = min(self.WIDTH, x1 + 1), min(self.HEIGHT, y1 + 1)
+        padded[
+            px0 - x0 + 1 : px1 - x0 + 1, py0 - y0 + 1 : py1 - y0 + 1
+        ] = self.tiles.tile_type[px0:px1, py0:py1]
+        centre = padded[1 : w + 1, 1 : h + 1]
+
+        same = {
+            d: padded[1 + d.x : w + 1 + d.x, 1 + d.y : h + 1 + d.y] == centre
+            for d in Direction
+        }
+        self.tiles.tile_mask[x0:x1, y0:y1] = _pack_bits(same[d] for d in MASK_ORDER)
+        self.tiles.cardinal_tile_mask[x0:x1, y0:y1] = _pack_bits(
+            same[d] for d in CARDINAL_MASK_ORDER
         )
-        cardinal_mask = tuple(mask[x] for x in (1, 3, 4, 6))
-
-        this_tile.tile_mask = tile.value(mask)
-        this_tile.cardinal_tile_mask = tile.value(cardinal_mask)
-
-    def find_room_exits(self):
-        for x in range(self.WIDTH):
-            for y in range(self.HEIGHT):
-                position = (x, y)
-                if not self.is_room_exit(position):
-                    continue
-                self[position].can_spawn = False
-                room_number = self[position].room_index
-                if room_number in self.room_exits:
-                    self.room_exits[room_number].append(position)
-                else:
-                    self.room_exits[room_number] = [position]
+        if mark_dirty:
+            self.tiles.dirty.update(
+                (x, y) for x in range(x0, x1) for y in range(y0, y1)
+            )
+
+    def find_rooms(self, merged: dict[int, list[int]] = None):
+        """
+        Builds the room table from the room indices of the tiles. Room exits
+        are the room tiles next to a hallway, and cannot be spawned on.
+
+        :param merged: The rooms merged into each room during generation.
+        """
+        if merged is None:
+            merged = {}
+        is_room = self.tiles.room_index != 0
+        is_hallway = (self.tiles.tile_type == TileType.TERTIARY.value) & ~is_room
+        padded = np.pad(is_hallway, 1, constant_values=False)
+        next_to_hallway = np.zeros(self.SIZE, dtype=bool)
+        for d in Direction.get_cardinal_directions():
+            next_to_hallway |= padded[
+                1 + d.x : 1 + d.x + self.WIDTH, 1 + d.y : 1 + d.y + self.HEIGHT
+            ]
+        is_exit = is_room & next_to_hallway
+        self.tiles.can_spawn[is_exit] = False
+
+        # Group the room tiles by room, keeping them ordered by x then y.
+        room_tiles = np.argwhere(is_room)
+        room_indices = self.tiles.room_index[is_room]
+        room_exits = is_exit[is_room]
+        room_shops = self.tiles.is_shop[is_room]
+        order = np.argsort(room_indices, kind="stable")
+        indices, starts = np.unique(room_indices[order], return_index=True)
+
+        self.rooms.clear()
+        for index, group in zip(indices.tolist(), np.split(order, starts[1:])):
+            xy = room_tiles[group]
+            (x0, y0), (x1, y1) = xy.min(axis=0).tolist(), xy.max(axis=0).tolist()
+            self.rooms[index] = Room(
+                index,
+                (x0, y0),
+                (x1 - x0 + 1, y1 - y0 + 1),
+                [(x, y) for x, y in xy.tolist()],
+                [(x, y) for x, y in xy[room_exits[group]].tolist()],
+                bool(room_shops[group].any()),
+                list(merged.get(index, [])),
+            )
 
     def is_room_exit(self, position: tuple[int, int]):
         x, y = position
@@ -164,3 +291,18 @@ class Floor:
             self.is_tertiary(p := (x + d.x, y + d.y)) and not self.is_room(p)
             for d in Direction.get_cardinal_directions()
         )
+
+
+def positions(mask: np.ndarray) -> list[tuple[int, int]]:
+    """
+    :param mask: A boolean array indexed by [x, y].
+    :return: The positions where the mask is True, ordered by x then y.
+    """
+    return [(x, y) for x, y in np.argwhere(mask).tolist()]
+
+
+def _pack_bits(bits) -> np.ndarray:
+    res = None
+    for b in bits:
+        res = b.astype(np.uint8) if res is None else (res << 1) | b
+    return res
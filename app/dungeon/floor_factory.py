@@ -1,18 +1,69 @@
+from dataclasses import dataclass
+import hashlib
 import random
+import time
 
 from app.common.constants import RNG
 from app.common.direction import Direction
 import app.db.tileset as tileset_db
 from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_layout import FloorLayout
 from app.dungeon.floor_status import FloorStatus
 from app.dungeon.floor_map_generator import FloorMapGenerator
 from app.dungeon.structure import Structure
-from app.dungeon.floor import Floor
+from app.dungeon.floor import FLOOR_HEIGHT, FLOOR_WIDTH, Floor
 from app.pokemon.party import Party
 from app.dungeon.spawner import Spawner
 import app.db.floor_data as floor_data_db
 
 
+# Bump whenever a change to generation alters the layout produced for a seed,
+# so that cached layouts from older generators are not reused.
+GENERATOR_VERSION = 4
+
+# Number of repair passes on a disconnected structure before it is thrown away
+# and generated again from scratch.
+MAX_REPAIRS = 3
+
+
+def floor_seed(run_seed: int, dungeon_id: int, floor_id: int) -> int:
+    """
+    Derives the seed of a floor from the seed of the run, independently of
+    any other random numbers drawn during the run.
+    """
+    key = f"{run_seed}:{dungeon_id}:{floor_id}".encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+
+@dataclass
+class GenerationStats:
+    """
+    Counters for the work spent building floor structures, to show how much of
+    it goes to attempts that are thrown away.
+    """
+
+    floors: int = 0
+    attempts: int = 0
+    repairs: int = 0
+    repaired_floors: int = 0
+    repair_hallways: int = 0
+    discarded_time: float = 0
+    total_time: float = 0
+
+    @property
+    def regenerations(self) -> int:
+        return self.attempts - self.floors
+
+    def add(self, other: "GenerationStats"):
+        self.floors += other.floors
+        self.attempts += other.attempts
+        self.repairs += other.repairs
+        self.repaired_floors += other.repaired_floors
+        self.repair_hallways += other.repair_hallways
+        self.discarded_time += other.discarded_time
+        self.total_time += other.total_time
+
+
 class FloorFactory:
 
     @staticmethod
@@ -26,12 +77,16 @@ class FloorFactory:
         data: FloorData,
         party: Party,
         generator: random.Random = RNG,
+        max_repairs: int = MAX_REPAIRS,
+        size: tuple[int, int] = (FLOOR_WIDTH, FLOOR_HEIGHT),
     ):
         self.data = data
         self.party = party
         self.generator = generator
+        self.max_repairs = max_repairs
+        self.stats = GenerationStats()
 
-        self.floor_map_generator = FloorMapGenerator(data, generator)
+        self.floor_map_generator = FloorMapGenerator(data, generator, size)
         self.floor = self.floor_map_generator.floor
         self.spawner = Spawner(self.floor, self.party, self.data, generator)
 
@@ -61,15 +116,46 @@ class FloorFactory:
         ys = list(range(0, self.floor.HEIGHT + 1, cell_h))
         return xs, ys
 
-    def create_floor(self) -> Floor:
-        # TODO
+    def scaled_grid_positions(
+        self, xs: list[int], ys: list[int]
+    ) -> tuple[list[int], list[int]]:
+        """
+        :param xs: Grid lines laid out for a standard size floor.
+        :param ys: Grid lines laid out for a standard size floor.
+        :return: The grid lines stretched to the size of this floor.
+        """
+        return (
+            [self.floor_map_generator.scale_x(x) for x in xs],
+            [self.floor_map_generator.scale_y(y) for y in ys],
+        )
+
+    def create_layout(self) -> FloorLayout:
+        """
+        Generates only the layout of the floor, without Pokemon or surfaces.
+        Safe to run off the main thread.
+        """
         if self.data.fixed_floor_id != 0:
-            return self.build_fixed_floor()
+            return FloorLayout.from_floor(self.build_fixed_floor())
+
+        return self.build_layout()
 
+    def build_layout(self) -> FloorLayout:
         self.build_floor_structure()
         self.floor.update_tile_masks()
-        self.floor.find_room_exits()
-        self.spawner.fill_floor_with_spawns()
+        self.floor.find_rooms(self.floor_map_generator.merged_rooms)
+        item_spawns = self.spawner.fill_floor_with_static_spawns()
+        return FloorLayout.from_floor(self.floor, item_spawns)
+
+    def create_floor(self, layout: FloorLayout = None) -> Floor:
+        # TODO
+        if self.data.fixed_floor_id != 0:
+            return self.build_fixed_floor()
+
+        if layout is None:
+            layout = self.build_layout()
+        layout.apply(self.floor)
+        self.spawner.spawn_party()
+        self.spawner.spawn_enemies()
         self.floor.tileset = tileset_db.load(self.data.tileset)
         self.floor.status = FloorStatus(self.data.darkness_level, self.data.weather)
         return self.floor
@@ -78,17 +164,46 @@ class FloorFactory:
         raise NotImplementedError("Fixed floor not implemented.")
 
     def build_floor_structure(self):
-        generating = True
-        while generating:
-            self.floor_map_generator.reset()
-            self.floor_generator_dispatcher[self.data.structure]()
-            if self.data.secondary_used:
-                self.floor_map_generator.generate_secondary()
-            generating = not self.floor_map_generator.is_strongly_connected()
+        """
+        Generates the rooms and hallways, linking any disconnected parts with
+        extra hallways. The structure is only generated again from scratch if
+        it is still disconnected after max_repairs repair passes.
+        """
+        stats = GenerationStats(floors=1)
+        start_time = attempt_time = time.perf_counter()
+        while not self._generate_connected_structure(stats):
+            now = time.perf_counter()
+            stats.discarded_time += now - attempt_time
+            attempt_time = now
+
+        if self.data.secondary_used:
+            self.floor_map_generator.generate_secondary()
+
+        stats.total_time = time.perf_counter() - start_time
+        self.stats.add(stats)
+
+    def _generate_connected_structure(self, stats: GenerationStats) -> bool:
+        stats.attempts += 1
+        self.floor_map_generator.reset()
+        self.floor_generator_dispatcher[self.data.structure]()
+        if self.floor_map_generator.is_strongly_connected():
+            return True
+
+        for _ in range(self.max_repairs):
+            stats.repairs += 1
+            stats.repair_hallways += self.floor_map_generator.repair_connectivity()
+            if self.floor_map_generator.is_strongly_connected():
+                stats.repaired_floors += 1
+                return True
+        return False
 
     def generate_normal_floor(self, grid_size, floor_size):
+        scale_x, scale_y = self.floor_map_generator.grid_scale()
+        grid_size = grid_size[0] * scale_x, grid_size[1] * scale_y
         xs, ys = self.grid_positions(*grid_size)
-        self.floor_map_generator.init_grid(grid_size, xs, ys, floor_size)
+        self.floor_map_generator.init_grid(
+            grid_size, xs, ys, floor_size, scale_x * scale_y
+        )
         self.floor_map_generator.assign_rooms()
         self.floor_map_generator.create_rooms()
         self.floor_map_generator.connect_cells()
@@ -106,13 +221,14 @@ class FloorFactory:
 
     def generate_ring(self):
         grid_size = (6, 4)
-        xs = [0, 6, 17, 28, 39, 50, 56]
-        ys = [0, 7, 16, 25, 32]
+        xs, ys = self.scaled_grid_positions(
+            [0, 6, 17, 28, 39, 50, 56], [0, 7, 16, 25, 32]
+        )
         self.floor_map_generator.init_grid(grid_size, xs, ys, 0)
 
         for x in range(1, 5):
             for y in range(1, 3):
-                self.floor_map_generator.grid[x, y].is_room = True
+                self.floor_map_generator.grid.set_room_cell((x, y))
         self.floor_map_generator.create_rooms()
 
         for x in range(5):
@@ -134,14 +250,14 @@ class FloorFactory:
 
         grid = self.floor_map_generator.grid
         for x in range(1, 4):
-            grid[x, 0].is_room = True
-            grid[x, 3].is_room = True
+            grid.set_room_cell((x, 0))
+            grid.set_room_cell((x, 3))
         for y in range(1, 3):
-            grid[0, y].is_room = True
-            grid[4, y].is_room = True
+            grid.set_room_cell((0, y))
+            grid.set_room_cell((4, y))
         for x in (0, 4):
             for y in (0, 3):
-                grid[x, y].valid_cell = False
+                grid.set_valid_cell((x, y), False)
         self.floor_map_generator.create_rooms()
 
         for x in range(1, 4):
@@ -163,8 +279,7 @@ class FloorFactory:
 
     def generate_line(self):
         grid_size = 5, 1
-        grid_xs = [0, 11, 22, 33, 44, 56]
-        grid_ys = [4, 15]
+        grid_xs, grid_ys = self.scaled_grid_positions([0, 11, 22, 33, 44, 56], [4, 15])
         self.floor_map_generator.init_grid(grid_size, grid_xs, grid_ys)
         self.floor_map_generator.assign_rooms()
         self.floor_map_generator.create_rooms()
@@ -175,17 +290,16 @@ class FloorFactory:
 
     def generate_cross(self):
         grid_size = (3, 3)
-        grid_xs = [11, 22, 33, 44]
-        grid_ys = [2, 11, 20, 31]
+        grid_xs, grid_ys = self.scaled_grid_positions([11, 22, 33, 44], [2, 11, 20, 31])
         self.floor_map_generator.init_grid(grid_size, grid_xs, grid_ys)
 
         grid = self.floor_map_generator.grid
         for x in (0, 2):
             for y in (0, 2):
-                grid[x, y].valid_cell = False
+                grid.set_valid_cell((x, y), False)
         for i in range(3):
-            grid[i, 1].is_room = True
-            grid[1, i].is_room = True
+            grid.set_room_cell((i, 1))
+            grid.set_room_cell((1, i))
         self.floor_map_generator.create_rooms()
         for x in range(2):
             self.floor_map_generator.connect_cell_in_direction((x, 1), Direction.EAST)
@@ -196,12 +310,11 @@ class FloorFactory:
 
     def generate_beetle(self):
         grid_size = (3, 3)
-        grid_xs = [5, 15, 36, 50]
-        grid_ys = [2, 11, 20, 31]
+        grid_xs, grid_ys = self.scaled_grid_positions([5, 15, 36, 50], [2, 11, 20, 31])
         self.floor_map_generator.init_grid(grid_size, grid_xs, grid_ys)
         grid = self.floor_map_generator.grid
-        for _, cell in grid.cells.items():
-            cell.is_room = True
+        for cell in grid.get_cells():
+            grid.set_room_cell(cell.get_xy())
         self.floor_map_generator.create_rooms()
         for x in range(2):
             for y in range(3):
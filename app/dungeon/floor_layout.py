@@ -0,0 +1,173 @@
+from __future__ import annotations
+from dataclasses import dataclass, replace
+import json
+from typing import BinaryIO
+
+import numpy as np
+
+from app.dungeon.floor import Floor, positions
+from app.dungeon.room import Room
+from app.dungeon.trap import Trap
+import app.db.item as item_db
+
+
+ARRAY_FIELDS = (
+    "tile_type",
+    "room_index",
+    "is_impassable",
+    "can_spawn",
+    "is_shop",
+    "tile_mask",
+    "cardinal_tile_mask",
+)
+
+
+@dataclass(frozen=True, eq=False)
+class FloorLayout:
+    """
+    A compact record of a generated floor: the tile arrays, rooms and the
+    static spawns (stairs, traps and items). It holds no Pokemon or surfaces,
+    so it can be pickled and sent between processes. Items are stored by id
+    and only loaded when the layout is applied to a Floor.
+    """
+
+    width: int
+    height: int
+    tile_type: np.ndarray
+    room_index: np.ndarray
+    is_impassable: np.ndarray
+    can_spawn: np.ndarray
+    is_shop: np.ndarray
+    tile_mask: np.ndarray
+    cardinal_tile_mask: np.ndarray
+    rooms: dict[int, Room]
+    stairs_spawn: tuple[int, int]
+    has_shop: bool
+    traps: dict[tuple[int, int], Trap]
+    items: dict[tuple[int, int], int]
+
+    @staticmethod
+    def from_floor(
+        floor: Floor, items: dict[tuple[int, int], int] = None
+    ) -> FloorLayout:
+        """
+        :param floor: The floor to copy.
+        :param items: Item ids by position. Defaults to the items on the floor.
+        """
+        tiles = floor.tiles
+        if items is None:
+            items = {position: item.item_id for position, item in tiles.items.items()}
+        return FloorLayout(
+            floor.WIDTH,
+            floor.HEIGHT,
+            tiles.tile_type.copy(),
+            tiles.room_index.copy(),
+            tiles.is_impassable.copy(),
+            tiles.can_spawn.copy(),
+            tiles.is_shop.copy(),
+            tiles.tile_mask.copy(),
+            tiles.cardinal_tile_mask.copy(),
+            {index: _copy_room(room) for index, room in floor.rooms.items()},
+            floor.stairs_spawn,
+            floor.has_shop,
+            dict(tiles.traps),
+            dict(items),
+        )
+
+    def apply(self, floor: Floor):
+        """
+        Copies the layout into a floor of the same size. Must be called on the
+        main thread as the item surfaces are loaded here.
+
+        :param floor: The floor to overwrite.
+        """
+        assert floor.SIZE == (self.width, self.height)
+        tiles = floor.tiles
+        tiles.reset()
+        floor.occupancy.clear()
+        tiles.tile_type[:] = self.tile_type
+        tiles.room_index[:] = self.room_index
+        tiles.is_impassable[:] = self.is_impassable
+        tiles.can_spawn[:] = self.can_spawn
+        tiles.is_shop[:] = self.is_shop
+        tiles.tile_mask[:] = self.tile_mask
+        tiles.cardinal_tile_mask[:] = self.cardinal_tile_mask
+        tiles.traps.update(self.traps)
+        tiles.items.update(
+            (position, item_db.load(item_id))
+            for position, item_id in self.items.items()
+        )
+
+        floor.rooms.clear()
+        floor.rooms.update(
+            (index, _copy_room(room)) for index, room in self.rooms.items()
+        )
+        floor.stairs_spawn = self.stairs_spawn
+        floor.has_shop = self.has_shop
+        floor.update_spawn_locations()
+
+    def save(self, file: BinaryIO):
+        """
+        Writes the layout as an uncompressed .npz archive: one entry per tile
+        array, plus the remaining fields as JSON.
+        """
+        meta = {
+            "width": self.width,
+            "height": self.height,
+            "rooms": [
+                [
+                    room.index,
+                    list(room.topleft),
+                    list(room.size),
+                    [list(p) for p in room.exits],
+                    room.is_shop,
+                    room.merged,
+                ]
+                for room in self.rooms.values()
+            ],
+            "stairs_spawn": list(self.stairs_spawn),
+            "has_shop": self.has_shop,
+            "traps": [[x, y, trap.value] for (x, y), trap in self.traps.items()],
+            "items": [[x, y, item_id] for (x, y), item_id in self.items.items()],
+        }
+        np.savez(
+            file,
+            meta=np.array(json.dumps(meta)),
+            **{name: getattr(self, name) for name in ARRAY_FIELDS},
+        )
+
+    @staticmethod
+    def load(file: BinaryIO) -> FloorLayout:
+        with np.load(file, allow_pickle=False) as archive:
+            meta = json.loads(archive["meta"].item())
+            arrays = {name: archive[name] for name in ARRAY_FIELDS}
+        return FloorLayout(
+            width=meta["width"],
+            height=meta["height"],
+            rooms={
+                index: Room(
+                    index,
+                    tuple(topleft),
+                    tuple(size),
+                    positions(arrays["room_index"] == index),
+                    [tuple(p) for p in exits],
+                    is_shop,
+                    merged,
+                )
+                for index, topleft, size, exits, is_shop, merged in meta["rooms"]
+            },
+            stairs_spawn=tuple(meta["stairs_spawn"]),
+            has_shop=meta["has_shop"],
+            traps={(x, y): Trap(trap) for x, y, trap in meta["traps"]},
+            items={(x, y): item_id for x, y, item_id in meta["items"]},
+            **arrays,
+        )
+
+
+def _copy_room(room: Room) -> Room:
+    return replace(
+        room,
+        tiles=list(room.tiles),
+        exits=list(room.exits),
+        merged=list(room.merged),
+    )
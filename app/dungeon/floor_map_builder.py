@@ -1,5 +1,6 @@
-from app.dungeon.floor import Floor
+from app.dungeon.floor import FLOOR_HEIGHT, FLOOR_WIDTH, Floor
 from app.dungeon.tile import Tile
+from app.dungeon.tile_type import TileType
 
 from functools import partial
 
@@ -12,8 +13,9 @@ class FloorMapBuilder:
     Floor object.
     """
 
-    def __init__(self, width=56, height=32):
+    def __init__(self, width=FLOOR_WIDTH, height=FLOOR_HEIGHT):
         self.floor = Floor(width, height)
+        self.merged_rooms: dict[int, list[int]] = {}
 
     def _set_tiles(self, coords, tile_setter):
         """
@@ -48,8 +50,27 @@ class FloorMapBuilder:
         """
         x0, y0 = topleft
         w, h = size
-        coords = [(x, y) for x in range(x0, x0 + w) for y in range(y0, y0 + h)]
-        self.set_room(coords, room_num)
+        area = slice(x0, x0 + w), slice(y0, y0 + h)
+        self.floor.tiles.tile_type[area] = TileType.TERTIARY.value
+        self.floor.tiles.room_index[area] = room_num
+        self.floor.tiles.can_spawn[area] = True
+
+    def set_rect_shop(
+        self, topleft: tuple[int, int], size: tuple[int, int], room_num: int
+    ):
+        """
+        Turns a rectangular collection of tiles of a room into shop tiles.
+
+        :param topleft: Top-left coordinate of the rectangle.
+        :param size: The dimensions of the rectangle.
+        :param room_num: The id of the room.
+        """
+        x0, y0 = topleft
+        w, h = size
+        area = slice(x0, x0 + w), slice(y0, y0 + h)
+        self.floor.tiles.tile_type[area] = TileType.TERTIARY.value
+        self.floor.tiles.room_index[area] = room_num
+        self.floor.tiles.is_shop[area] = True
 
     def set_hallway(self, coords: list[tuple[int, int]]):
         """
@@ -71,9 +92,11 @@ class FloorMapBuilder:
         """
         Sets all tiles and data to its default state.
         """
-        for tile in self.floor:
-            tile.reset()
-        self.floor.room_exits.clear()
+        self.floor.tiles.reset()
+        self.floor.occupancy.clear()
+        self.floor.spawn_locations.reset(())
+        self.floor.rooms.clear()
+        self.merged_rooms.clear()
         self.floor.stairs_spawn = (0, 0)
         self.floor.has_shop = False
 
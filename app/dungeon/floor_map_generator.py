@@ -3,6 +3,7 @@ import random
 from app.common.constants import RNG
 from app.common.utils import clamp
 from app.common.direction import Direction
+from app.dungeon.floor import FLOOR_HEIGHT, FLOOR_WIDTH
 from app.dungeon.floor_map_builder import FloorMapBuilder
 from app.dungeon.floor_data import FloorData
 from app.dungeon.grid_cell import Grid, Cell
@@ -15,8 +16,13 @@ class FloorMapGenerator(FloorMapBuilder):
     lakes.
     """
 
-    def __init__(self, data: FloorData, generator: random.Random = RNG):
-        super().__init__()
+    def __init__(
+        self,
+        data: FloorData,
+        generator: random.Random = RNG,
+        size: tuple[int, int] = (FLOOR_WIDTH, FLOOR_HEIGHT),
+    ):
+        super().__init__(*size)
         self.data = data
         self.generator = generator
 
@@ -28,11 +34,36 @@ class FloorMapGenerator(FloorMapBuilder):
         xs: list[int],
         ys: list[int],
         floor_size: int = 0,
+        density: int = 1,
     ):
-        self.grid = Grid(size, xs, ys, floor_size)
+        self.grid = Grid(size, xs, ys, floor_size, density)
+
+    def scale_x(self, x: int) -> int:
+        """
+        :param x: An x coordinate on a standard size floor.
+        :return: The corresponding x coordinate on this floor.
+        """
+        return x * self.floor.WIDTH // FLOOR_WIDTH
+
+    def scale_y(self, y: int) -> int:
+        """
+        :param y: A y coordinate on a standard size floor.
+        :return: The corresponding y coordinate on this floor.
+        """
+        return y * self.floor.HEIGHT // FLOOR_HEIGHT
+
+    def grid_scale(self) -> tuple[int, int]:
+        """
+        :return: How many times more grid cells fit across and down this floor
+                 than a standard size floor, so that rooms keep a similar size.
+        """
+        return (
+            max(1, self.floor.WIDTH // FLOOR_WIDTH),
+            max(1, self.floor.HEIGHT // FLOOR_HEIGHT),
+        )
 
     def _is_tile_type(self, x: int, y: int, tile_type: TileType) -> bool:
-        return self.floor[x, y].tile_type == tile_type
+        return self.floor.get_tile_type((x, y)) is tile_type
 
     def _is_primary_tile(self, x: int, y: int) -> bool:
         return self._is_tile_type(x, y, TileType.PRIMARY)
@@ -51,20 +82,20 @@ class FloorMapGenerator(FloorMapBuilder):
         """
         Sets random cells in the grid to a room cell.
         """
-        valid_cells = self.grid.get_valid_cells()
+        valid_cells = list(self.grid.get_valid_cells())
         assert len(valid_cells) >= 2
 
         MIN_ROOMS = 2
         MAX_ROOMS = len(valid_cells)
         room_density = clamp(
             MIN_ROOMS,
-            self.data.get_room_density_value(self.generator),
+            self.data.get_room_density_value(self.generator) * self.grid.density,
             MAX_ROOMS,
         )
 
         self.generator.shuffle(valid_cells)
         for _ in range(room_density):
-            valid_cells.pop().is_room = True
+            self.grid.set_room_cell(valid_cells.pop().get_xy())
 
     def create_rooms(self):
         room_number = 1
@@ -107,7 +138,7 @@ class FloorMapGenerator(FloorMapBuilder):
         position = self.generator.choice(
             [cell.get_xy() for cell in self.grid.get_valid_cells()]
         )
-        for _ in range(self.data.floor_connectivity):
+        for _ in range(self.data.floor_connectivity * self.grid.density):
             position = self.connect_cell(position)
         if not self.data.dead_ends:
             self.remove_dead_ends()
@@ -129,14 +160,14 @@ class FloorMapGenerator(FloorMapBuilder):
 
     def connect_cell_in_direction(self, position: tuple[int, int], d: Direction):
         x, y = position
-        self.grid[x, y].connections.add(d)
-        self.grid[x + d.x, y + d.y].connections.add(d.flip())
+        self.grid[x, y].connect(d)
+        self.grid[x + d.x, y + d.y].connect(d.flip())
 
     def remove_dead_ends(self):
         dead_end_cells = (
             c
             for c in self.grid.get_valid_cells()
-            if not c.is_room and c.connections == 1
+            if not c.is_room and c.get_connection_count() == 1
         )
         for dead_end_cell in dead_end_cells:
             self.connect_cell(dead_end_cell.get_xy())
@@ -146,7 +177,7 @@ class FloorMapGenerator(FloorMapBuilder):
         connections = (
             (cell, d)
             for cell in self.grid.get_valid_cells()
-            for d in cell.connections
+            for d in cell.get_connections()
             if d in (Direction.EAST, Direction.SOUTH)
         )
         for cell, d in connections:
@@ -186,29 +217,32 @@ class FloorMapGenerator(FloorMapBuilder):
 
     def merge_rooms(self):
         MERGE_CHANCE = 5
-        cells = (
-            cell
-            for cell in self.grid.get_valid_cells()
-            if cell.is_room and cell.is_connected
-        )
+        cells = [cell for cell in self.grid.get_room_cells() if cell.is_connected]
+        mergeable = set(cells)
         for cell in cells:
-            d = self.generator.choice(list(cell.connections))
+            d = self.generator.choice(cell.get_connections())
             other_cell = self.grid.get_adjacent_cell(cell, d)
             valid_merge = (
-                not (cell.is_merged or other_cell.is_merged) and other_cell in cells
+                not (cell.is_merged or other_cell.is_merged)
+                and other_cell in mergeable
             )
             if valid_merge and self.generator.randrange(100) < MERGE_CHANCE:
                 self.merge_specific_rooms(cell, other_cell)
 
     def merge_specific_rooms(self, cell: Cell, other_cell: Cell):
-        room_index = self.floor[cell.start_x, cell.start_y].room_index
+        room_index = self.floor.get_room_index((cell.start_x, cell.start_y))
+        other_index = self.floor.get_room_index(
+            (other_cell.start_x, other_cell.start_y)
+        )
+        if other_index not in (0, room_index):
+            merged = self.merged_rooms.setdefault(room_index, [])
+            merged.append(other_index)
+            merged.extend(self.merged_rooms.pop(other_index, []))
         x0 = other_cell.start_x = min(cell.start_x, other_cell.start_x)
         y0 = other_cell.start_y = min(cell.start_y, other_cell.start_y)
         x1 = other_cell.end_x = max(cell.end_x, other_cell.end_x)
         y1 = other_cell.end_y = max(cell.end_y, other_cell.end_y)
-        for x in range(x0, x1):
-            for y in range(y0, y1):
-                self.floor[x, y].room_tile(room_index)
+        self.set_rect_room((x0, y0), (x1 - x0, y1 - y0), room_index)
         cell.is_merged = True
         other_cell.is_merged = True
 
@@ -221,7 +255,7 @@ class FloorMapGenerator(FloorMapBuilder):
         for cell in isolated_cells:
             if cell.is_room:
                 self.connect_cell(cell.get_xy())
-                for d in cell.connections:
+                for d in cell.get_connections():
                     self.create_hallway(cell, d)
             else:
                 self.floor[cell.start_x, cell.start_y].reset()
@@ -232,18 +266,20 @@ class FloorMapGenerator(FloorMapBuilder):
 
         valid_shop_cells = [
             c
-            for c in self.grid.get_valid_cells()
-            if c.is_room and c.is_connected and not c.is_merged and not c.secondary
+            for c in self.grid.get_room_cells()
+            if c.is_connected and not c.is_merged and not c.secondary
         ]
         if not valid_shop_cells:
             return
 
         cell = self.generator.choice(valid_shop_cells)
         self.floor.has_shop = True
-        room_number = self.floor[cell.start_x, cell.start_y].room_index
-        for x in range(cell.start_x + 1, cell.end_x - 1):
-            for y in range(cell.start_y + 1, cell.end_y - 1):
-                self.floor[x, y].shop_tile(room_number)
+        room_number = self.floor.get_room_index((cell.start_x, cell.start_y))
+        self.set_rect_shop(
+            (cell.start_x + 1, cell.start_y + 1),
+            (cell.end_x - cell.start_x - 2, cell.end_y - cell.start_y - 2),
+            room_number,
+        )
 
     def _find_extra_hallway_start(self, cell: Cell) -> tuple[int, int, Direction]:
         cur_x = self.generator.randrange(cell.start_x, cell.end_x)
@@ -304,11 +340,11 @@ class FloorMapGenerator(FloorMapBuilder):
         if not self._is_valid_extra_hallway_start(x, y, d):
             return
 
-        MAX_X = (
-            32
-            if self.grid.floor_size == 1
-            else 48 if self.grid.floor_size == 2 else self.floor.WIDTH - 2
-        )
+        MAX_X = self.floor.WIDTH - 2
+        if self.grid.floor_size == 1:
+            MAX_X = self.scale_x(32)
+        elif self.grid.floor_size == 2:
+            MAX_X = self.scale_x(48)
         MAX_Y = self.floor.HEIGHT - 2
 
         def in_bounds(x: int, y: int) -> bool:
@@ -411,7 +447,7 @@ class FloorMapGenerator(FloorMapBuilder):
     def get_river_path(self) -> list[tuple[int, int]]:
         MIN_X, MAX_X = 2, self.floor.WIDTH - 2
         MIN_Y, MAX_Y = 2, self.floor.HEIGHT - 2
-        NUM_SECTIONS = 20
+        NUM_SECTIONS = self.scale_y(20)
 
         x = self.generator.randrange(MIN_X, MAX_X)
         d, y = self.generator.choice(
@@ -450,31 +486,106 @@ class FloorMapGenerator(FloorMapBuilder):
         NUM_RIVERS = self.generator.randrange(1, 4)
         for _ in range(NUM_RIVERS):
             self.generate_river()
-        for _ in range(self.data.water_density):
+        # Larger floors get proportionally more lakes.
+        NUM_LAKES = self.scale_x(self.scale_y(self.data.water_density))
+        for _ in range(NUM_LAKES):
             self.generate_lake()
 
+    def get_connected_components(self) -> list[set[Cell]]:
+        """
+        Groups the connected cells by which cells they can reach by following
+        their connections, using an iterative depth first search.
+
+        :return: Returns the components, largest first.
+        """
+        components: list[set[Cell]] = []
+        visited = set()
+        for start in self.grid.get_valid_cells():
+            if not start.is_connected or start in visited:
+                continue
+            component = set()
+            dfs_stack = [start]
+            while dfs_stack:
+                cell = dfs_stack.pop()
+                if cell in component:
+                    continue
+                component.add(cell)
+                for d in cell.get_connections():
+                    other = self.grid.get_adjacent_cell(cell, d)
+                    if other is not None and other not in component:
+                        dfs_stack.append(other)
+            visited |= component
+            components.append(component)
+
+        components.sort(key=len, reverse=True)
+        return components
+
     def is_strongly_connected(self) -> bool:
         """
-        Does an iterative depth first search traversal of the cells to check if
-        they are strongly connected, i.e. all valid cells can reach every other
-        valid cell.
+        Checks if the cells are strongly connected, i.e. all connected valid
+        cells can reach every other connected valid cell.
 
         :return: Returns whether valid cells are strongly connected.
         """
-        valid_cells = self.grid.get_valid_cells()
-        assert valid_cells
+        return len(self.get_connected_components()) <= 1
 
-        visited = set()
-        dfs_stack = [valid_cells[0]]
+    def repair_connectivity(self) -> int:
+        """
+        Links disconnected components with extra hallways between bordering
+        cells of different components. If no two components border each other,
+        each smaller component is instead grown into one adjacent unconnected
+        cell, so that a later repair can link it.
+
+        :return: Returns the number of hallways created.
+        """
+        components = self.get_connected_components()
+        if len(components) <= 1:
+            return 0
+
+        component_of = {
+            cell: i for i, component in enumerate(components) for cell in component
+        }
+        parents = list(range(len(components)))
 
-        while dfs_stack:
-            cell = dfs_stack.pop()
-            if cell in visited:
+        def find(i: int) -> int:
+            while parents[i] != i:
+                i = parents[i]
+            return i
+
+        links: list[tuple[Cell, Direction]] = []
+        for cell in self.grid.get_valid_cells():
+            if cell not in component_of:
                 continue
-            visited.add(cell)
-            for d in cell.connections:
+            for d in Direction.get_cardinal_directions():
                 other = self.grid.get_adjacent_cell(cell, d)
-                if other not in visited:
-                    dfs_stack.append(other)
+                if other is None or not other.valid_cell or other not in component_of:
+                    continue
+                i, j = find(component_of[cell]), find(component_of[other])
+                if i != j:
+                    parents[j] = i
+                    links.append((cell, d))
+
+        if not links:
+            for component in components[1:]:
+                link = self._find_growth_link(component, component_of)
+                if link is not None:
+                    links.append(link)
+
+        for cell, d in links:
+            self.connect_cell_in_direction(cell.get_xy(), d)
+            self.create_hallway(cell, d)
+        return len(links)
 
-        return all(not cell.is_connected or cell in visited for cell in valid_cells)
+    def _find_growth_link(
+        self, component: set[Cell], component_of: dict[Cell, int]
+    ) -> tuple[Cell, Direction] | None:
+        links = (
+            (cell, d)
+            for cell in self.grid.get_valid_cells()
+            if cell in component
+            for d in Direction.get_cardinal_directions()
+            if (other := self.grid.get_adjacent_cell(cell, d)) is not None
+            and other.valid_cell
+            and other not in component_of
+        )
+        return next(links, None)
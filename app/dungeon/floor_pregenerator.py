@@ -0,0 +1,88 @@
+from __future__ import annotations
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import random
+
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory, floor_seed
+from app.dungeon.floor_layout import FloorLayout
+from app.dungeon.layout_cache import LayoutCache
+import app.db.floor_data as floor_data_db
+
+
+@dataclass(frozen=True)
+class PendingFloor:
+    """
+    A floor layout being generated in the background.
+    """
+
+    data: FloorData
+    seed: int
+    future: Future
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self) -> FloorLayout:
+        return self.future.result()
+
+
+def generate_layout(
+    data: FloorData, dungeon_id: int, seed: int, cache: LayoutCache = None
+) -> FloorLayout:
+    """
+    Worker entry point. Module level so it can be pickled for process pools.
+    """
+    if cache is None:
+        return FloorFactory(data, None, random.Random(seed)).create_layout()
+    return cache.get_or_generate(data, dungeon_id, seed)
+
+
+_executor: Executor = None
+_layout_cache: LayoutCache = None
+
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor")
+    return _executor
+
+
+def set_executor(executor: Executor):
+    """
+    Replaces the executor used for pre-generation, e.g. with a
+    ProcessPoolExecutor.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = executor
+
+
+def set_layout_cache(cache: LayoutCache):
+    """
+    Enables reusing layouts from an on-disk cache, or disables it with None.
+    """
+    global _layout_cache
+    _layout_cache = cache
+
+
+def submit(dungeon_id: int, floor_id: int, run_seed: int) -> PendingFloor | None:
+    """
+    Starts generating the layout of a floor in the background. The floor data
+    is loaded here, on the calling thread, as the database connection cannot
+    be shared with the worker.
+
+    :param run_seed: The seed of the run, from which the floor seed is derived.
+    :return: The pending floor, or None if the floor does not exist, as after
+             the last floor of a dungeon.
+    """
+    if not floor_data_db.has_floor(dungeon_id, floor_id):
+        return None
+    data = floor_data_db.load(dungeon_id, floor_id)
+    seed = floor_seed(run_seed, dungeon_id, floor_id)
+    future = get_executor().submit(
+        generate_layout, data, dungeon_id, seed, _layout_cache
+    )
+    return PendingFloor(data, seed, future)
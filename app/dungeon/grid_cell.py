@@ -4,12 +4,40 @@ from app.common.constants import RNG
 from app.common.direction import Direction
 
 
+# Bit of each cardinal direction in a connection mask.
+CONNECTION_BITS = {
+    d: 1 << i for i, d in enumerate(Direction.get_cardinal_directions())
+}
+# The connected directions of every connection mask, in Direction order so
+# that generation does not depend on the order connections were made.
+MASK_DIRECTIONS = tuple(
+    tuple(d for d in Direction if mask & CONNECTION_BITS.get(d, 0))
+    for mask in range(1 << len(CONNECTION_BITS))
+)
+
+
 class Cell:
     """
     A helper data class for the dungeon generation algorithm, representing a
     segment of the floor map.
     """
 
+    __slots__ = (
+        "x",
+        "y",
+        "start_x",
+        "start_y",
+        "end_x",
+        "end_y",
+        "valid_cell",
+        "is_room",
+        "is_connected",
+        "is_merged",
+        "connections",
+        "imperfect",
+        "secondary",
+    )
+
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
@@ -21,13 +49,25 @@ class Cell:
         self.is_room = False
         self.is_connected = False
         self.is_merged = False
-        self.connections: set[Direction] = set()
+        self.connections = 0
         self.imperfect = False
         self.secondary = False
 
     def get_xy(self) -> tuple[int, int]:
         return (self.x, self.y)
 
+    def connect(self, d: Direction):
+        self.connections |= CONNECTION_BITS[d]
+
+    def get_connections(self) -> tuple[Direction, ...]:
+        """
+        :return: The connected directions in a fixed order.
+        """
+        return MASK_DIRECTIONS[self.connections]
+
+    def get_connection_count(self) -> int:
+        return len(MASK_DIRECTIONS[self.connections])
+
     def get_random_xy_in_room(self, generator: random.Random = RNG) -> tuple[int, int]:
         if not self.is_room:
             x0, y0 = self.start_x, self.start_y
@@ -40,7 +80,12 @@ class Cell:
 class Grid:
     """
     A helper class for the dungeon generation algorithm, representing the floor
-    as a grid of cells.
+    as a grid of cells. Cells are stored in a flat list, column by column, and
+    the lists of valid and room cells are cached. Mark cells as valid or as
+    rooms through the grid so that the caches stay correct.
+
+    A grid on a floor larger than standard can span several standard grids,
+    given by density, and gets that many times more rooms and connections.
     """
 
     def __init__(
@@ -49,20 +94,25 @@ class Grid:
         xs: list[int],
         ys: list[int],
         floor_size: int = 0,
+        density: int = 1,
     ):
         self.size = size
         self.w, self.h = size
         self.xs = xs
         self.ys = ys
         self.floor_size = floor_size
-        self.cells = {(x, y): Cell(x, y) for x in range(self.w) for y in range(self.h)}
+        self.density = density
+        self.cells = [Cell(x, y) for x in range(self.w) for y in range(self.h)]
+        self._valid_cells: list[Cell] = None
+        self._room_cells: list[Cell] = None
 
         for x in range(self._get_max_cell_x()):
             for y in range(self.h):
                 self.set_valid_cell((x, y))
 
     def __getitem__(self, xy: tuple[int, int]) -> Cell:
-        return self.cells[xy]
+        x, y = xy
+        return self.cells[x * self.h + y]
 
     def _get_max_cell_x(self):
         max_x = self.w
@@ -73,20 +123,40 @@ class Grid:
         return max_x
 
     def get_cells(self) -> list[Cell]:
-        return list(self.cells.values())
+        return self.cells
+
+    def set_valid_cell(self, xy, valid_cell: bool = True):
+        self[xy].valid_cell = valid_cell
+        self._valid_cells = None
+        self._room_cells = None
 
-    def set_valid_cell(self, xy):
-        self[xy].valid_cell = True
+    def set_room_cell(self, xy, is_room: bool = True):
+        self[xy].is_room = is_room
+        self._room_cells = None
 
     def get_valid_cells(self) -> list[Cell]:
-        return list(filter(lambda c: c.valid_cell, list(self.cells.values())))
+        """
+        :return: The valid cells. The list is shared, so must not be modified.
+        """
+        if self._valid_cells is None:
+            self._valid_cells = [c for c in self.cells if c.valid_cell]
+        return self._valid_cells
+
+    def get_room_cells(self) -> list[Cell]:
+        """
+        :return: The valid room cells. The list is shared, so must not be
+                 modified.
+        """
+        if self._room_cells is None:
+            self._room_cells = [c for c in self.get_valid_cells() if c.is_room]
+        return self._room_cells
 
     def get_adjacent_cell(self, cell: Cell, d: Direction) -> Cell:
         x = cell.x + d.x
         y = cell.y + d.y
         if x < 0 or self.w <= x or y < 0 or self.h <= y:
             return None
-        return self[x, y]
+        return self.cells[x * self.h + y]
 
     def get_valid_directions_from_cell(self, x: int, y: int) -> list[Direction]:
         ds: list[Direction] = []
@@ -1,9 +1,8 @@
-from typing import Callable
-
 import pygame
 
 from app.common import constants
 from app.gui import text
+from app.gui.render_target import RenderTarget
 import app.db.hud_components as hud_components_db
 from app.dungeon.dungeon import Dungeon
 
@@ -15,6 +14,12 @@ YELLOW = pygame.Color(248, 248, 0)  # TODO: Verify
 
 
 class Hud:
+    """
+    The HUD is drawn from the floor number, the level and HP of the target and
+    the colour of the labels. It is only drawn again when one of them changes,
+    which is a few times a turn at most.
+    """
+
     def __init__(self, dungeon: Dungeon):
         self.dungeon = dungeon
 
@@ -22,24 +27,30 @@ class Hud:
         self.palette_12 = ORANGE
         hud_components_db.set_palette_12(self.palette_12)
         self.frames = 0
+        self.render_target = RenderTarget(constants.DISPLAY_SIZE, pygame.SRCALPHA)
+        self.white_numbers = hud_components_db.get_white_numbers()
+        self.green_numbers = hud_components_db.get_green_numbers()
 
     @property
-    def get_number(self) -> Callable[[int], pygame.Surface]:
+    def numbers(self) -> list[pygame.Surface]:
         return (
-            hud_components_db.get_white_number
+            self.white_numbers
             if self.target is self.dungeon.party.leader
-            else hud_components_db.get_green_number
+            else self.green_numbers
         )
 
-    def number_surface(self, n: int) -> pygame.Surface:
+    def draw_number(
+        self, surface: pygame.Surface, n: int, position: tuple[int, int]
+    ) -> int:
+        """
+        :return: The width of the number drawn.
+        """
+        x, y = position
+        numbers = self.numbers
         s = str(n)
-        size = (hud_components_db.SIZE * len(s), hud_components_db.SIZE)
-        surface = pygame.Surface(size, pygame.SRCALPHA)
         for i, digit in enumerate(s):
-            digit_surface = self.get_number(int(digit))
-            digit_position = (i * hud_components_db.SIZE, 0)
-            surface.blit(digit_surface, digit_position)
-        return surface
+            surface.blit(numbers[int(digit)], (x + i * hud_components_db.SIZE, y))
+        return len(s) * hud_components_db.SIZE
 
     def update(self):
         # TODO: Need to flash frame as well
@@ -47,6 +58,7 @@ class Hud:
         FLASH_TIME_PERIOD = constants.FPS // 4
         hp_data = self.target.status.hp
         belly_data = self.target.status.belly
+        palette_12 = self.palette_12
         if hp_data.value < FLASH_THRESHOLD * hp_data.max_value or belly_data.value == 0:
             self.frames %= FLASH_TIME_PERIOD
             if self.frames == 0:
@@ -55,8 +67,8 @@ class Hud:
         else:
             self.frames = 0
             self.palette_12 = ORANGE
-        hud_components_db.set_palette_12(self.palette_12)
-
+        if self.palette_12 is not palette_12:
+            hud_components_db.set_palette_12(self.palette_12)
 
     def render(self) -> pygame.Surface:
         CURRENT_HP = self.target.status.hp.value
@@ -64,15 +76,25 @@ class Hud:
         LEVEL = self.target.stats.level.value
         FLOOR_NO = self.dungeon.floor_data.floor_number
 
-        surface = pygame.Surface(constants.DISPLAY_SIZE, pygame.SRCALPHA)
+        surface = self.render_target.surface
+        key = (
+            FLOOR_NO,
+            LEVEL,
+            CURRENT_HP,
+            TOTAL_HP,
+            tuple(self.palette_12),
+            self.numbers is self.white_numbers,
+        )
+        if not self.render_target.is_stale(key):
+            return surface
+        surface.fill(constants.TRANSPARENT)
 
         x = 0
         # Floor
         if self.dungeon.dungeon_data.is_below:
             surface.blit(hud_components_db.get_b(), (x, 0))
             x += hud_components_db.SIZE
-        surface.blit(self.number_surface(FLOOR_NO), (x, 0))
-        x += len(str(FLOOR_NO)) * hud_components_db.SIZE
+        x += self.draw_number(surface, FLOOR_NO, (x, 0))
         surface.blit(hud_components_db.get_f(), (x, 0))
         x += hud_components_db.SIZE
         # Level
@@ -80,16 +102,14 @@ class Hud:
         x += hud_components_db.SIZE
         surface.blit(hud_components_db.get_v(), (x, 0))
         x += hud_components_db.SIZE
-        surface.blit(self.number_surface(LEVEL), (x, 0))
-        x += 4 * hud_components_db.SIZE
+        self.draw_number(surface, LEVEL, (x, 0))
         # HP
         surface.blit(hud_components_db.get_h(), (72, 0))
         surface.blit(hud_components_db.get_p(), (80, 0))
-        surface.blit(self.number_surface(CURRENT_HP), (88, 0))
-        x = 88 + len(str(CURRENT_HP)) * hud_components_db.SIZE
+        x = 88 + self.draw_number(surface, CURRENT_HP, (88, 0))
         surface.blit(hud_components_db.get_slash(), (x, 0))
         x += hud_components_db.SIZE
-        surface.blit(self.number_surface(TOTAL_HP), (x, 0))
+        self.draw_number(surface, TOTAL_HP, (x, 0))
         # 3 digit hp, slash, 3 digit max hp = max 7 components
         # HP bar
         pygame.draw.rect(
@@ -0,0 +1,73 @@
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+import os
+import random
+from typing import Iterable, Iterator
+
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory
+from app.dungeon.floor_layout import FloorLayout
+
+
+def generate_chunk(data: FloorData, seeds: list[int]) -> list[FloorLayout]:
+    """
+    Worker entry point. One FloorFactory, and so one FloorMapGenerator and
+    Floor, is reused for every seed of the chunk, reseeding its generator
+    between floors. No Pokemon are spawned and no tileset is loaded.
+    """
+    generator = random.Random()
+    factory = FloorFactory(data, None, generator)
+    layouts = []
+    for seed in seeds:
+        generator.seed(seed)
+        layouts.append(factory.create_layout())
+    return layouts
+
+
+def generate_layouts(
+    data: FloorData,
+    seeds: Iterable[int],
+    executor: Executor = None,
+    max_workers: int = None,
+    chunk_size: int = 16,
+) -> Iterator[FloorLayout]:
+    """
+    Generates the layout of a floor for each seed, fanned out across worker
+    processes. Layouts are streamed back in the order of the seeds while
+    later chunks are still being generated, and only a few chunks per worker
+    are in flight at once, so arbitrarily many seeds can be requested.
+
+    :param data: The floor to generate.
+    :param seeds: The seed of each layout, as passed to random.Random.
+    :param executor: The executor to use. Defaults to a ProcessPoolExecutor
+                     that is shut down once the layouts are exhausted.
+    :param max_workers: Number of processes of the default executor, or the
+                        number of workers of the given one. Defaults to the
+                        number of CPUs.
+    :param chunk_size: Number of seeds sent to a worker at a time.
+    :return: The layouts, one per seed.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers)
+    max_in_flight = 2 * max_workers
+
+    seeds = iter(seeds)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = [seed for _, seed in zip(range(chunk_size), seeds)]
+                if not chunk:
+                    break
+                pending.append(executor.submit(generate_chunk, data, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+import hashlib
+import os
+import random
+import tempfile
+import zipfile
+
+from app.common.constants import CACHE_DIRECTORY
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory, GENERATOR_VERSION
+from app.dungeon.floor_layout import FloorLayout
+
+
+class LayoutCache:
+    """
+    A content-addressed on-disk cache of generated floor layouts. Each layout
+    is stored in a file named by the hash of
+    (dungeon_id, floor_id, seed, generator_version), so bumping
+    GENERATOR_VERSION invalidates every earlier entry.
+    """
+
+    def __init__(self, directory: str = os.path.join(CACHE_DIRECTORY, "layouts")):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(dungeon_id: int, floor_id: int, seed: int) -> str:
+        key = f"{dungeon_id}:{floor_id}:{seed}:{GENERATOR_VERSION}".encode()
+        return hashlib.sha256(key).hexdigest()
+
+    def get_path(self, dungeon_id: int, floor_id: int, seed: int) -> str:
+        key = self.get_key(dungeon_id, floor_id, seed)
+        return os.path.join(self.directory, key[:2], f"{key}.npz")
+
+    def get(self, dungeon_id: int, floor_id: int, seed: int) -> FloorLayout | None:
+        path = self.get_path(dungeon_id, floor_id, seed)
+        try:
+            with open(path, "rb") as f:
+                layout = FloorLayout.load(f)
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            # A missing or corrupt entry is a miss, and is written again.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return layout
+
+    def put(self, dungeon_id: int, floor_id: int, seed: int, layout: FloorLayout):
+        path = self.get_path(dungeon_id, floor_id, seed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                layout.save(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def get_or_generate(
+        self, data: FloorData, dungeon_id: int, seed: int
+    ) -> FloorLayout:
+        layout = self.get(dungeon_id, data.floor_number, seed)
+        if layout is None:
+            layout = FloorFactory(data, None, random.Random(seed)).create_layout()
+            self.put(dungeon_id, data.floor_number, seed, layout)
+        return layout
@@ -1,13 +1,35 @@
+import numpy as np
 import pygame
 
 from app.common import constants
+from app.dungeon.chunk import (
+    CHUNK_SIZE,
+    chunk_of,
+    chunk_positions,
+    chunk_topleft,
+    chunks_in_rect,
+)
 from app.dungeon.floor import Floor
 from app.dungeon.trap import Trap
 from app.dungeon.darkness_level import DarknessLevel
 from app.db.minimap_components import MinimapComponents, Visibility
+from app.gui.render_target import allocate
 
 
 class Minimap:
+    """
+    The minimap is kept as one surface per chunk of the floor, drawn the first
+    time the chunk is shown, so revealing a tile only redraws that tile of its
+    chunk. Floors too large for the screen show only the part around the
+    leader.
+
+    The chunks in view are composed into a base surface, composed again only
+    when the view moves. The markers of the Pokemon are drawn over a copy of
+    the base, and when they move only the areas under their old positions are
+    restored from the base. A frame in which nothing moved draws nothing, so
+    the cost of a frame does not depend on the size of the floor.
+    """
+
     def __init__(
         self,
         floor: Floor,
@@ -17,48 +39,132 @@ class Minimap:
         self.components = MinimapComponents(1, color)
         self.darkness_level = darkness_level
         self.floor = floor
-        self.visible_tiles = set()
+        self.visible = np.zeros(self.floor.SIZE, dtype=bool)
         self.visible_rooms = set()
 
         self.surface_size = self._scale(self.floor.SIZE)
-
-        self.lower_surface = pygame.Surface(self.surface_size, pygame.SRCALPHA)
-        for x in range(self.floor.WIDTH):
-            for y in range(self.floor.HEIGHT):
-                pos = self._scale((x, y))
-                self.lower_surface.blit(self.get_component((x, y)), pos)
-
-        self.upper_surface = pygame.Surface(self.surface_size, pygame.SRCALPHA)
+        self.chunks: dict[tuple[int, int], pygame.Surface] = {}
+
+        self.view = pygame.Rect(
+            (0, 0),
+            (
+                min(self.surface_size.x, constants.DISPLAY_WIDTH),
+                min(self.surface_size.y, constants.DISPLAY_HEIGHT),
+            ),
+        )
+        self.base = allocate(self.view.size, pygame.SRCALPHA)
+        # The view the base was composed for, None until the first render.
+        self.base_view: pygame.Rect = None
+        # Areas of the base redrawn since the last render.
+        self.damaged: list[pygame.Rect] = []
+        # The markers drawn over the base, as (marker, area) pairs.
+        self.markers: list[tuple[pygame.Surface, pygame.Rect]] = []
+        self.surface = allocate(self.view.size, pygame.SRCALPHA)
 
     def update(self):
         self.set_visible(self.floor.party.leader.position)
 
-    def render(self) -> pygame.Vector2:
-        surface = pygame.Surface(self.surface_size, pygame.SRCALPHA)
-        surface.blit(self.lower_surface, (0, 0))
-        surface.blit(self.upper_surface, (0, 0))
-
-        surface.blits(
-            (self.components.enemy, self._scale(p.position))
-            for p in self.floor.active_enemies
-        )
-        surface.blit(
-            self.components.user,
-            self._scale(self.floor.party.leader.position),
+    def get_view(self) -> pygame.Rect:
+        """
+        :return: The part of the minimap shown, centred on the leader where the
+                 floor is larger than the screen.
+        """
+        view = self.view.copy()
+        view.center = self._scale(self.floor.party.leader.position)
+        view.clamp_ip(pygame.Rect((0, 0), self.surface_size))
+        return view
+
+    def get_chunk(self, chunk: tuple[int, int]) -> pygame.Surface:
+        if chunk not in self.chunks:
+            surface = allocate(self._scale((CHUNK_SIZE, CHUNK_SIZE)), pygame.SRCALPHA)
+            origin = self._scale(chunk_topleft(chunk))
+            for position in chunk_positions(chunk, self.floor.SIZE):
+                self._draw_tile(surface, origin, position)
+            self.chunks[chunk] = surface
+        return self.chunks[chunk]
+
+    def _draw_tile(
+        self,
+        surface: pygame.Surface,
+        origin: pygame.Vector2,
+        position: tuple[int, int],
+    ) -> pygame.Rect:
+        """
+        :param origin: The point of the minimap at the top-left of the surface.
+        :return: The area of the surface drawn to.
+        """
+        rect = pygame.Rect(
+            self._scale(position) - origin,
+            (self.components.SIZE, self.components.SIZE),
         )
-        surface.blits(
-            (self.components.ally, self._scale(p.position))
+        surface.fill(constants.TRANSPARENT, rect)
+        surface.blit(self.get_component(position), rect)
+        return rect
+
+    def compose_base(self, view: pygame.Rect):
+        self.base_view = view
+        self.base.fill(constants.TRANSPARENT)
+        SIZE = self.components.SIZE
+        x0, y0 = view.left // SIZE, view.top // SIZE
+        x1, y1 = (view.right - 1) // SIZE, (view.bottom - 1) // SIZE
+        for chunk in chunks_in_rect((x0, y0), (x1 - x0 + 1, y1 - y0 + 1)):
+            self.base.blit(
+                self.get_chunk(chunk),
+                self._scale(chunk_topleft(chunk)) - pygame.Vector2(view.topleft),
+            )
+
+    def get_markers(
+        self, view: pygame.Rect
+    ) -> list[tuple[pygame.Surface, pygame.Rect]]:
+        """
+        :return: The markers of the Pokemon on the floor and the areas of the
+                 view they are drawn to, in drawing order.
+        """
+
+        def at(marker: pygame.Surface, position: tuple[int, int]):
+            rect = pygame.Rect(self._scale(position), marker.get_size())
+            return marker, rect.move(-view.left, -view.top)
+
+        leader = self.floor.party.leader
+        markers = [
+            at(self.components.enemy, p.position) for p in self.floor.active_enemies
+        ]
+        markers.append(at(self.components.user, leader.position))
+        markers.extend(
+            at(self.components.ally, p.position)
             for p in self.floor.party
-            if p is not self.floor.party.leader
+            if p is not leader
         )
-
-        return surface
+        return markers
+
+    def render(self) -> pygame.Surface:
+        view = self.get_view()
+        if view != self.base_view:
+            self.compose_base(view)
+            self.surface.fill(constants.TRANSPARENT)
+            self.surface.blit(self.base, (0, 0))
+            self.damaged.clear()
+            self.markers.clear()
+
+        markers = self.get_markers(view)
+        if markers == self.markers and not self.damaged:
+            return self.surface
+
+        bounds = self.surface.get_rect()
+        for rect in self.damaged + [rect for _, rect in self.markers]:
+            rect = rect.clip(bounds)
+            self.surface.fill(constants.TRANSPARENT, rect)
+            self.surface.blit(self.base, rect, rect)
+        self.surface.blits(markers)
+        self.damaged.clear()
+        self.markers = markers
+        return self.surface
 
     def _scale(self, pos: tuple[int, int]) -> pygame.Vector2:
         return pygame.Vector2(pos) * self.components.SIZE
 
     def get_component(self, pos: tuple[int, int]) -> pygame.Surface:
-        if pos not in self.visible_tiles and self.floor.is_tertiary(pos):
+        if not self.visible[pos] and self.floor.is_tertiary(pos):
             return self.components.get_ground(
                 self.floor.get_cardinal_tile_mask(pos), Visibility.PART
             )
@@ -89,34 +195,48 @@ class Minimap:
             )
 
     def set_visible_room(self, room: int):
+        """
+        Reveals the room and the tiles around it.
+        """
         self.visible_rooms.add(room)
-        for p in (
-            (x, y)
-            for x in range(self.floor.WIDTH)
-            for y in range(self.floor.HEIGHT)
-            if self.floor[x, y].room_index == room
-        ):
-            self.set_visible_surrounding(p)
+        (x, y), (w, h) = self.floor.rooms[room].topleft, self.floor.rooms[room].size
+        self.set_visible_rect((x - 1, y - 1), (w + 2, h + 2))
 
     def set_visible_at(self, position: tuple[int, int]):
-        if (
-            not 0 <= position[0] < self.floor.WIDTH
-            or not 0 <= position[1] < self.floor.HEIGHT
-        ):
-            return
-        if position in self.visible_tiles:
-            return
-        self.visible_tiles.add(position)
-        self.upper_surface.blit(self.get_component(position), self._scale(position))
-        offset_x, offset_y = (c * self.components.SIZE for c in position)
-        for x in range(self.components.SIZE):
-            for y in range(self.components.SIZE):
-                self.lower_surface.set_at(
-                    (x + offset_x, y + offset_y), constants.TRANSPARENT
-                )
+        self.set_visible_rect(position, (1, 1))
 
     def set_visible_surrounding(self, position: tuple[int, int], radius=1):
         x, y = position
-        for i in range(-radius, radius + 1):
-            for j in range(-radius, radius + 1):
-                self.set_visible_at((x + i, y + j))
+        self.set_visible_rect(
+            (x - radius, y - radius), (2 * radius + 1, 2 * radius + 1)
+        )
+
+    def set_visible_rect(self, topleft: tuple[int, int], size: tuple[int, int]):
+        """
+        Reveals the tiles of a rectangle, clipped to the floor. Only the tiles
+        not revealed before are drawn again.
+        """
+        x0, y0 = max(0, topleft[0]), max(0, topleft[1])
+        x1 = max(x0, min(self.floor.WIDTH, topleft[0] + size[0]))
+        y1 = max(y0, min(self.floor.HEIGHT, topleft[1] + size[1]))
+        area = self.visible[x0:x1, y0:y1]
+        hidden = np.argwhere(~area).tolist()
+        area[:] = True
+        for dx, dy in hidden:
+            self._reveal((x0 + dx, y0 + dy))
+
+    def _reveal(self, position: tuple[int, int]):
+        # Chunks not drawn yet pick up the tile when they are first drawn.
+        chunk = chunk_of(position)
+        if chunk in self.chunks:
+            self._draw_tile(
+                self.chunks[chunk], self._scale(chunk_topleft(chunk)), position
+            )
+        if self.base_view is not None and self.base_view.collidepoint(
+            self._scale(position)
+        ):
+            self.damaged.append(
+                self._draw_tile(
+                    self.base, pygame.Vector2(self.base_view.topleft), position
+                )
+            )
@@ -31,18 +31,18 @@ class MovementSystem:
 
     def add(self, p: Pokemon):
         self.to_move.append(p)
-        self.dungeon.floor[p.position].pokemon_ptr = None
+        self.dungeon.floor.occupancy.remove(p)
         p.move()
-        self.dungeon.floor[p.position].pokemon_ptr = p
+        self.dungeon.floor.occupancy.add(p)
 
     def add_all(self, ps: list[Pokemon]):
         for p in ps:
             self.to_move.append(p)
-            self.dungeon.floor[p.position].pokemon_ptr = None
+            self.dungeon.floor.occupancy.remove(p)
         for p in ps:
             p.move()
         for p in ps:
-            self.dungeon.floor[p.position].pokemon_ptr = p
+            self.dungeon.floor.occupancy.add(p)
 
     def start(self):
         for p in self.to_move:
@@ -171,8 +171,7 @@ class MovementSystem:
 
         # 3. Continue to room exit if not yet reached
         if p.position != p.target and floor.is_room(p.position):
-            room_number = floor[p.position].room_index
-            if p.target in floor.room_exits[room_number]:
+            if p.target in floor.get_room(p.position).exits:
                 return
 
         # 4. Target corridor
@@ -195,8 +194,8 @@ class MovementSystem:
 
         # 5. Target other room exit
         if floor.is_room(p.position):
-            room_number = floor[p.position].room_index
-            room_exits = [r for r in floor.room_exits[room_number] if r != p.position]
+            room = floor.get_room(p.position)
+            room_exits = [r for r in room.exits if r != p.position]
             if room_exits:
                 p.target = random.choice([r for r in room_exits if r != p.position])
                 return
@@ -0,0 +1,104 @@
+from __future__ import annotations
+from collections import defaultdict
+from typing import Iterable
+
+from app.common import utils
+from app.dungeon.spawn_locations import SpawnLocations
+from app.dungeon.tile import TileArrays
+from app.pokemon.pokemon import Pokemon
+
+
+class Occupancy:
+    """
+    An index of the Pokemon on a floor by position, room and faction. The
+    position index is the pokemon dict of the tiles, so Tile.pokemon_ptr reads
+    from it directly. Queries return Pokemon in the order they were spawned,
+    as floor.spawned does. The free spawn locations are updated as Pokemon
+    are added and removed.
+    """
+
+    def __init__(self, tiles: TileArrays, spawn_locations: SpawnLocations):
+        self.tiles = tiles
+        self.spawn_locations = spawn_locations
+        self.rooms: defaultdict[int, set[Pokemon]] = defaultdict(set)
+        self.factions: dict[bool, set[Pokemon]] = {False: set(), True: set()}
+        self._room_of: dict[Pokemon, int] = {}
+        self._order: dict[Pokemon, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._room_of)
+
+    def __contains__(self, p: Pokemon) -> bool:
+        return p in self._room_of
+
+    def clear(self):
+        self.tiles.pokemon.clear()
+        self.rooms.clear()
+        for faction in self.factions.values():
+            faction.clear()
+        self._room_of.clear()
+        self._order.clear()
+
+    def add(self, p: Pokemon):
+        """
+        Places a Pokemon at its current position.
+        """
+        room = int(self.tiles.room_index[p.position])
+        self.tiles.pokemon[p.position] = p
+        self.rooms[room].add(p)
+        self.factions[p.is_enemy].add(p)
+        self._room_of[p] = room
+        self._order.setdefault(p, len(self._order))
+        self.spawn_locations.discard(p.position)
+
+    def remove(self, p: Pokemon):
+        """
+        Removes a Pokemon from its current position. Must be called before the
+        position of the Pokemon changes.
+        """
+        if self.tiles.pokemon.get(p.position) is p:
+            del self.tiles.pokemon[p.position]
+            if self.tiles.can_spawn[p.position]:
+                self.spawn_locations.add(p.position)
+        room = self._room_of.pop(p, None)
+        if room is not None:
+            self.rooms[room].discard(p)
+        self.factions[p.is_enemy].discard(p)
+
+    def at(self, position: tuple[int, int]) -> Pokemon:
+        return self.tiles.pokemon.get(position)
+
+    def get_faction(self, is_enemy: bool) -> list[Pokemon]:
+        return self.sorted(self.factions[is_enemy])
+
+    def in_room(self, room: int) -> list[Pokemon]:
+        """
+        :param room: The room index, where 0 is every tile outside a room.
+        :return: The Pokemon on tiles of the room.
+        """
+        return self.sorted(self.rooms.get(room, ()))
+
+    def within(self, position: tuple[int, int], radius: int) -> list[Pokemon]:
+        """
+        :return: The Pokemon at most radius tiles away in the infinity norm,
+                 including any at the position itself.
+        """
+        if (2 * radius + 1) ** 2 < len(self):
+            x, y = position
+            found = (
+                self.tiles.pokemon.get((x + i, y + j))
+                for i in range(-radius, radius + 1)
+                for j in range(-radius, radius + 1)
+            )
+            return self.sorted(p for p in found if p is not None)
+        return self.sorted(
+            p
+            for p in self._room_of
+            if utils.dist_inf_norm(p.position, position) <= radius
+        )
+
+    def sorted(self, ps: Iterable[Pokemon]) -> list[Pokemon]:
+        """
+        :return: The Pokemon in the order they were spawned.
+        """
+        return sorted(ps, key=self._order.__getitem__)
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Room:
+    """
+    A room of a floor. Rooms are numbered from 1, matching the room_index of
+    their tiles, and are always rectangular.
+    """
+
+    index: int
+    topleft: tuple[int, int]
+    size: tuple[int, int]
+    tiles: list[tuple[int, int]]
+    exits: list[tuple[int, int]] = field(default_factory=list)
+    is_shop: bool = False
+    # Rooms that were merged into this one during generation.
+    merged: list[int] = field(default_factory=list)
+
+    def contains(self, position: tuple[int, int]) -> bool:
+        x, y = position
+        x0, y0 = self.topleft
+        w, h = self.size
+        return x0 <= x < x0 + w and y0 <= y < y0 + h
@@ -0,0 +1,48 @@
+import random
+from typing import Iterable
+
+
+class SpawnLocations:
+    """
+    The set of tiles a Pokemon can currently be spawned on. Positions are kept
+    in a list with an index into it, so adding, removing and sampling a
+    position are all O(1).
+    """
+
+    def __init__(self, positions: Iterable[tuple[int, int]] = ()):
+        self._positions: list[tuple[int, int]] = []
+        self._index: dict[tuple[int, int], int] = {}
+        self.reset(positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, position: tuple[int, int]) -> bool:
+        return position in self._index
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def reset(self, positions: Iterable[tuple[int, int]]):
+        self._positions = list(positions)
+        self._index = {p: i for i, p in enumerate(self._positions)}
+
+    def add(self, position: tuple[int, int]):
+        if position not in self._index:
+            self._index[position] = len(self._positions)
+            self._positions.append(position)
+
+    def discard(self, position: tuple[int, int]):
+        """
+        Removes a position by swapping it with the last one.
+        """
+        i = self._index.pop(position, None)
+        if i is None:
+            return
+        last = self._positions.pop()
+        if last != position:
+            self._positions[i] = last
+            self._index[last] = i
+
+    def sample(self, generator: random.Random) -> tuple[int, int]:
+        return self._positions[generator.randrange(len(self._positions))]
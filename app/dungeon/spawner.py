@@ -1,7 +1,7 @@
 import random
 
 from app.common.constants import RNG
-from app.dungeon.floor import Floor
+from app.dungeon.floor import Floor, positions
 from app.dungeon.floor_data import FloorData
 from app.dungeon.tile_type import TileType
 from app.item.item import Item
@@ -30,12 +30,7 @@ class Spawner:
         return self.floor.get_valid_spawn_locations()
 
     def get_valid_buried_spawn_locations(self):
-        valid_buried_spawns = []
-        for x in range(self.floor.WIDTH):
-            for y in range(self.floor.HEIGHT):
-                if self.floor[x, y].tile_type is TileType.PRIMARY:
-                    valid_buried_spawns.append((x, y))
-        return valid_buried_spawns
+        return positions(self.floor.tiles.tile_type == TileType.PRIMARY.value)
 
     def spawn_stairs(self, position):
         self.floor.stairs_spawn = position
@@ -47,6 +42,21 @@ class Spawner:
         self.floor[position].trap = trap
 
     def fill_floor_with_spawns(self):
+        for position, item_id in self.fill_floor_with_static_spawns().items():
+            self.spawn_item(position, item_db.load(item_id))
+        # Characters
+        self.spawn_party()
+        self.spawn_enemies()
+
+    def fill_floor_with_static_spawns(self) -> dict[tuple[int, int], int]:
+        """
+        Spawns the stairs and traps, and picks the item spawns, i.e. everything
+        that is part of the floor layout. Items are returned by id rather than
+        spawned, as loading an item surface needs the display.
+
+        :return: The item id to spawn at each position.
+        """
+        item_spawns = {}
         valid_spawns = self.get_valid_spawn_locations()
         self.generator.shuffle(valid_spawns)
         # Stairs
@@ -60,30 +70,27 @@ class Spawner:
         # Items
         num_items = self.get_number_of_items(self.data.item_density)
         for _ in range(num_items):
-            self.spawn_item(valid_spawns[-1], self.get_random_item())
+            item_spawns[valid_spawns[-1]] = self.get_random_item_id()
             valid_spawns.pop()
         # Buried Items
         valid_spawns = self.get_valid_buried_spawn_locations()
         self.generator.shuffle(valid_spawns)
         num_items = self.get_number_of_items(self.data.buried_item_density)
         for _ in range(num_items):
-            self.spawn_item(valid_spawns[-1], self.get_random_item())
+            item_spawns[valid_spawns[-1]] = self.get_random_item_id()
             valid_spawns.pop()
         # TODO: Shop
-        # Characters
-        self.spawn_party()
-        self.spawn_enemies()
+        return item_spawns
 
     def spawn_pokemon(self, p: Pokemon, position: tuple[int, int]):
-        self.floor[position].pokemon_ptr = p
         p.spawn(position)
+        self.floor.occupancy.add(p)
         self.floor.spawned.append(p)
 
     def spawn_party(self):
-        valid_spawns = self.get_valid_spawn_locations()
-        self.generator.shuffle(valid_spawns)
-        self.spawn_pokemon(self.party.leader, valid_spawns[-1])
-        valid_spawns.pop()
+        self.spawn_pokemon(
+            self.party.leader, self.floor.spawn_locations.sample(self.generator)
+        )
 
         leader_x, leader_y = self.party.leader.position
 
@@ -93,7 +100,7 @@ class Spawner:
             # TODO Improve party spawn algorithm
             for d in Direction:
                 position = (d.x + leader_x, d.y + leader_y)
-                if self.floor.is_valid_spawn_location(position):
+                if position in self.floor.spawn_locations:
                     self.spawn_pokemon(member, position)
                     break
 
@@ -103,13 +110,10 @@ class Spawner:
         if amount == -1:
             amount = self.data.initial_enemy_density
 
-        valid_spawns = self.get_valid_spawn_locations()
-        self.generator.shuffle(valid_spawns)
-
-        for _ in range(amount):
-            enemy = enemy_pokemon_factory(*self.data.get_random_pokemon())
-            self.spawn_pokemon(enemy, valid_spawns[-1])
-            valid_spawns.pop()
+        spawn_locations = self.floor.spawn_locations
+        for _ in range(min(amount, len(spawn_locations))):
+            enemy = enemy_pokemon_factory(*self.data.get_random_pokemon(self.generator))
+            self.spawn_pokemon(enemy, spawn_locations.sample(self.generator))
             self.floor.active_enemies.append(enemy)
 
     def get_number_of_items(self, density) -> int:
@@ -121,8 +125,11 @@ class Spawner:
         n = self.data.trap_density
         return self.generator.randint(n // 2, n)
 
+    def get_random_item_id(self) -> int:
+        return 183
+
     def get_random_item(self) -> Item:
-        return item_db.load(183)
+        return item_db.load(self.get_random_item_id())
 
     def get_random_trap(self):
-        return self.data.get_random_trap()
+        return self.data.get_random_trap(self.generator)
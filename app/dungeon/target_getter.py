@@ -1,4 +1,3 @@
-from app.common import utils
 from app.dungeon.dungeon import Dungeon
 from app.move.move import MoveRange
 from app.pokemon.movement_type import MovementType
@@ -46,18 +45,26 @@ def get_surrounding_pokemon(
 ) -> list[Pokemon]:
     return [
         p
-        for p in dungeon.floor.spawned
-        if 0 < utils.dist_inf_norm(p.position, attacker.position) <= radius
+        for p in dungeon.floor.occupancy.within(attacker.position, radius)
+        if p.position != attacker.position
     ]
 
 
 def get_room_pokemon(attacker: Pokemon, dungeon: Dungeon) -> list[Pokemon]:
-    return [
-        p
-        for p in dungeon.floor.spawned
-        if dungeon.floor.in_same_room(attacker.position, p.position)
-        or utils.dist_inf_norm(p.position, attacker.position) <= 2
-    ]
+    occupancy = dungeon.floor.occupancy
+    nearby = occupancy.within(attacker.position, 2)
+    if not dungeon.floor.is_room(attacker.position):
+        return nearby
+    room = occupancy.rooms.get(dungeon.floor.get_room_index(attacker.position), ())
+    return occupancy.sorted(set(room).union(nearby))
+
+
+def is_enemy(attacker: Pokemon, p: Pokemon) -> bool:
+    return p.is_enemy != attacker.is_enemy
+
+
+def is_ally(attacker: Pokemon, p: Pokemon) -> bool:
+    return p.is_enemy == attacker.is_enemy
 
 
 def get_none(attacker: Pokemon, dungeon: Dungeon):
@@ -69,7 +76,7 @@ def get_all_enemies_in_the_room(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_room_pokemon(attacker, dungeon)
-        if p in get_enemies(attacker, dungeon)
+        if is_enemy(attacker, p)
     ]
 
 
@@ -93,7 +100,7 @@ def get_all_team_members_in_the_room(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_room_pokemon(attacker, dungeon)
-        if p in get_allies(attacker, dungeon)
+        if is_ally(attacker, p)
     ]
 
 
@@ -101,7 +108,7 @@ def get_enemies_within_1_tile_range(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_surrounding_pokemon(attacker, dungeon)
-        if p in get_enemies(attacker, dungeon)
+        if is_enemy(attacker, p)
     ]
 
 
@@ -109,7 +116,7 @@ def get_enemy_in_front(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_straight_pokemon(attacker, dungeon, 1, False)
-        if p in get_enemies(attacker, dungeon)
+        if is_enemy(attacker, p)
     ]
 
 
@@ -117,7 +124,7 @@ def get_enemy_in_front_cuts_corners(attacker, dungeon: Dungeon):
     return [
         p
         for p in get_straight_pokemon(attacker, dungeon, 1, True)
-        if p in get_enemies(attacker, dungeon)
+        if is_enemy(attacker, p)
     ]
 
 
@@ -125,7 +132,7 @@ def get_enemy_up_to_2_tiles_away(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_straight_pokemon(attacker, dungeon, 2, True)
-        if p in get_enemies(attacker, dungeon)
+        if is_enemy(attacker, p)
     ]
 
 
@@ -146,7 +153,7 @@ def get_line_of_sight(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_straight_pokemon(attacker, dungeon, 10, True)
-        if p in get_enemies(attacker, dungeon)
+        if is_enemy(attacker, p)
     ]
 
 
@@ -154,7 +161,7 @@ def get_only_the_allies_in_the_room(attacker: Pokemon, dungeon: Dungeon):
     return [
         p
         for p in get_room_pokemon(attacker, dungeon)
-        if p is not attacker and p in get_allies(attacker, dungeon)
+        if p is not attacker and is_ally(attacker, p)
     ]
 
 
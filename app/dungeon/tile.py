@@ -1,5 +1,6 @@
 from __future__ import annotations
-from dataclasses import dataclass
+
+import numpy as np
 
 from app.dungeon.tile_type import TileType
 from app.dungeon.trap import Trap
@@ -18,20 +19,163 @@ def value(mask: tuple[bool]):
 BORDER_VALUE = value((True for _ in range(8)))
 CARDINAL_BORDER_VALUE = value((True for _ in range(4)))
 
+# TileType values are 0, 1, 2 so a tuple doubles as a value -> TileType lookup.
+TILE_TYPES = tuple(TileType)
+
+
+class TileArrays:
+    """
+    Structure-of-arrays storage for a rectangular grid of tiles. Every array
+    has shape (width, height) and is indexed by [x, y], so whole-grid queries
+    can be done in a single vectorised NumPy call. The sparse object
+    references (traps, pokemon and items) are kept in dictionaries keyed by
+    position.
+    """
+
+    def __init__(self, width: int, height: int):
+        size = (width, height)
+        self.tile_type = np.empty(size, dtype=np.uint8)
+        self.room_index = np.empty(size, dtype=np.int16)
+        self.is_impassable = np.empty(size, dtype=bool)
+        self.stairs_index = np.empty(size, dtype=np.uint8)
+        self.can_spawn = np.empty(size, dtype=bool)
+        self.is_shop = np.empty(size, dtype=bool)
+        self.tile_mask = np.empty(size, dtype=np.uint8)
+        self.cardinal_tile_mask = np.empty(size, dtype=np.uint8)
+
+        self.traps: dict[tuple[int, int], Trap] = {}
+        self.pokemon: dict[tuple[int, int], Pokemon] = {}
+        self.items: dict[tuple[int, int], Item] = {}
+
+        # Positions whose drawn contents changed since they were last drawn:
+        # traps and items placed or removed, and tiles whose terrain changed.
+        self.dirty: set[tuple[int, int]] = set()
+
+        self.reset()
+
+    def reset(self):
+        self.tile_type.fill(TileType.PRIMARY.value)
+        self.room_index.fill(0)
+        self.is_impassable.fill(False)
+        self.stairs_index.fill(0)
+        self.can_spawn.fill(False)
+        self.is_shop.fill(False)
+        self.tile_mask.fill(BORDER_VALUE)
+        self.cardinal_tile_mask.fill(CARDINAL_BORDER_VALUE)
+        self.traps.clear()
+        self.pokemon.clear()
+        self.items.clear()
+        self.dirty.clear()
+
 
-@dataclass
 class Tile:
-    tile_type: TileType = TileType.PRIMARY
-    room_index: int = 0
-    is_impassable: bool = False
-    trap: Trap = None
-    stairs_index: int = 0
-    can_spawn: bool = False
-    is_shop: bool = False
-    pokemon_ptr: Pokemon = None
-    item_ptr: Item = None
-    tile_mask: tuple[bool] = BORDER_VALUE
-    cardinal_tile_mask: tuple[bool] = CARDINAL_BORDER_VALUE
+    """
+    A thin view of a single tile stored in a TileArrays. Reading or writing an
+    attribute reads or writes the underlying arrays.
+    """
+
+    __slots__ = ("_tiles", "_xy")
+
+    def __init__(self, tiles: TileArrays, x: int, y: int):
+        self._tiles = tiles
+        self._xy = (x, y)
+
+    @staticmethod
+    def border() -> Tile:
+        """
+        :return: The impassable tile used for positions out of bounds.
+        """
+        return BORDER
+
+    @property
+    def tile_type(self) -> TileType:
+        return TILE_TYPES[self._tiles.tile_type[self._xy]]
+
+    @tile_type.setter
+    def tile_type(self, tile_type: TileType):
+        self._tiles.tile_type[self._xy] = tile_type.value
+
+    @property
+    def room_index(self) -> int:
+        return int(self._tiles.room_index[self._xy])
+
+    @room_index.setter
+    def room_index(self, room_index: int):
+        self._tiles.room_index[self._xy] = room_index
+
+    @property
+    def is_impassable(self) -> bool:
+        return bool(self._tiles.is_impassable[self._xy])
+
+    @is_impassable.setter
+    def is_impassable(self, is_impassable: bool):
+        self._tiles.is_impassable[self._xy] = is_impassable
+
+    @property
+    def stairs_index(self) -> int:
+        return int(self._tiles.stairs_index[self._xy])
+
+    @stairs_index.setter
+    def stairs_index(self, stairs_index: int):
+        self._tiles.stairs_index[self._xy] = stairs_index
+
+    @property
+    def can_spawn(self) -> bool:
+        return bool(self._tiles.can_spawn[self._xy])
+
+    @can_spawn.setter
+    def can_spawn(self, can_spawn: bool):
+        self._tiles.can_spawn[self._xy] = can_spawn
+
+    @property
+    def is_shop(self) -> bool:
+        return bool(self._tiles.is_shop[self._xy])
+
+    @is_shop.setter
+    def is_shop(self, is_shop: bool):
+        self._tiles.is_shop[self._xy] = is_shop
+
+    @property
+    def tile_mask(self) -> int:
+        return int(self._tiles.tile_mask[self._xy])
+
+    @tile_mask.setter
+    def tile_mask(self, mask: int):
+        self._tiles.tile_mask[self._xy] = mask
+
+    @property
+    def cardinal_tile_mask(self) -> int:
+        return int(self._tiles.cardinal_tile_mask[self._xy])
+
+    @cardinal_tile_mask.setter
+    def cardinal_tile_mask(self, mask: int):
+        self._tiles.cardinal_tile_mask[self._xy] = mask
+
+    @property
+    def trap(self) -> Trap:
+        return self._tiles.traps.get(self._xy)
+
+    @trap.setter
+    def trap(self, trap: Trap):
+        _set_or_remove(self._tiles.traps, self._xy, trap)
+        self._tiles.dirty.add(self._xy)
+
+    @property
+    def pokemon_ptr(self) -> Pokemon:
+        return self._tiles.pokemon.get(self._xy)
+
+    @pokemon_ptr.setter
+    def pokemon_ptr(self, pokemon: Pokemon):
+        _set_or_remove(self._tiles.pokemon, self._xy, pokemon)
+
+    @property
+    def item_ptr(self) -> Item:
+        return self._tiles.items.get(self._xy)
+
+    @item_ptr.setter
+    def item_ptr(self, item: Item):
+        _set_or_remove(self._tiles.items, self._xy, item)
+        self._tiles.dirty.add(self._xy)
 
     def reset(self):
         self.tile_type = TileType.PRIMARY
@@ -64,3 +208,41 @@ class Tile:
         self.tile_type = TileType.TERTIARY
         self.room_index = room_number
         self.is_shop = True
+
+
+class BorderTile(Tile):
+    """
+    An impassable primary tile with nothing on it, shared by every position
+    out of bounds. It cannot be changed: writing an attribute does nothing.
+    """
+
+    __slots__ = ()
+
+    tile_type = TileType.PRIMARY
+    room_index = 0
+    is_impassable = True
+    stairs_index = 0
+    can_spawn = False
+    is_shop = False
+    tile_mask = BORDER_VALUE
+    cardinal_tile_mask = CARDINAL_BORDER_VALUE
+    trap = None
+    pokemon_ptr = None
+    item_ptr = None
+
+    def __init__(self):
+        pass
+
+    def __setattr__(self, name: str, value):
+        if not isinstance(getattr(Tile, name, None), property):
+            raise AttributeError(f"'BorderTile' object has no attribute '{name}'")
+
+
+BORDER = BorderTile()
+
+
+def _set_or_remove(d: dict, key, value):
+    if value is None:
+        d.pop(key, None)
+    else:
+        d[key] = value
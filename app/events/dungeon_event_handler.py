@@ -157,7 +157,7 @@ class DungeonEventHandler:
             events.append(game_event.LogEvent(dungeon_log_text.defeated(defender)))
             events.append(event.SleepEvent(20))
 
-        self.dungeon.floor[ev.target.position].pokemon_ptr = None
+        self.dungeon.floor.occupancy.remove(ev.target)
         if ev.target.is_enemy:
             self.dungeon.floor.active_enemies.remove(ev.target)
             events.extend(
@@ -363,9 +363,9 @@ class DungeonEventHandler:
             ev.destination = pos
 
         else:
-            floor[ev.pokemon.position].pokemon_ptr = None
+            floor.occupancy.remove(ev.pokemon)
             ev.pokemon.position = ev.destination
-            floor[ev.pokemon.position].pokemon_ptr = ev.pokemon
+            floor.occupancy.add(ev.pokemon)
             events.append(
                 game_event.SetAnimationEvent(ev.pokemon, AnimationId.IDLE, True)
             )
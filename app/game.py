@@ -6,16 +6,19 @@ from app.common.action import Action
 from app.common.inputstream import InputStream
 from app.db import database
 import app.db.font as font_db
+from app.gui.output import Output, OutputMode
+from app.gui.render_target import RenderTarget
 from app.gui.text import TextBuilder
 
 
 class Game:
     CAPTION = "Pokémon Mystery Dungeon"
 
-    def __init__(self, mode="continue", scale=4):
-        self.SCALED_SIZE = pygame.Vector2(constants.DISPLAY_SIZE) * scale
+    def __init__(
+        self, mode="continue", scale=4, output_mode: OutputMode = OutputMode.SOFTWARE
+    ):
         pygame.init()
-        self.display = pygame.display.set_mode(self.SCALED_SIZE)
+        self.output = Output(scale, output_mode)
         font_db.init_fonts()
 
         pygame.display.set_caption(Game.CAPTION)
@@ -23,6 +26,7 @@ class Game:
 
         self.clock = pygame.time.Clock()
         self.input_stream = InputStream()
+        self.fps_target = RenderTarget((0, 0))
 
         if mode == "intro":
             from app.scenes.intro_scene import IntroScene
@@ -67,14 +71,16 @@ class Game:
         self.running = False
 
     def render(self):
-        surface = pygame.Surface(constants.DISPLAY_SIZE)
+        surface = self.output.get_surface()
         surface.fill(constants.BLACK)
         scene_surf = self.scene.render()
         scene_surf.set_alpha(self.scene.alpha)
         surface.blit(scene_surf, (0, 0))
         surface.blit(self.render_fps(), (240, 8))
-        self.display.blit(pygame.transform.scale(surface, self.SCALED_SIZE), (0, 0))
-        pygame.display.flip()
+        self.output.present()
 
     def render_fps(self) -> pygame.Surface:
-        return TextBuilder.build_white(str(round(self.clock.get_fps()))).render()
+        fps = round(self.clock.get_fps())
+        if self.fps_target.is_stale(fps):
+            self.fps_target.surface = TextBuilder.build_white(str(fps)).render()
+        return self.fps_target.surface
@@ -28,8 +28,8 @@ class MapBackground:
         for anim in set(self.bg_sprites):
             anim.update()
         if self.palette_num is not None:
-            self.palette_animation.update()
-            self.palette_animation.set_palette(self.lower_bg, self.palette_num)
+            changed = self.palette_animation.update()
+            self.palette_animation.set_palette(self.lower_bg, self.palette_num, changed)
 
     def render(self) -> pygame.Surface:
         surface = pygame.Surface(self.lower_bg.get_size(), pygame.SRCALPHA)
@@ -1,5 +1,7 @@
 import pygame
 
+from app.common import constants
+
 
 class Font:
     CHARS_PER_ROW = 16
@@ -19,6 +21,8 @@ class Font:
         self.editable_palette = None
         self.colorkey = None
 
+        self.glyphs: dict[tuple[int, tuple[int, ...], bool], pygame.Surface] = {}
+
     @property
     def is_colorable(self) -> bool:
         return self.editable_palette is not None
@@ -39,18 +43,63 @@ class Font:
         self.font_sheet.set_colorkey(self.colorkey)
 
     def __getitem__(self, char: str) -> pygame.Surface:
-        char_id = self.char_map[char] if char in self.char_map else ord(char)
+        return self.get_char_surface(self.get_char_id(char))
+
+    def get_char_id(self, char: str) -> int:
+        return self.char_map[char] if char in self.char_map else ord(char)
+
+    def get_char_surface(self, char_id: int) -> pygame.Surface:
         x = (char_id % self.CHARS_PER_ROW) * self.size
         y = (char_id // self.CHARS_PER_ROW) * self.size
         w, h = self.get_width(char_id), self.size
         return self.font_sheet.subsurface((x, y, w, h))
 
+    def get_glyph(
+        self, char: str, color: pygame.Color, shadow: bool = False
+    ) -> pygame.Surface:
+        """
+        Glyphs are drawn the first time they are asked for and kept, so the
+        palette of the font sheet is never changed to draw them.
+
+        :param color: The colour of the char. Ignored unless the font is
+                      colorable.
+        :param shadow: Whether to draw a black shadow below and to the right.
+                       Ignored unless the font is colorable.
+        :return: The char drawn on a transparent surface.
+        """
+        if not self.is_colorable:
+            color, shadow = None, False
+        char_id = self.get_char_id(char)
+        key = char_id, None if color is None else tuple(color), shadow
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            glyph = self.glyphs[key] = self._draw_glyph(char_id, color, shadow)
+        return glyph
+
+    def _draw_glyph(
+        self, char_id: int, color: pygame.Color, shadow: bool
+    ) -> pygame.Surface:
+        # A subsurface has its own copy of the palette of the sheet.
+        char_surface = self.get_char_surface(char_id)
+        if color is not None and color == self.colorkey:
+            # Ink in the colorkey would be transparent, so it keeps the colour
+            # of the sheet.
+            color = self.font_sheet.get_palette_at(self.editable_palette)
+        surface = pygame.Surface(char_surface.get_size(), pygame.SRCALPHA)
+        if shadow:
+            char_surface.set_palette_at(self.editable_palette, constants.BLACK)
+            surface.blit(char_surface, (1, 0))
+            surface.blit(char_surface, (0, 1))
+        if color is not None:
+            char_surface.set_palette_at(self.editable_palette, color)
+        surface.blit(char_surface, (0, 0))
+        return surface
+
     def get_width(self, char_id: int) -> int:
         return self.widths.get(char_id, 0)
 
     def get_width_by_char(self, char: str) -> int:
-        char_id = self.char_map[char] if char in self.char_map else ord(char)
-        return self.get_width(char_id)
+        return self.get_width(self.get_char_id(char))
 
     def set_colorable(self, editable_palette: int, colorkey: pygame.Color):
         self.editable_palette = editable_palette
@@ -73,6 +122,14 @@ class GraphicFont:
     def get_width(self, char_id: int) -> int:
         return self[char_id].get_width()
 
+    def get_glyph(
+        self, char_id: int, color: pygame.Color = None, shadow: bool = False
+    ) -> pygame.Surface:
+        """
+        Graphics keep their own colours and have no shadow.
+        """
+        return self[char_id]
+
     def set_colorkey(self):
         for surf in self.sheet.values():
             surf.set_colorkey(self.colorkey)
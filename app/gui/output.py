@@ -0,0 +1,86 @@
+from collections import deque
+from enum import Enum
+import time
+
+import pygame
+
+from app.common import constants
+from app.gui.render_target import allocate
+
+
+class OutputMode(Enum):
+    """
+    SOFTWARE scales each frame to the window with pygame.transform.
+    SCALED lets the display scale the frame, with the pygame.SCALED flag.
+    """
+
+    SOFTWARE = "software"
+    SCALED = "scaled"
+
+
+class Output:
+    """
+    The last stage of a frame, which takes the frame at DISPLAY_SIZE to the
+    window.
+
+    In SOFTWARE mode the frame is drawn to a surface kept between frames and
+    scaled straight into the window surface, so nothing is allocated. At a
+    scale of 1 the frame is drawn to the window surface itself and not scaled
+    at all.
+
+    In SCALED mode the frame is drawn straight to the display surface, which
+    the display scales to the window.
+
+    The time taken by present is kept over the last frames, to compare modes.
+    """
+
+    SAMPLES = 60
+
+    def __init__(self, scale: float, mode: OutputMode = OutputMode.SOFTWARE):
+        self.mode = mode
+        self.times: deque[float] = deque(maxlen=self.SAMPLES)
+
+        if self.mode is OutputMode.SCALED:
+            self.display = pygame.display.set_mode(
+                constants.DISPLAY_SIZE, pygame.SCALED
+            )
+            self.frame = self.display
+            self.destination = None
+            return
+
+        window_size = pygame.Vector2(constants.DISPLAY_SIZE) * scale
+        self.display = pygame.display.set_mode(window_size)
+        if self.display.get_size() == constants.DISPLAY_SIZE:
+            self.frame = self.display
+            self.destination = None
+        else:
+            self.frame = allocate(constants.DISPLAY_SIZE)
+            self.destination = self.display
+
+    def get_surface(self) -> pygame.Surface:
+        """
+        :return: The surface to draw the frame to, the same every frame.
+        """
+        return self.frame
+
+    def present(self):
+        """
+        Shows the frame drawn to the surface in the window.
+        """
+        t0 = time.perf_counter()
+        if self.destination is not None:
+            pygame.transform.scale(
+                self.frame, self.destination.get_size(), self.destination
+            )
+        pygame.display.flip()
+        self.times.append(time.perf_counter() - t0)
+
+    @property
+    def cost(self) -> float:
+        """
+        :return: The mean time taken by present over the last frames, in
+                 seconds.
+        """
+        if not self.times:
+            return 0
+        return sum(self.times) / len(self.times)
@@ -0,0 +1,59 @@
+"""
+Surfaces drawn every frame are kept as render targets by the layer drawing
+them, and reused from one frame to the next rather than allocated each frame.
+A target also remembers the inputs it was last drawn from, so that a layer
+only redraws it when they change.
+
+Surfaces allocated for rendering go through `allocate`, which counts them in
+debug builds. A frame in steady state should allocate nothing, so a count
+rising with the frames points at a layer allocating every frame.
+"""
+
+from typing import Hashable
+
+import pygame
+
+
+allocations = 0
+
+
+def allocate(
+    size: tuple[int, int], flags: int = 0, depth: int = None
+) -> pygame.Surface:
+    """
+    :param depth: The bit depth, or None for the best depth for the display.
+    :return: A new surface, counted in debug builds.
+    """
+    global allocations
+    if __debug__:
+        allocations += 1
+    if depth is None:
+        return pygame.Surface(size, flags)
+    return pygame.Surface(size, flags, depth)
+
+
+class RenderTarget:
+    def __init__(self, size: tuple[int, int], flags: int = 0):
+        self.flags = flags
+        self.surface = allocate(size, flags)
+        self.key = None
+
+    def resize(self, size: tuple[int, int]) -> pygame.Surface:
+        """
+        :return: The surface, allocated again only if the size changed.
+        """
+        if self.surface.get_size() != tuple(size):
+            self.surface = allocate(size, self.flags)
+            self.key = None
+        return self.surface
+
+    def is_stale(self, key: Hashable) -> bool:
+        """
+        :param key: The inputs the surface is drawn from.
+        :return: Whether the inputs changed since the last call, in which case
+                 the surface should be drawn again.
+        """
+        if key == self.key:
+            return False
+        self.key = key
+        return True
@@ -13,6 +13,10 @@ class SpriteSheet:
     offset_positions: dict[tuple[int, int, int, int], list[list[tuple[int, int]]]]
     is_singular: bool = dataclasses.field(init=False)
     row_directions: list[Direction] = dataclasses.field(init=False)
+    # The sprite of each frame drawn, by direction and index.
+    sprites: dict[tuple[Direction, int], pygame.Surface] = dataclasses.field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
 
     def __post_init__(self):
         self.is_singular = self.sheet.get_height() == self.sprite_size[1]
@@ -38,10 +42,16 @@ class SpriteSheet:
         return x, y
 
     def get_sprite(self, d: Direction, index: int) -> pygame.Surface:
+        """
+        :return: The sprite of the frame, a subsurface of the sheet made the
+                 first time the frame is drawn and kept after.
+        """
         if self.is_singular:
             d = Direction.SOUTH
-        pos = self.get_position(d, index)
-        return self.sheet.subsurface(pos, self.sprite_size)
+        if (d, index) not in self.sprites:
+            pos = self.get_position(d, index)
+            self.sprites[d, index] = self.sheet.subsurface(pos, self.sprite_size)
+        return self.sprites[d, index]
 
     def get_shadow_position(self, d: Direction, index: int) -> tuple[int, int]:
         return self.shadow_positions[self.get_row(d)][index]
@@ -25,12 +25,18 @@ class Text:
         self.canvas = canvas
         self.chars = chars
         self.positions = positions
+        self.surface: pygame.Surface = None
 
     def render(self) -> pygame.Surface:
-        surface = self.canvas.copy()
-        for char, position in zip(self.chars, self.positions):
-            surface.blit(char, position)
-        return surface
+        """
+        :return: The text composed on its canvas. The surface is composed on
+                 the first call and shared by later calls, so it must not be
+                 drawn on.
+        """
+        if self.surface is None:
+            self.surface = self.canvas.copy()
+            self.surface.blits(zip(self.chars, self.positions), doreturn=False)
+        return self.surface
 
     def get_rect(self, **kwargs) -> pygame.Rect:
         return self.canvas.get_rect(**kwargs)
@@ -59,7 +65,6 @@ class TextBuilder:
 
     def set_color(self, color: pygame.Color) -> TextBuilder:
         self.color = color
-        self.font.color = color
         return self
 
     def set_alignment(self, align: Align) -> TextBuilder:
@@ -79,20 +84,14 @@ class TextBuilder:
         return self
 
     def write_char(self, char: str):
-        char_surface = self.font[char]
-        final_surface = pygame.Surface(char_surface.get_size(), pygame.SRCALPHA)
-        if self.shadow:
-            char_surface.set_palette_at(self.font.editable_palette, constants.BLACK)
-            final_surface.blit(char_surface, (1, 0))
-            final_surface.blit(char_surface, (0, 1))
-            char_surface.set_palette_at(self.font.editable_palette, self.color)
-        final_surface.blit(char_surface, (0, 0))
-        self.lines[-1].append(final_surface)
+        self.lines[-1].append(self.font.get_glyph(char, self.color, self.shadow))
 
     def get_canvas(self) -> pygame.Surface:
-        width = max(map(self.get_line_width, self.lines)) + db.get_pointer().get_width()
         height = len(self.lines) * (self.font.size + self.line_spacing)
-        return pygame.Surface((width, height), pygame.SRCALPHA)
+        return pygame.Surface((self.get_canvas_width(), height), pygame.SRCALPHA)
+
+    def get_canvas_width(self) -> int:
+        return max(map(self.get_line_width, self.lines)) + db.get_pointer().get_width()
 
     def get_line_width(self, line: list[pygame.Surface]) -> int:
         return sum(char.get_width() for char in line)
@@ -111,7 +110,7 @@ class TextBuilder:
     def get_line_start_position(self, line) -> int:
         if self.align is Align.LEFT:
             return 0
-        canvas_width = self.get_canvas().get_width()
+        canvas_width = self.get_canvas_width()
         line_width = self.get_line_width(line)
         if self.align is Align.CENTER:
             return (canvas_width - line_width) / 2
@@ -1,6 +1,8 @@
 import pygame
+from app.common import constants
 from app.gui import text
 from app.gui.frame import Frame
+from app.gui.render_target import RenderTarget, allocate
 
 
 class TextBox:
@@ -30,10 +32,27 @@ class TextBox:
 
 
 class DungeonTextBox:
+    """
+    Shows the latest messages, scrolling up a pixel a frame to make room for
+    new ones.
+
+    Messages are written into a content surface of fixed height, used as a
+    ring buffer: a message at height y of the content is drawn at
+    y % BUFFER_HEIGHT, wrapping round to the top. Writing a message therefore
+    costs the same however many were written before it.
+    """
+
     VISIBILITY_DURATION = 200
+    # Messages written faster than they scroll into view are dropped once they
+    # are this far behind.
+    BUFFER_HEIGHT = 512
 
     def __init__(self):
         self.frame = Frame((30, 7), 128)
+        self.render_target = RenderTarget(self.frame.get_size(), pygame.SRCALPHA)
+        width = self.frame.container_rect.w
+        self.content_surface = allocate((width, self.BUFFER_HEIGHT), pygame.SRCALPHA)
+        self.divider = text.divider(width)
         self.restart()
 
     @property
@@ -42,31 +61,40 @@ class DungeonTextBox:
 
     def restart(self):
         self.display_area = pygame.Rect((0, 0), self.frame.container_rect.size)
+        # Height of the content written since the restart.
         self.height = 0
-        self.content_surface = pygame.Surface(
-            (self.display_area.w, self.height), pygame.SRCALPHA
-        )
         self.t = 0
         self.visibility_timer = 0
 
     def write(self, message_surface: pygame.Surface):
         self.visibility_timer = self.VISIBILITY_DURATION
+        self.draw_content(message_surface, self.height, clear=True)
         self.height += message_surface.get_height()
         if self.height > self.display_area.h:
             self.t += message_surface.get_height()
-        new_content_surface = pygame.Surface(
-            (self.content_surface.get_width(), self.height), pygame.SRCALPHA
-        )
-        new_content_surface.blit(self.content_surface, (0, 0))
-        new_content_surface.blit(
-            message_surface, (0, self.content_surface.get_height())
-        )
-        self.content_surface = new_content_surface
+        behind = self.height - self.BUFFER_HEIGHT - self.display_area.y
+        if behind > 0:
+            self.display_area.y += behind
+            self.t = max(0, self.t - behind)
 
     def new_divider(self):
-        self.content_surface.blit(
-            text.divider(self.display_area.w), (0, self.height - 2)
-        )
+        self.draw_content(self.divider, self.height - 2)
+
+    def draw_content(self, surface: pygame.Surface, y: int, clear: bool = False):
+        """
+        :param y: The height of the content to draw the surface at.
+        :param clear: Whether to clear the rows drawn to first.
+        """
+        y %= self.BUFFER_HEIGHT
+        for top in (y, y - self.BUFFER_HEIGHT):
+            rect = pygame.Rect(
+                0, top, self.content_surface.get_width(), surface.get_height()
+            ).clip(self.content_surface.get_rect())
+            if not rect:
+                continue
+            if clear:
+                self.content_surface.fill(constants.TRANSPARENT, rect)
+            self.content_surface.blit(surface, (0, top))
 
     def update(self):
         if self.t != 0:
@@ -79,45 +107,99 @@ class DungeonTextBox:
 
     def render(self) -> pygame.Surface:
         if self.is_visible:
-            surface = self.frame.copy()
-            surface.blit(self.content_surface, (12, 10), area=self.display_area)
+            surface = self.render_target.surface
+            surface.fill(constants.TRANSPARENT)
+            surface.blit(self.frame, (0, 0))
+            self.render_content(surface, (12, 10))
             return surface
         else:
-            return pygame.Surface((0, 0))
+            return constants.EMPTY_SURFACE
+
+    def render_content(self, surface: pygame.Surface, position: tuple[int, int]):
+        """
+        Draws the content in the display area, in at most two parts when it
+        wraps round the content surface.
+        """
+        x, y = position
+        top = self.display_area.y % self.BUFFER_HEIGHT
+        h = min(self.display_area.h, self.height - self.display_area.y)
+        while h > 0:
+            area = pygame.Rect(0, top, self.display_area.w, h).clip(
+                self.content_surface.get_rect()
+            )
+            surface.blit(self.content_surface, (x, y), area)
+            top = 0
+            y += area.h
+            h -= area.h
 
 
 class MessageList:
+    """
+    Keeps the last CAPACITY lines written, each drawn once into a slot of a
+    scroll surface used as a ring buffer, so memory and drawing do not grow
+    with the length of a run.
+
+    The text of a line reaches into the top of the slot below it, so a slot
+    also holds the bottom of the line written before it.
+    """
+
     OFFSET_X = 4
     OFFSET_Y = 2
     LINE_H = 13
     LINE_W = 240
+    CAPACITY = 64
     BAR_SURFACE = text.divider(LINE_W - 2 * 8)
 
     def __init__(self):
-        self.lines: list[text.Text] = []
-        self.bar_indices: list[int] = []
+        self.surface = allocate(
+            (self.LINE_W, self.CAPACITY * self.LINE_H), pygame.SRCALPHA
+        )
+        self.surface.fill(constants.TRANSPARENT)
+        # Number of lines written so far.
+        self.count = 0
+        self.last_line: pygame.Surface = None
 
     @property
-    def content_rect(self):
-        return pygame.Rect(0, 0, self.LINE_W, len(self.lines) * self.LINE_H)
-
-    def write_line(self, text: text.Text):
-        self.lines.append(text)
+    def num_lines(self) -> int:
+        """
+        :return: The number of lines kept.
+        """
+        return min(self.count, self.CAPACITY)
+
+    def write_line(self, text: text.Text, bar: bool = False):
+        slot = self.surface.subsurface(self.get_slot_rect(self.count))
+        slot.fill(constants.TRANSPARENT)
+        line = text.render()
+        if self.last_line is not None:
+            slot.blit(self.last_line, (self.OFFSET_X, self.OFFSET_Y - self.LINE_H))
+        slot.blit(line, (self.OFFSET_X, self.OFFSET_Y))
+        if bar:
+            slot.blit(self.BAR_SURFACE, (0, 0))
+        self.last_line = line
+        self.count += 1
 
     def write_bar_line(self, text: text.Text):
-        self.bar_indices.append(len(self.lines))
-        self.write_line(text)
-
-    def render(self) -> pygame.Surface:
-        surface = pygame.Surface(self.content_rect.size, pygame.SRCALPHA)
-        surface.blits(
-            (line.render(), (self.OFFSET_X, self.OFFSET_Y + i * self.LINE_H))
-            for i, line in enumerate(self.lines)
-        )
-        surface.blits(
-            (self.BAR_SURFACE, (0, i * self.LINE_H)) for i in self.bar_indices
-        )
-        return surface
+        self.write_line(text, bar=True)
+
+    def get_slot_rect(self, i: int) -> pygame.Rect:
+        """
+        :param i: The number of a line, counting every line written.
+        :return: The area of the scroll surface holding the line.
+        """
+        return pygame.Rect(0, i % self.CAPACITY * self.LINE_H, self.LINE_W, self.LINE_H)
+
+    def draw_lines(
+        self, surface: pygame.Surface, position: tuple[int, int], start: int, stop: int
+    ):
+        """
+        :param start: The first line to draw, counting from the oldest line kept.
+        :param stop: The line to stop before.
+        """
+        first = self.count - self.num_lines
+        x, y = position
+        for i in range(first + start, first + stop):
+            surface.blit(self.surface, (x, y), self.get_slot_rect(i))
+            y += self.LINE_H
 
 
 class DungeonMessageLog:
@@ -136,9 +218,10 @@ class DungeonMessageLog:
             self.NUM_LINES * self.message_list.LINE_H,
         )
         self.cursor = 0
+        self.render_target = RenderTarget(self.frame.get_size(), pygame.SRCALPHA)
 
     def scroll_up(self):
-        if self.cursor < len(self.message_list.lines) - self.NUM_LINES:
+        if self.cursor < self.message_list.num_lines - self.NUM_LINES:
             self.cursor += 1
 
     def scroll_down(self):
@@ -146,21 +229,12 @@ class DungeonMessageLog:
             self.cursor -= 1
 
     def render(self) -> pygame.Surface:
-        surface = self.frame.copy()
-        bottom = self.message_list.content_rect.bottom
-        message_list_visible_rect = pygame.Rect(
-            0,
-            max(
-                0,
-                bottom
-                - self.container_rect.height
-                - self.cursor * self.message_list.LINE_H,
-            ),
-            self.message_list.LINE_W,
-            min(self.message_list.content_rect.height, self.container_rect.height),
-        )
-        surface.blit(
-            self.message_list.render().subsurface(message_list_visible_rect),
-            self.container_rect,
-        )
+        surface = self.render_target.surface
+        if not self.render_target.is_stale((self.message_list.count, self.cursor)):
+            return surface
+        surface.fill(constants.TRANSPARENT)
+        surface.blit(self.frame, (0, 0))
+        stop = self.message_list.num_lines - self.cursor
+        start = max(0, stop - self.NUM_LINES)
+        self.message_list.draw_lines(surface, self.container_rect.topleft, start, stop)
         return surface
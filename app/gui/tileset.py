@@ -4,7 +4,7 @@ import dataclasses
 import pygame
 
 from app.dungeon.tile_type import TileType
-from app.model.palette_animation import PaletteAnimation
+from app.model.palette_animation import PALETTE_SIZE, PaletteAnimation
 from app.dungeon.terrain import Terrain
 
 
@@ -268,6 +268,44 @@ tile_masks = {
 }
 
 
+NUM_MASKS = 256
+NUM_VARIATIONS = 3
+
+
+def tile_index(tile_type: TileType, mask: int, variation: int = 0) -> int:
+    """
+    :return: The index of the tile in the flat table of a tileset.
+    """
+    return (tile_type.value * NUM_MASKS + mask) * NUM_VARIATIONS + variation
+
+
+def slice_tiles(
+    tileset_surfaces: tuple[pygame.Surface], tile_size: int, invalid_color: pygame.Color
+) -> tuple[tuple[pygame.Surface, pygame.Rect]]:
+    """
+    Slices every tile of the tileset once, in the order of tile_index. Variations
+    missing from the tileset, marked by the invalid colour, fall back to the
+    first variation.
+
+    Tiles are kept as a sheet and the area of the tile on it rather than as
+    subsurfaces, since a subsurface takes a copy of the palette and would miss
+    the palette animations of the sheet.
+
+    :return: The (sheet, area) of every tile.
+    """
+    tiles = []
+    for tile_type in TileType:
+        for mask in range(NUM_MASKS):
+            x, y = tile_masks[mask]
+            x += 6 * tile_type.value
+            area = pygame.Rect(x * tile_size, y * tile_size, tile_size, tile_size)
+            for v in range(NUM_VARIATIONS):
+                if v and tileset_surfaces[v].get_at(area.topleft) == invalid_color:
+                    v = 0
+                tiles.append((tileset_surfaces[v], area))
+    return tuple(tiles)
+
+
 @dataclasses.dataclass(frozen=True)
 class Tileset:
     tileset_surfaces: tuple[pygame.Surface]
@@ -278,51 +316,39 @@ class Tileset:
     terrains: dict[TileType, Terrain]
     minimap_color: TileType
     underwater: bool
+    tiles: tuple[tuple[pygame.Surface, pygame.Rect]]
 
     def get_terrain(self, tile_type: TileType) -> Terrain:
         return self.terrains[tile_type]
 
-    def __getitem__(self, position: tuple[tuple[int, int], int]) -> pygame.Surface:
-        (x, y), v = position
-        if self.is_valid(position):
-            return self.tileset_surfaces[v].subsurface(
-                (x * self.tile_size, y * self.tile_size),
-                (self.tile_size, self.tile_size),
-            )
-        return self.tileset_surfaces[0].subsurface(
-            (x * self.tile_size, y * self.tile_size),
-            (self.tile_size, self.tile_size),
-        )
-
-    def get_tile_position(
-        self,
-        tile_type: TileType,
-        mask: int,
-        variation: int = 0,
-    ) -> tuple[tuple[int, int], int]:
-        return (self.get_position(tile_type, mask), variation)
+    def __getitem__(self, index: int) -> tuple[pygame.Surface, pygame.Rect]:
+        """
+        :param index: The tile_index of the tile.
+        :return: The sheet of the tile and its area, to blit from.
+        """
+        return self.tiles[index]
 
-    def get_position(self, tile_type: TileType, mask: int) -> tuple[int, int]:
-        x, y = tile_masks[mask]
-        return (x + 6 * tile_type.value, y)
+    def get_border_tile(self) -> tuple[pygame.Surface, pygame.Rect]:
+        # The first variation of a wall surrounded by walls.
+        return self.tiles[tile_index(TileType.PRIMARY, 255)]
 
-    def get_border_tile(self) -> pygame.Surface:
-        return self[(1, 1), 0]
-
-    def is_valid(self, position: tuple[tuple[int, int], int]) -> bool:
-        (x, y), v = position
-        if v == 0:
-            return True
-        topleft = (x * self.tile_size, y * self.tile_size)
-        return self.tileset_surfaces[v].get_at(topleft) != self.invalid_color
-
-    def update(self):
-        if self.animation_10 is not None:
-            self.animation_10.update()
-            for surf in self.tileset_surfaces:
-                self.animation_10.set_palette(surf, 10)
+    def update(self) -> set[int]:
+        """
+        Advances the palette animations of the tileset.
 
-        if self.animation_11 is not None:
-            self.animation_11.update()
+        :return: The palette indices changed.
+        """
+        changed = set()
+        for animation, animation_index in (
+            (self.animation_10, 10),
+            (self.animation_11, 11),
+        ):
+            if animation is None:
+                continue
+            indices = animation.update()
+            if not indices:
+                continue
             for surf in self.tileset_surfaces:
-                self.animation_11.set_palette(surf, 11)
+                animation.set_palette(surf, animation_index, indices)
+            changed.update(animation_index * PALETTE_SIZE + i for i in indices)
+        return changed
@@ -1,5 +1,4 @@
 import pygame
-from app.model.animation import Animation
 
 
 PALETTE_SIZE = 16
@@ -11,6 +10,10 @@ class PaletteAnimation:
     Palettes: List of palettes.
     Durations: This does NOT represent how long a palette is held for. Instead,
                it measures how long each color in the palette is held for.
+
+    Each colour steps through its frames every `duration` ticks, so update
+    knows from the tick alone which colours change, and only those are pushed
+    to surfaces.
     """
 
     def __init__(self, palettes: list[list[pygame.Color]], durations: list[int]):
@@ -18,24 +21,44 @@ class PaletteAnimation:
         for palette in palettes:
             assert len(palette) == PALETTE_SIZE
 
+        # Colours are kept as tuples, ready for Surface.set_palette_at.
         self.color_frames = [
-            [palette[i] for palette in palettes] for i in range(PALETTE_SIZE)
+            [tuple(palette[i]) for palette in palettes] for i in range(PALETTE_SIZE)
         ]
-        self.durations = [[t] * len(palettes) for t in durations]
+        self.durations = list(durations)
+        self.tick = 0
+        self.palette = [frames[0] for frames in self.color_frames]
 
-        self.animations = [
-            Animation(frames, durations)
-            for frames, durations in zip(self.color_frames, self.durations)
-        ]
+    def update(self) -> list[int]:
+        """
+        Advances the animation by a tick.
 
-    def update(self):
-        for anim in self.animations:
-            anim.update()
+        :return: The indices of the colours changed by the tick.
+        """
+        self.tick += 1
+        changed = []
+        for i, duration in enumerate(self.durations):
+            if self.tick % duration:
+                continue
+            frames = self.color_frames[i]
+            color = frames[self.tick // duration % len(frames)]
+            if color != self.palette[i]:
+                self.palette[i] = color
+                changed.append(i)
+        return changed
 
-    def current_palette(self) -> list[pygame.Color]:
-        return [anim.get_current_frame() for anim in self.animations]
+    def current_palette(self) -> list[tuple[int, int, int, int]]:
+        return self.palette
 
-    def set_palette(self, surf: pygame.Surface, animation_index: int):
-        palette = self.current_palette()
-        for i in range(PALETTE_SIZE):
-            surf.set_palette_at(animation_index * PALETTE_SIZE + i, palette[i])
+    def set_palette(
+        self,
+        surf: pygame.Surface,
+        animation_index: int,
+        indices: list[int] = range(PALETTE_SIZE),
+    ):
+        """
+        :param indices: The colours to push, all of them by default.
+        """
+        offset = animation_index * PALETTE_SIZE
+        for i in indices:
+            surf.set_palette_at(offset + i, self.palette[i])
@@ -10,6 +10,8 @@ from app.dungeon.battle_system import BattleSystem
 from app.dungeon.movement_system import MovementSystem
 from app.dungeon.dungeon import Dungeon
 from app.dungeon.dungeon_data import DungeonData
+from app.dungeon import floor_pregenerator
+from app.dungeon.floor_pregenerator import PendingFloor
 from app.dungeon.menu.dungeon_menu import DungeonMenu
 from app.dungeon.dungeon_map import DungeonMap
 from app.dungeon.minimap import Minimap
@@ -26,28 +28,47 @@ from app.pokemon.animation_id import AnimationId
 from app.pokemon.status_effect import StatusEffect
 from app.scenes.scene import Scene
 from app.scenes import main_menu_scene
-import app.db.floor_data as floor_data_db
 import app.db.database as main_db
 import app.db.font as font_db
 import app.db.colormap as colormap_db
 import app.db.shadow as shadow_db
 from app.gui import text
+from app.gui.render_target import RenderTarget, allocate
 from app.dungeon.darkness_level import DarknessLevel
 from app.item.inventory import Inventory
 
 
 class FloorTransitionScene(Scene):
+    LOADING_FRAMES_PER_DOT = 15
+
     def __init__(
-        self, dungeon_data: DungeonData, floor_num: int, party: Party, inventory: Inventory
+        self,
+        dungeon_data: DungeonData,
+        floor_num: int,
+        party: Party,
+        inventory: Inventory,
+        pending_floor: PendingFloor = None,
+        run_seed: int = None,
     ):
         super().__init__(60, 60)
         self.dungeon_data = dungeon_data
         self.floor_num = floor_num
         self.party = party
         self.inventory = inventory
+        self.run_seed = constants.RNG.getrandbits(32) if run_seed is None else run_seed
+
+        if pending_floor is None:
+            pending_floor = floor_pregenerator.submit(
+                self.dungeon_data.dungeon_id, self.floor_num, self.run_seed
+            )
+        self.pending_floor = pending_floor
+        self.loading_frames = 0
 
         self.dungeon_name_banner = self.get_dungeon_name_banner()
         self.floor_num_banner = self.get_floor_num_banner()
+        self.loading_surfaces = [
+            text.TextBuilder.build_white("Loading" + "." * i).render() for i in range(4)
+        ]
 
     def get_dungeon_name_banner(self) -> pygame.Surface:
         return (
@@ -69,18 +90,34 @@ class FloorTransitionScene(Scene):
             .render()
         )
 
+    @property
+    def is_loading(self) -> bool:
+        return self.pending_floor is not None and not self.pending_floor.done()
+
     def update(self):
         super().update()
         if self.in_transition:
             return
+        if self.is_loading:
+            self.loading_frames += 1
+            return
         for p in self.party:
             p.status.restore_stats()
             p.status.restore_status()
 
         try:
-            floor_data = floor_data_db.load(self.dungeon_data.dungeon_id, self.floor_num)
+            if self.pending_floor is None:
+                raise ValueError(f"Floor {self.floor_num} does not exist.")
+            floor_data = self.pending_floor.data
             mixer.set_bgm(floor_data.bgm)
-            dungeon = Dungeon(self.dungeon_data, floor_data, self.party, self.inventory)
+            dungeon = Dungeon(
+                self.dungeon_data,
+                floor_data,
+                self.party,
+                self.inventory,
+                self.pending_floor.result(),
+                self.run_seed,
+            )
         except Exception as e:
             print(f"Could not load next floor: {e}")
             self.next_scene = main_menu_scene.MainMenuScene()
@@ -97,6 +134,10 @@ class FloorTransitionScene(Scene):
         rect = self.floor_num_banner.get_rect(center=(cx, rect.bottom + 24))
         surface.blit(self.floor_num_banner, rect.topleft)
 
+        if self.loading_frames:
+            dots = self.loading_frames // self.LOADING_FRAMES_PER_DOT % 4
+            surface.blit(self.loading_surfaces[dots], (8, 176))
+
         return surface
 
 
@@ -110,13 +151,22 @@ class DungeonScene(Scene):
     def __init__(self, dungeon: Dungeon):
         super().__init__(30, 30)
         self.dungeon = dungeon
-        self.dungeonmap = DungeonMap(self.dungeon)
+        self.dungeonmap = DungeonMap(
+            self.dungeon.floor, self.dungeon.dungeon_data.is_below
+        )
         self.minimap = Minimap(
             self.dungeon.floor, self.dungeon.floor.tileset.minimap_color
         )
         self.hud = Hud(dungeon)
         self.dungeon_log = DungeonTextBox()
         self.message_log = DungeonMessageLog()
+        # The darkness last drawn, with what it was drawn for.
+        self.darkness: tuple = None
+        # The darkness of a view straying from the darkness last drawn.
+        self.darkness_target = RenderTarget(constants.DISPLAY_SIZE, pygame.SRCALPHA)
+        self.filter_target = RenderTarget(constants.DISPLAY_SIZE, pygame.SRCALPHA)
+        # The areas of each sprite frame drawn and of its shadow, by frame.
+        self.sprite_frames: dict[tuple[pygame.Surface, bool], tuple] = {}
 
         self.event_queue: deque[Event] = deque()
         self.battle_system = BattleSystem(self.dungeon)
@@ -131,6 +181,13 @@ class DungeonScene(Scene):
 
         self.set_camera_target(self.dungeon.party.leader)
 
+        # Start building the next floor while this one is played.
+        self.next_floor = floor_pregenerator.submit(
+            self.dungeon.dungeon_data.dungeon_id,
+            self.dungeon.floor_data.floor_number + 1,
+            self.dungeon.run_seed,
+        )
+
         # Main Dungeon Menu
         self.menu = DungeonMenu(self.dungeon, self.battle_system, self.message_log)
 
@@ -231,6 +288,8 @@ class DungeonScene(Scene):
             self.dungeon.floor_data.floor_number + 1,
             self.dungeon.party,
             self.dungeon.inventory,
+            self.next_floor,
+            self.dungeon.run_seed,
         )
 
     def update_processing(self):
@@ -298,7 +357,7 @@ class DungeonScene(Scene):
             p.update()
         self.hud.update()
         self.dungeon_log.update()
-        self.dungeon.floor.tileset.update()
+        self.dungeonmap.update_palette(self.dungeon.floor.tileset.update())
         self.minimap.update()
         self.set_camera_target(self.dungeon.party.leader)
 
@@ -312,10 +371,10 @@ class DungeonScene(Scene):
 
         floor_surface = self.dungeonmap.render(self.camera)
         floor_surface = self.render_sprites(floor_surface)
-        floor_surface = floor_surface.subsurface(self.camera)
 
         surface.blit(floor_surface, (0, 0))
-        surface.blit(self.get_darkness_surface(), (0, 0))
+        darkness, area = self.get_darkness_surface()
+        surface.blit(darkness, (0, 0), area)
         surface.blit(self.get_filter_surface(), (0, 0))
 
         surface.blit(self.hud.render(), (0, 0))
@@ -328,32 +387,66 @@ class DungeonScene(Scene):
 
         return surface
 
+    def get_sprite_frame(
+        self, pokemon: Pokemon
+    ) -> tuple[pygame.Surface, pygame.Rect, pygame.Surface, pygame.Rect]:
+        """
+        :return: The current sprite of the Pokemon and its area centred on
+                 (0, 0), then its shadow and the area of the shadow relative to
+                 the centre of the sprite. These are worked out once per frame
+                 of the sprite sheet.
+        """
+        sprite_surface = pokemon.render()
+        key = sprite_surface, pokemon.is_enemy
+        if key not in self.sprite_frames:
+            sprite_rect = sprite_surface.get_rect(center=(0, 0))
+            shadow_surface = shadow_db.get_dungeon_shadow(
+                pokemon.sprite.shadow_size, pokemon.is_enemy
+            )
+            shadow_rect = shadow_surface.get_rect(
+                center=pygame.Vector2(sprite_rect.topleft)
+                + pygame.Vector2(pokemon.sprite.current_shadow_position)
+            )
+            self.sprite_frames[key] = (
+                sprite_surface,
+                sprite_rect,
+                shadow_surface,
+                shadow_rect,
+            )
+        return self.sprite_frames[key]
+
     def render_sprites(self, floor_surface: pygame.Surface) -> pygame.Surface:
+        """
+        :param floor_surface: The floor in view, drawn at the camera position.
+        """
         TILE_SIZE = self.dungeon.floor.tileset.tile_size
         tile_rect = pygame.Rect(0, 0, TILE_SIZE, TILE_SIZE)
-
-        for pokemon in sorted(self.dungeon.floor.spawned, key=lambda s: s.y):
-            tile_rect.x = pokemon.moving_entity.x
-            tile_rect.y = pokemon.moving_entity.y
-
-            sprite_surface = pokemon.render()
-            sprite_rect = sprite_surface.get_rect(center=tile_rect.center)
-
+        offset = -self.camera.x, -self.camera.y
+
+        # Cull first, so that the depth order is only kept for the Pokemon in
+        # view. The sort is stable, so Pokemon on the same row keep the order
+        # they were spawned in.
+        in_view = []
+        for pokemon in self.dungeon.floor.spawned:
+            frame = self.get_sprite_frame(pokemon)
+            sprite_rect = frame[1].move(
+                pokemon.moving_entity.x + TILE_SIZE // 2,
+                pokemon.moving_entity.y + TILE_SIZE // 2,
+            )
             if sprite_rect.colliderect(self.camera):
-                shadow_surface = shadow_db.get_dungeon_shadow(
-                    pokemon.sprite.shadow_size, pokemon.is_enemy
-                )
-                shadow_rect = shadow_surface.get_rect(
-                    center=pygame.Vector2(sprite_rect.topleft)
-                    + pygame.Vector2(pokemon.sprite.current_shadow_position)
-                )
+                in_view.append((pokemon, frame, sprite_rect))
+        in_view.sort(key=lambda p: p[0].y)
 
-                floor_surface.blit(shadow_surface, shadow_rect)
-                if not (
-                    pokemon.status.has_status_effect(StatusEffect.DIGGING)
-                    and pokemon.animation_id is AnimationId.IDLE
-                ):
-                    floor_surface.blit(sprite_surface, sprite_rect)
+        for pokemon, frame, sprite_rect in in_view:
+            sprite_surface, _, shadow_surface, shadow_rect = frame
+            floor_surface.blit(
+                shadow_surface, shadow_rect.move(sprite_rect.center).move(offset)
+            )
+            if not (
+                pokemon.status.has_status_effect(StatusEffect.DIGGING)
+                and pokemon.animation_id is AnimationId.IDLE
+            ):
+                floor_surface.blit(sprite_surface, sprite_rect.move(offset))
 
         if self.event_queue and isinstance(
             self.event_queue[0], game_event.StatAnimationEvent
@@ -368,97 +461,91 @@ class DungeonScene(Scene):
             )
 
             if move_rect.colliderect(self.camera):
-                floor_surface.blit(move_surface, move_rect)
+                floor_surface.blit(move_surface, move_rect.move(offset))
 
         return floor_surface
 
-    def get_darkness_surface(self) -> pygame.Surface:
-        TILE_SIZE = self.dungeon.floor.tileset.tile_size
+    def get_darkness_surface(self) -> tuple[pygame.Surface, pygame.Rect]:
+        """
+        The darkness only depends on the darkness level and the room of the
+        camera target, so it is drawn once when either changes and the view is
+        blitted from it each frame. In a room it is drawn over the lit area and
+        a view around it, and in a hallway over the view.
 
-        surface = pygame.Surface(
-            pygame.Vector2(
-                self.dungeon.floor.WIDTH + 10, self.dungeon.floor.HEIGHT + 10
-            ),
-            pygame.SRCALPHA,
+        :return: The darkness and the area of it in view, or None if all of it
+                 is in view.
+        """
+        TILE_SIZE = self.dungeon.floor.tileset.tile_size
+        darkness_level = self.dungeon.floor.status.darkness_level
+        room_index = self.dungeon.floor.get_room_index(self.camera_target.position)
+        key = darkness_level, room_index, self.camera.size
+
+        if self.darkness is None or self.darkness[0] != key:
+            surface = allocate(self.camera.size, pygame.SRCALPHA)
+            lit = region = None
+            room = self.dungeon.floor.rooms.get(room_index)
+            if darkness_level is DarknessLevel.NO_DARKNESS:
+                pass
+            elif room is not None:
+                # The camera is relative to a 5 tile margin around the floor,
+                # and the lit area extends one tile beyond the room on each
+                # side.
+                (x0, y0), (w, h) = room.topleft, room.size
+                lit = pygame.Rect(
+                    (x0 + 4) * TILE_SIZE,
+                    (y0 + 4) * TILE_SIZE,
+                    (w + 2) * TILE_SIZE,
+                    (h + 2) * TILE_SIZE,
+                )
+                region = lit.inflate(2 * self.camera.width, 2 * self.camera.height)
+                surface = allocate(region.size, pygame.SRCALPHA)
+                self.draw_room_darkness(surface, lit.move(-region.x, -region.y))
+            else:
+                self.draw_hallway_darkness(surface)
+            self.darkness = key, surface, lit, region
+
+        _, surface, lit, region = self.darkness
+        if region is None:
+            return surface, None
+        view = self.camera.move(-region.x, -region.y)
+        if surface.get_rect().contains(view):
+            return surface, view
+        # The view strays from the room, so the darkness is drawn for it alone.
+        surface = self.darkness_target.resize(self.camera.size)
+        self.draw_room_darkness(surface, lit.move(-self.camera.x, -self.camera.y))
+        return surface, None
+
+    def draw_room_darkness(self, surface: pygame.Surface, lit: pygame.Rect):
+        """
+        :param lit: The lit area of the room, relative to the surface.
+        """
+        # Fill does not clip rectangles reaching above or left of the surface,
+        # so clip the lit area to the surface first.
+        surface.fill((0, 0, 0, 128))
+        surface.fill((0, 0, 0, 0), lit.clip(surface.get_rect()))
+        top_left_arc = main_db.get_darkness_quarter(0)
+        top_right_arc = main_db.get_darkness_quarter(1)
+        bottom_left_arc = main_db.get_darkness_quarter(2)
+        bottom_right_arc = main_db.get_darkness_quarter(3)
+
+        surface.blit(top_left_arc, top_left_arc.get_rect(topleft=lit.topleft))
+        surface.blit(top_right_arc, top_right_arc.get_rect(topright=lit.topright))
+        surface.blit(
+            bottom_left_arc, bottom_left_arc.get_rect(bottomleft=lit.bottomleft)
+        )
+        surface.blit(
+            bottom_right_arc, bottom_right_arc.get_rect(bottomright=lit.bottomright)
         )
 
-        if self.dungeon.floor.status.darkness_level is DarknessLevel.NO_DARKNESS:
-            surface = pygame.transform.scale_by(surface, TILE_SIZE)
-            return surface.subsurface(self.camera)
-
-        x, y = self.camera_target.position
-        room_index = self.dungeon.floor[x, y].room_index
-
-        if room_index:
-            min_x = x
-            while self.dungeon.floor[min_x, y].room_index == room_index:
-                min_x -= 1
-            max_x = x
-            while self.dungeon.floor[max_x, y].room_index == room_index:
-                max_x += 1
-            min_y = y
-            while self.dungeon.floor[x, min_y].room_index == room_index:
-                min_y -= 1
-            max_y = y
-            while self.dungeon.floor[x, max_y].room_index == room_index:
-                max_y += 1
-            min_x += 5
-            max_x += 6
-            min_y += 5
-            max_y += 6
-
-            surface.fill((0, 0, 0, 128))
-            surface.fill(
-                (0, 0, 0, 0), pygame.Rect(min_x, min_y, max_x - min_x, max_y - min_y)
-            )
-            surface = pygame.transform.scale_by(surface, TILE_SIZE)
-            top_left_arc = main_db.get_darkness_quarter(0)
-            top_right_arc = main_db.get_darkness_quarter(1)
-            bottom_left_arc = main_db.get_darkness_quarter(2)
-            bottom_right_arc = main_db.get_darkness_quarter(3)
-
-            surface.blit(
-                top_left_arc,
-                top_left_arc.get_rect(topleft=(min_x * TILE_SIZE, min_y * TILE_SIZE)),
-            )
-            surface.blit(
-                top_right_arc,
-                top_right_arc.get_rect(topright=(max_x * TILE_SIZE, min_y * TILE_SIZE)),
-            )
-            surface.blit(
-                bottom_left_arc,
-                bottom_left_arc.get_rect(
-                    bottomleft=(min_x * TILE_SIZE, max_y * TILE_SIZE)
-                ),
-            )
-            surface.blit(
-                bottom_right_arc,
-                bottom_right_arc.get_rect(
-                    bottomright=(max_x * TILE_SIZE, max_y * TILE_SIZE)
-                ),
-            )
-
-        else:
-            surface.fill((0, 0, 0, 128))
-            surface = pygame.transform.scale_by(surface, TILE_SIZE)
-            circle = main_db.get_darkness()
-            hollow_square = pygame.Rect(
-                (
-                    self.camera.centerx - circle.get_width() // 2,
-                    self.camera.centery - circle.get_height() // 2,
-                ),
-                circle.get_size(),
-            )
-            surface.fill((0, 0, 0, 0), hollow_square)
-            surface.blit(circle, hollow_square)
-
-        return surface.subsurface(self.camera)
+    def draw_hallway_darkness(self, surface: pygame.Surface):
+        surface.fill((0, 0, 0, 128))
+        circle = main_db.get_darkness()
+        hollow_square = circle.get_rect(center=surface.get_rect().center)
+        surface.fill((0, 0, 0, 0), hollow_square.clip(surface.get_rect()))
+        surface.blit(circle, hollow_square)
 
     def get_filter_surface(self) -> pygame.Surface:
-        filter_surface = pygame.Surface(
-            (constants.DISPLAY_WIDTH, constants.DISPLAY_HEIGHT), pygame.SRCALPHA
-        )
-        filter_surface.fill(
-            colormap_db.get_filter_color(self.dungeon.floor.status.weather)
-        )
-        return filter_surface
+        color = colormap_db.get_filter_color(self.dungeon.floor.status.weather)
+        if self.filter_target.is_stale(tuple(color)):
+            self.filter_target.surface.fill(color)
+        return self.filter_target.surface
@@ -2,6 +2,7 @@ import pygame
 
 from app.common.inputstream import InputStream
 from app.common import constants
+from app.gui.render_target import RenderTarget
 
 
 class Scene:
@@ -11,6 +12,7 @@ class Scene:
         self.t = fade_in
         self.alpha = 0
         self._next_scene = None
+        self.render_target = RenderTarget(constants.DISPLAY_SIZE)
 
     @property
     def in_transition(self) -> bool:
@@ -42,4 +44,6 @@ class Scene:
             return
 
     def render(self) -> pygame.Surface:
-        return pygame.Surface(constants.DISPLAY_SIZE)
+        surface = self.render_target.surface
+        surface.fill(constants.BLACK)
+        return surface
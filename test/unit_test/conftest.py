@@ -0,0 +1,32 @@
+import types
+
+import pygame
+import pytest
+
+
+@pytest.fixture(scope="function")
+def surfaces(monkeypatch) -> types.SimpleNamespace:
+    """
+    Counts the surfaces made during a test: those constructed with
+    pygame.Surface, whether through render_target.allocate or directly, and
+    copies and subsurfaces of them. Surfaces made in C without the constructor,
+    such as pygame.transform results, font renders and loaded images, and
+    copies or subsurfaces of surfaces made before the test, are not counted.
+    """
+    counter = types.SimpleNamespace(allocated=0)
+
+    class CountedSurface(pygame.Surface):
+        def __init__(self, *args, **kwargs):
+            counter.allocated += 1
+            super().__init__(*args, **kwargs)
+
+        def copy(self) -> pygame.Surface:
+            counter.allocated += 1
+            return super().copy()
+
+        def subsurface(self, *args) -> pygame.Surface:
+            counter.allocated += 1
+            return super().subsurface(*args)
+
+    monkeypatch.setattr(pygame, "Surface", CountedSurface)
+    return counter
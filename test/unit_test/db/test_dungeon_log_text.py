@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.common import constants
+import app.db.dungeon_log_text as dungeon_log_text
+import app.db.font as font_db
+
+
+class FakeGender:
+    def get_font_string(self) -> str:
+        return "♂"
+
+
+def fake_pokemon(name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        base=SimpleNamespace(name=name),
+        is_enemy=True,
+        gender=FakeGender(),
+        name_color=constants.CYAN,
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fonts():
+    font_db.init_fonts()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def messages():
+    dungeon_log_text.messages.clear()
+
+
+def test_same_message_is_built_once():
+    a = dungeon_log_text.damage(fake_pokemon("Rattata"), 12)
+    b = dungeon_log_text.damage(fake_pokemon("Rattata"), 12)
+    assert a is b
+    assert a.render() is b.render()
+    assert dungeon_log_text.damage(fake_pokemon("Rattata"), 13) is not a
+
+
+def test_cache_is_bounded(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(dungeon_log_text, "MAX_MESSAGES", 2)
+    first = dungeon_log_text.gain_xp(fake_pokemon("Rattata"), 1)
+    dungeon_log_text.gain_xp(fake_pokemon("Rattata"), 2)
+    dungeon_log_text.gain_xp(fake_pokemon("Rattata"), 3)
+    assert len(dungeon_log_text.messages) == 2
+    assert dungeon_log_text.gain_xp(fake_pokemon("Rattata"), 1) is not first
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -14,6 +14,11 @@ def test_load_fails_for_invalid_dungeon():
         floor_data.load(dungeon_id=29832, floor_id=1)
 
 
+def test_has_floor_is_false_past_the_last_floor():
+    assert floor_data.has_floor(dungeon_id=0, floor_id=3)
+    assert not floor_data.has_floor(dungeon_id=0, floor_id=4)
+
+
 def test_load_floor_list_for_test_dungeon():
     result = floor_data.load_floor_list(dungeon_id=0)
     assert len(result) == 3
@@ -0,0 +1,48 @@
+import pytest
+
+from app.dungeon.darkness_level import DarknessLevel
+from app.dungeon.floor_data import FloorData
+from app.dungeon.structure import Structure
+from app.dungeon.trap import Trap
+from app.dungeon.weather import Weather
+
+
+@pytest.fixture(scope="module")
+def data():
+    return FloorData(
+        floor_number=3,
+        structure=Structure.MEDIUM_LARGE,
+        tileset=0,
+        bgm=0,
+        weather=Weather.CLEAR,
+        fixed_floor_id=0,
+        darkness_level=DarknessLevel.NO_DARKNESS,
+        room_density=6,
+        floor_connectivity=15,
+        initial_enemy_density=0,
+        dead_ends=0,
+        item_density=4,
+        trap_density=4,
+        extra_hallway_density=10,
+        buried_item_density=2,
+        water_density=3,
+        max_coin_amount=0,
+        shop=0,
+        monster_house=0,
+        sticky_item=0,
+        empty_monster_house=0,
+        hidden_stairs=0,
+        secondary_used=1,
+        secondary_percentage=20,
+        imperfect_rooms=0,
+        unkE=0,
+        kecleon_shop_item_positions=0,
+        hidden_stairs_type=0,
+        enemy_iq=0,
+        iq_booster_boost=0,
+        monster_list=[],
+        trap_list=[Trap.MUD_TRAP, Trap.STICKY_TRAP],
+        trap_weights=[1, 1],
+        item_list=[],
+        item_categories=[],
+    )
@@ -0,0 +1,33 @@
+import pytest
+
+from app.dungeon.chunk import (
+    CHUNK_SIZE,
+    chunk_of,
+    chunk_positions,
+    chunk_topleft,
+    chunks_in_rect,
+)
+
+
+def test_chunk_of():
+    assert chunk_of((0, 0)) == (0, 0)
+    assert chunk_of((CHUNK_SIZE - 1, CHUNK_SIZE)) == (0, 1)
+    assert chunk_topleft(chunk_of((40, 17))) == (32, 16)
+
+
+def test_chunks_in_rect():
+    assert list(chunks_in_rect((15, 0), (2, 1))) == [(0, 0), (1, 0)]
+    assert list(chunks_in_rect((0, 0), (CHUNK_SIZE, CHUNK_SIZE))) == [(0, 0)]
+    assert len(list(chunks_in_rect((-1, -1), (CHUNK_SIZE, 2)))) == 4
+    assert list(chunks_in_rect((0, 0), (0, 5))) == []
+
+
+def test_chunk_positions_are_clipped_to_floor():
+    positions = list(chunk_positions((1, 0), (20, 10)))
+    assert len(positions) == 4 * 10
+    assert min(positions) == (16, 0) and max(positions) == (19, 9)
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,74 @@
+import pygame
+import pytest
+
+import app.db.tileset as tileset_db
+from app.dungeon.dungeon_map import DungeonMap
+from app.dungeon.floor import Floor
+from app.dungeon.trap import Trap
+
+
+class FakeItem:
+    surface = pygame.Surface((16, 16))
+    surface.fill((255, 0, 0))
+
+
+@pytest.fixture(scope="function")
+def floor():
+    floor = Floor(24, 20)
+    for x in range(2, 20):
+        for y in range(3, 17):
+            floor[x, y].room_tile(1)
+    floor.update_tile_masks()
+    floor.stairs_spawn = (4, 4)
+    floor.tileset = tileset_db.load(0)
+    return floor
+
+
+def render(dungeon_map: DungeonMap, camera: pygame.Rect) -> bytes:
+    return pygame.image.tobytes(dungeon_map.render(camera), "RGB")
+
+
+def fresh_render(floor: Floor, like: DungeonMap, camera: pygame.Rect) -> bytes:
+    dungeon_map = DungeonMap(floor, True)
+    dungeon_map.variant_seed = like.variant_seed
+    return render(dungeon_map, camera)
+
+
+def test_dirty_tiles_are_baked_again(floor: Floor):
+    camera = pygame.Rect(72, 96, 256, 192)
+    dungeon_map = DungeonMap(floor, True)
+    before = render(dungeon_map, camera)
+
+    floor[5, 5].item_ptr = FakeItem()
+    floor[6, 5].trap = Trap.MUD_TRAP
+    floor[7, 6].secondary_tile()
+    floor.update_tile_masks((7, 6), (1, 1))
+
+    after = render(dungeon_map, camera)
+    assert after != before
+    assert after == fresh_render(floor, dungeon_map, camera)
+    assert not floor.tiles.dirty
+
+
+def test_only_recent_chunks_are_kept(floor: Floor):
+    dungeon_map = DungeonMap(floor, True)
+    dungeon_map.MAX_CHUNKS = 2
+    for x in range(0, 700, 100):
+        dungeon_map.render(pygame.Rect(x, x // 2, 256, 192))
+    assert len(dungeon_map.chunks) == 2
+    camera = pygame.Rect(0, 0, 256, 192)
+    assert render(dungeon_map, camera) == fresh_render(floor, dungeon_map, camera)
+
+
+def test_rendering_again_allocates_nothing(floor: Floor, surfaces):
+    dungeon_map = DungeonMap(floor, True)
+    camera = pygame.Rect(72, 96, 256, 192)
+    dungeon_map.render(camera)
+    allocated = surfaces.allocated
+    dungeon_map.render(camera.move(8, 8))
+    assert surfaces.allocated == allocated
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
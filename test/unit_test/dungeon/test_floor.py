@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from app.common.direction import Direction
+from app.dungeon import tile
+from app.dungeon.floor import Floor
+from app.dungeon.tile_type import TileType
+from app.gui.tileset import tile_masks
+
+
+@pytest.fixture(scope="function")
+def floor():
+    floor = Floor(8, 6)
+    for x in range(2, 5):
+        for y in range(1, 4):
+            floor[x, y].room_tile(1)
+    floor[5, 2].tertiary_tile()
+    return floor
+
+
+def test_tile_view_writes_through_to_arrays(floor: Floor):
+    floor[1, 1].secondary_tile()
+    assert floor.tiles.tile_type[1, 1] == TileType.SECONDARY.value
+    assert floor[1, 1].tile_type is TileType.SECONDARY
+
+
+def test_out_of_bounds_tile_is_impassable_primary(floor: Floor):
+    t = floor[-1, 0]
+    assert t.is_impassable
+    assert t.tile_type is TileType.PRIMARY
+    assert floor.is_impassable((8, 0))
+    assert not floor.is_room((-1, -1))
+
+
+def test_the_border_cannot_be_changed(floor: Floor):
+    border = floor[-1, 0]
+    border.room_tile(1)
+    border.is_impassable = False
+    border.pokemon_ptr = "pokemon"
+    border.item_ptr = "item"
+    for t in border, floor[8, 0]:
+        assert t.is_impassable
+        assert t.tile_type is TileType.PRIMARY
+        assert t.room_index == 0
+        assert t.pokemon_ptr is None
+        assert t.item_ptr is None
+    with pytest.raises(AttributeError):
+        border.is_impasable = False
+
+
+def test_object_pointers_are_sparse(floor: Floor):
+    floor[2, 2].pokemon_ptr = "pokemon"
+    assert floor.is_occupied((2, 2))
+    floor[2, 2].pokemon_ptr = None
+    assert not floor.is_occupied((2, 2))
+    assert not floor.tiles.pokemon
+
+
+def test_get_valid_spawn_locations(floor: Floor):
+    floor[3, 2].pokemon_ptr = "pokemon"
+    expected = [
+        (x, y)
+        for x in range(floor.WIDTH)
+        for y in range(floor.HEIGHT)
+        if floor[x, y].can_spawn and (x, y) != (3, 2)
+    ]
+    assert floor.get_valid_spawn_locations() == expected
+
+
+def test_find_rooms(floor: Floor):
+    floor.find_rooms({1: [2]})
+    room = floor.rooms[1]
+    assert room.topleft == (2, 1)
+    assert room.size == (3, 3)
+    assert len(room.tiles) == 9
+    assert room.exits == [(4, 2)]
+    assert room.merged == [2]
+    assert not room.is_shop
+    assert not floor[4, 2].can_spawn
+
+
+def test_get_room(floor: Floor):
+    floor.find_rooms()
+    assert floor.get_room((3, 3)) is floor.rooms[1]
+    assert floor.get_room((3, 3)).contains((4, 1))
+    assert floor.get_room((5, 2)) is None
+    assert floor.get_room((-1, 0)) is None
+
+
+def random_floor(seed: int) -> Floor:
+    generator = random.Random(seed)
+    floor = Floor(12, 9)
+    for t in floor:
+        t.tile_type = generator.choice(list(TileType))
+    return floor
+
+
+def reference_masks(floor: Floor, x: int, y: int) -> tuple[int, int]:
+    mask = tuple(
+        floor[x, y].tile_type is floor[x + d.x, y + d.y].tile_type
+        for d in sorted(Direction, key=lambda d: (d.y, d.x))
+    )
+    return tile.value(mask), tile.value(tuple(mask[i] for i in (1, 3, 4, 6)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_update_tile_masks_matches_per_tile_masks(seed: int):
+    floor = random_floor(seed)
+    floor.update_tile_masks()
+    for x in range(floor.WIDTH):
+        for y in range(floor.HEIGHT):
+            expected = reference_masks(floor, x, y)
+            assert (floor[x, y].tile_mask, floor[x, y].cardinal_tile_mask) == expected
+            assert floor[x, y].tile_mask in tile_masks
+
+
+def test_update_tile_masks_dirty_rect():
+    floor = random_floor(0)
+    floor.update_tile_masks()
+    for x in range(3, 6):
+        for y in range(0, 2):
+            floor[x, y].tertiary_tile()
+    floor.update_tile_masks((3, 0), (3, 2))
+    dirty = floor.tiles.tile_mask.copy(), floor.tiles.cardinal_tile_mask.copy()
+    floor.update_tile_masks()
+    assert (dirty[0] == floor.tiles.tile_mask).all()
+    assert (dirty[1] == floor.tiles.cardinal_tile_mask).all()
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
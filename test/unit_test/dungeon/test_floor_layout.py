@@ -0,0 +1,53 @@
+import pickle
+
+import pytest
+
+from app.dungeon.floor import Floor
+from app.dungeon.floor_layout import FloorLayout
+from app.dungeon.trap import Trap
+
+
+@pytest.fixture(scope="function")
+def floor():
+    floor = Floor(10, 8)
+    for x in range(2, 6):
+        for y in range(2, 5):
+            floor[x, y].room_tile(1)
+    floor[6, 3].tertiary_tile()
+    floor.update_tile_masks()
+    floor.find_rooms()
+    floor.stairs_spawn = (3, 3)
+    floor[2, 2].trap = list(Trap)[0]
+    return floor
+
+
+def test_layout_is_picklable(floor: Floor):
+    layout = pickle.loads(pickle.dumps(FloorLayout.from_floor(floor, {(4, 4): 183})))
+    assert layout.stairs_spawn == (3, 3)
+    assert layout.items == {(4, 4): 183}
+    assert layout.rooms == floor.rooms
+
+
+def test_layout_round_trip(floor: Floor):
+    layout = FloorLayout.from_floor(floor)
+    other = Floor(10, 8)
+    layout.apply(other)
+    assert (other.tiles.tile_type == floor.tiles.tile_type).all()
+    assert (other.tiles.tile_mask == floor.tiles.tile_mask).all()
+    assert (other.tiles.can_spawn == floor.tiles.can_spawn).all()
+    assert other.rooms == floor.rooms
+    assert other[2, 2].trap is floor[2, 2].trap
+    assert other.stairs_spawn == floor.stairs_spawn
+
+
+def test_layout_is_independent_of_floor(floor: Floor):
+    layout = FloorLayout.from_floor(floor)
+    floor[0, 0].tertiary_tile()
+    floor.rooms[1].exits.clear()
+    assert layout.tile_type[0, 0] != floor.tiles.tile_type[0, 0]
+    assert layout.rooms[1].exits
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
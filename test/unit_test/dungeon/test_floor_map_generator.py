@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from app.common.direction import Direction
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory
+from app.dungeon.floor_map_generator import FloorMapGenerator
+
+
+def line_of_rooms(data: FloorData, n: int) -> FloorMapGenerator:
+    generator = FloorMapGenerator(data, random.Random(0))
+    xs = [11 * i for i in range(n + 1)]
+    generator.init_grid((n, 1), xs, [4, 15])
+    for cell in generator.grid.get_cells():
+        cell.is_room = True
+    generator.create_rooms()
+    return generator
+
+
+def connect(generator: FloorMapGenerator, *xs: int):
+    for x in xs:
+        generator.connect_cell_in_direction((x, 0), Direction.EAST)
+    generator.create_hallways()
+
+
+def test_components_of_bordering_rooms_are_linked(data: FloorData):
+    generator = line_of_rooms(data, 4)
+    connect(generator, 0, 2)
+    assert len(generator.get_connected_components()) == 2
+    assert not generator.is_strongly_connected()
+
+    assert generator.repair_connectivity() == 1
+    assert generator.is_strongly_connected()
+
+
+def test_distant_components_are_grown_then_linked(data: FloorData):
+    generator = line_of_rooms(data, 5)
+    connect(generator, 0, 3)
+    assert not generator.grid[2, 0].is_connected
+
+    assert generator.repair_connectivity() == 1
+    assert generator.grid[2, 0].is_connected
+    assert not generator.is_strongly_connected()
+
+    assert generator.repair_connectivity() == 1
+    assert generator.is_strongly_connected()
+
+
+def test_unconnected_cells_do_not_count_as_components(data: FloorData):
+    generator = line_of_rooms(data, 3)
+    connect(generator, 0)
+    assert generator.is_strongly_connected()
+    assert generator.repair_connectivity() == 0
+
+
+def test_structure_is_connected_after_build(data: FloorData):
+    for seed in range(20):
+        factory = FloorFactory(data, None, random.Random(seed))
+        factory.build_floor_structure()
+        assert factory.floor_map_generator.is_strongly_connected()
+        assert factory.stats.floors == 1
+        assert factory.stats.attempts == 1 + factory.stats.regenerations
+
+
+class LastChoice(random.Random):
+    """
+    Always picks the last option and always passes chance rolls.
+    """
+
+    def choice(self, seq):
+        return seq[-1]
+
+    def randrange(self, *args):
+        return 0
+
+
+def test_dead_ends_are_connected_again(data: FloorData):
+    generator = FloorMapGenerator(data, LastChoice(0))
+    generator.init_grid((2, 2), [0, 11, 22], [0, 11, 22])
+    generator.connect_cell_in_direction((0, 0), Direction.EAST)
+
+    generator.remove_dead_ends()
+    assert generator.grid[0, 0].get_connection_count() == 2
+    assert generator.grid[0, 1].get_connections() == (Direction.NORTH,)
+
+
+def test_rooms_after_an_unmergeable_neighbour_can_merge(data: FloorData):
+    generator = FloorMapGenerator(data, LastChoice(0))
+    generator.init_grid((4, 1), [11 * i for i in range(5)], [4, 15])
+    for x in (0, 2, 3):
+        generator.grid.set_room_cell((x, 0))
+    generator.create_rooms()
+    connect(generator, 0, 2)
+
+    generator.merge_rooms()
+    assert not generator.grid[0, 0].is_merged
+    assert generator.grid[2, 0].is_merged and generator.grid[3, 0].is_merged
+
+
+def test_large_floor_scales_grid(data: FloorData):
+    factory = FloorFactory(data, None, random.Random(0), size=(224, 128))
+    factory.build_floor_structure()
+    grid = factory.floor_map_generator.grid
+    assert grid.density == 16
+    assert grid.xs[-1] <= 224 and grid.ys[-1] <= 128
+    assert factory.floor_map_generator.is_strongly_connected()
+    assert len(grid.get_room_cells()) > 2 * data.room_density
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,50 @@
+import types
+
+import pygame
+import pytest
+
+import app.db.hud_components as hud_components_db
+from app.dungeon.hud import Hud, ORANGE, YELLOW
+
+
+def value(v: int) -> types.SimpleNamespace:
+    return types.SimpleNamespace(value=v)
+
+
+@pytest.fixture(scope="function")
+def dungeon() -> types.SimpleNamespace:
+    leader = types.SimpleNamespace(
+        status=types.SimpleNamespace(
+            hp=types.SimpleNamespace(value=30, max_value=40), belly=value(50)
+        ),
+        stats=types.SimpleNamespace(hp=value(40), level=value(5)),
+    )
+    return types.SimpleNamespace(
+        party=types.SimpleNamespace(leader=leader),
+        floor_data=types.SimpleNamespace(floor_number=3),
+        dungeon_data=types.SimpleNamespace(is_below=True),
+    )
+
+
+def test_hud_is_only_drawn_again_on_change(dungeon: types.SimpleNamespace):
+    hud = Hud(dungeon)
+    before = pygame.image.tobytes(hud.render(), "RGBA")
+    hud.render_target.surface.fill((1, 2, 3, 4))
+    assert hud.render().get_at((0, 0)) == (1, 2, 3, 4)
+
+    dungeon.party.leader.status.hp.value = 29
+    after = pygame.image.tobytes(hud.render(), "RGBA")
+    assert after != before
+
+
+def test_label_palette_reaches_kept_components():
+    label = hud_components_db.get_f()
+    hud_components_db.set_palette_12(YELLOW)
+    assert label.get_palette_at(12) == YELLOW
+    hud_components_db.set_palette_12(ORANGE)
+    assert label.get_palette_at(12) == ORANGE
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import random
+
+import pytest
+
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory
+from app.dungeon.layout_batch import generate_layouts
+
+
+def test_layouts_match_single_floor_generation(data: FloorData):
+    seeds = [5, 1, 5, 9, 2]
+    with ThreadPoolExecutor(2) as executor:
+        layouts = list(generate_layouts(data, seeds, executor, 2, chunk_size=2))
+
+    assert len(layouts) == len(seeds)
+    for seed, layout in zip(seeds, layouts):
+        expected = FloorFactory(data, None, random.Random(seed)).create_layout()
+        assert (layout.tile_type == expected.tile_type).all()
+        assert layout.stairs_spawn == expected.stairs_spawn
+        assert layout.traps == expected.traps
+
+
+def test_layouts_are_streamed_from_processes(data: FloorData):
+    layouts = generate_layouts(data, range(100_000), max_workers=2, chunk_size=1)
+    first = next(layouts)
+    layouts.close()
+    with ProcessPoolExecutor(1) as executor:
+        expected = next(generate_layouts(data, [0], executor, 1))
+    assert (first.tile_type == expected.tile_type).all()
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,69 @@
+import pytest
+
+from app.dungeon.floor_data import FloorData
+from app.dungeon.floor_factory import FloorFactory, floor_seed
+from app.dungeon.layout_cache import LayoutCache
+
+
+def test_floor_seed_is_stable():
+    assert floor_seed(1, 2, 3) == floor_seed(1, 2, 3)
+    assert floor_seed(1, 2, 3) != floor_seed(1, 2, 4)
+
+
+def test_get_missing_layout(tmp_path):
+    cache = LayoutCache(str(tmp_path))
+    assert cache.get(0, 1, 42) is None
+    assert cache.misses == 1
+
+
+@pytest.mark.parametrize("contents", [b"", b"garbage", b"PK\x03\x04junk"])
+def test_corrupt_layout_is_a_miss(tmp_path, data: FloorData, contents: bytes):
+    cache = LayoutCache(str(tmp_path))
+    generated = cache.get_or_generate(data, 0, 42)
+    with open(cache.get_path(0, data.floor_number, 42), "wb") as f:
+        f.write(contents)
+    assert cache.get(0, data.floor_number, 42) is None
+    assert cache.misses == 2
+    cache.get_or_generate(data, 0, 42)
+    cached = cache.get(0, data.floor_number, 42)
+    assert (cached.tile_type == generated.tile_type).all()
+
+
+def test_get_or_generate_round_trip(tmp_path, data: FloorData):
+    cache = LayoutCache(str(tmp_path))
+    generated = cache.get_or_generate(data, 0, 42)
+    cached = cache.get_or_generate(data, 0, 42)
+    assert cache.hits == 1
+    assert (cached.tile_type == generated.tile_type).all()
+    assert (cached.tile_mask == generated.tile_mask).all()
+    assert (cached.can_spawn == generated.can_spawn).all()
+    assert cached.rooms == generated.rooms
+    assert cached.stairs_spawn == generated.stairs_spawn
+    assert cached.traps == generated.traps
+    assert cached.items == generated.items
+
+
+def test_second_run_is_served_from_the_cache(tmp_path, data: FloorData, monkeypatch):
+    generated = LayoutCache(str(tmp_path)).get_or_generate(data, 0, 42)
+
+    def build_floor_structure(self):
+        raise AssertionError("The floor structure was built again.")
+
+    monkeypatch.setattr(FloorFactory, "build_floor_structure", build_floor_structure)
+    cache = LayoutCache(str(tmp_path))
+    cached = cache.get_or_generate(data, 0, 42)
+    assert cache.hits == 1
+    assert cache.misses == 0
+    assert (cached.tile_type == generated.tile_type).all()
+
+
+def test_same_seed_gives_same_layout(tmp_path, data: FloorData):
+    a = LayoutCache(str(tmp_path / "a")).get_or_generate(data, 0, 7)
+    b = LayoutCache(str(tmp_path / "b")).get_or_generate(data, 0, 7)
+    assert (a.tile_type == b.tile_type).all()
+    assert a.traps == b.traps
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,68 @@
+import pygame
+import pytest
+
+from app.dungeon.floor import Floor
+from app.dungeon.minimap import Minimap
+
+
+class FakePokemon:
+    def __init__(self, position: tuple[int, int]):
+        self.position = position
+
+
+class FakeParty(list):
+    @property
+    def leader(self) -> FakePokemon:
+        return self[0]
+
+
+@pytest.fixture(scope="function")
+def floor():
+    floor = Floor(24, 20)
+    for x in range(2, 10):
+        for y in range(3, 10):
+            floor[x, y].room_tile(1)
+    for x in range(10, 20):
+        floor[x, 6].tertiary_tile()
+    floor.update_tile_masks()
+    floor.find_rooms()
+    floor.stairs_spawn = (4, 4)
+    floor.party = FakeParty([FakePokemon((5, 5)), FakePokemon((6, 5))])
+    floor.active_enemies = [FakePokemon((15, 6))]
+    return floor
+
+
+def render(minimap: Minimap) -> bytes:
+    return pygame.image.tobytes(minimap.render(), "RGBA")
+
+
+def fresh_render(floor: Floor, like: Minimap) -> bytes:
+    minimap = Minimap(floor, pygame.Color(0, 128, 255))
+    minimap.visible[:] = like.visible
+    return render(minimap)
+
+
+def test_revealing_a_room_reveals_its_border(floor: Floor):
+    minimap = Minimap(floor, pygame.Color(0, 128, 255))
+    minimap.set_visible((5, 5))
+    assert minimap.visible[1:11, 2:11].all()
+    assert minimap.visible.sum() == 10 * 9
+
+
+def test_render_draws_changes_since_the_last_render(floor: Floor):
+    minimap = Minimap(floor, pygame.Color(0, 128, 255))
+    minimap.update()
+    render(minimap)
+
+    floor.party.leader.position = (12, 6)
+    floor.active_enemies[0].position = (14, 6)
+    minimap.update()
+    assert render(minimap) == fresh_render(floor, minimap)
+
+    floor.party[1].position = (11, 6)
+    assert render(minimap) == fresh_render(floor, minimap)
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+import random
+
+import pytest
+
+from app.dungeon.floor import Floor
+from app.dungeon.occupancy import Occupancy
+from app.dungeon.spawn_locations import SpawnLocations
+from app.dungeon.terrain import Terrain
+from app.dungeon.tile_type import TileType
+
+
+@dataclass(eq=False)
+class FakePokemon:
+    position: tuple[int, int]
+    is_enemy: bool = True
+
+
+class FakeTileset:
+    def get_terrain(self, tile_type: TileType) -> Terrain:
+        return Terrain.GROUND if tile_type is TileType.TERTIARY else Terrain.WALL
+
+
+@pytest.fixture(scope="function")
+def floor():
+    floor = Floor(12, 8)
+    for x in range(2, 6):
+        for y in range(2, 6):
+            floor[x, y].room_tile(1)
+    floor.update_spawn_locations()
+    return floor
+
+
+def spawn(occupancy: Occupancy, *ps: FakePokemon) -> list[FakePokemon]:
+    for p in ps:
+        occupancy.add(p)
+    return list(ps)
+
+
+def test_add_and_remove(floor: Floor):
+    occupancy = floor.occupancy
+    (p,) = spawn(occupancy, FakePokemon((3, 3)))
+    assert floor[3, 3].pokemon_ptr is p
+    assert occupancy.in_room(1) == [p]
+    assert occupancy.get_faction(True) == [p]
+
+    occupancy.remove(p)
+    assert not floor.is_occupied((3, 3))
+    assert occupancy.in_room(1) == []
+    assert occupancy.get_faction(True) == []
+    assert p not in occupancy
+
+
+def test_moving_between_rooms(floor: Floor):
+    occupancy = floor.occupancy
+    (p,) = spawn(occupancy, FakePokemon((5, 3)))
+    occupancy.remove(p)
+    p.position = (6, 3)
+    occupancy.add(p)
+    assert occupancy.in_room(1) == []
+    assert occupancy.in_room(0) == [p]
+    assert occupancy.at((6, 3)) is p
+
+
+def test_within_keeps_spawn_order(floor: Floor):
+    occupancy = floor.occupancy
+    ps = spawn(
+        occupancy,
+        FakePokemon((4, 4)),
+        FakePokemon((3, 3), is_enemy=False),
+        FakePokemon((9, 1)),
+    )
+    occupancy.remove(ps[0])
+    occupancy.add(ps[0])
+    assert occupancy.within((3, 4), 1) == ps[:2]
+    assert occupancy.within((3, 4), 10) == ps
+    assert occupancy.get_faction(False) == [ps[1]]
+
+
+def test_within_scans_grid_for_large_crowds(floor: Floor):
+    occupancy = floor.occupancy
+    ps = spawn(
+        occupancy, *(FakePokemon((x, y)) for x in range(12) for y in range(8))
+    )
+    assert occupancy.within((0, 0), 1) == [ps[0], ps[1], ps[8], ps[9]]
+
+
+def test_spawn_locations_follow_pokemon(floor: Floor):
+    spawn_locations = floor.spawn_locations
+    assert len(spawn_locations) == 16
+    (p,) = spawn(floor.occupancy, FakePokemon((3, 3)))
+    assert (3, 3) not in spawn_locations
+    assert len(spawn_locations) == 15
+
+    floor.occupancy.remove(p)
+    p.position = (8, 2)
+    floor.occupancy.add(p)
+    assert (3, 3) in spawn_locations
+    floor.occupancy.remove(p)
+    assert (8, 2) not in spawn_locations
+    assert sorted(spawn_locations) == floor.get_valid_spawn_locations()
+
+
+def test_spawn_locations_sample_every_location():
+    spawn_locations = SpawnLocations([(0, 0), (1, 0), (2, 0)])
+    spawn_locations.discard((0, 0))
+    spawn_locations.discard((0, 0))
+    generator = random.Random(0)
+    samples = {spawn_locations.sample(generator) for _ in range(50)}
+    assert samples == {(1, 0), (2, 0)}
+
+
+def test_local_pokemon_positions(floor: Floor):
+    floor.tileset = FakeTileset()
+    floor[8, 2].tertiary_tile()
+    spawn(floor.occupancy, FakePokemon((5, 5)), FakePokemon((8, 2)))
+    assert floor.get_local_pokemon_positions((2, 2)) == [(5, 5)]
+    assert floor.get_local_pokemon_positions((7, 2)) == [(8, 2)]
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,53 @@
+import pygame
+import pytest
+
+from app.common import constants
+from app.gui.font import Font
+
+SIZE = 4
+INK = 15
+
+
+@pytest.fixture(scope="function")
+def font() -> Font:
+    sheet = pygame.Surface((Font.CHARS_PER_ROW * SIZE, 8 * SIZE), 0, 8)
+    sheet.set_palette([constants.WHITE] * 256)
+    sheet.set_palette_at(INK, (16, 16, 16))
+    # "A" is a single dot of ink.
+    x, y = ord("A") % Font.CHARS_PER_ROW * SIZE, ord("A") // Font.CHARS_PER_ROW * SIZE
+    sheet.set_at((x, y), INK)
+    font = Font(sheet, {ord("A"): 3}).set_colorable(INK, constants.WHITE)
+    font.init()
+    return font
+
+
+def test_glyphs_are_cached(font: Font):
+    glyph = font.get_glyph("A", constants.CYAN, True)
+    assert font.get_glyph("A", constants.CYAN, True) is glyph
+    assert font.get_glyph("A", constants.CYAN, False) is not glyph
+
+
+def test_glyphs_are_drawn_in_color_with_shadow(font: Font):
+    glyph = font.get_glyph("A", constants.CYAN, True)
+    assert glyph.get_size() == (3, SIZE)
+    assert glyph.get_at((0, 0)) == constants.CYAN
+    assert glyph.get_at((1, 0)) == constants.BLACK
+    assert glyph.get_at((0, 1)) == constants.BLACK
+    assert glyph.get_at((1, 1)).a == 0
+
+
+@pytest.mark.parametrize("shadow", [False, True])
+def test_glyphs_in_the_colorkey_keep_the_sheet_color(font: Font, shadow: bool):
+    glyph = font.get_glyph("A", constants.WHITE, shadow)
+    assert glyph.get_at((0, 0)) == (16, 16, 16)
+
+
+def test_font_sheet_palette_is_unchanged(font: Font):
+    palette = font.font_sheet.get_palette()
+    font.get_glyph("A", constants.RED, True)
+    assert font.font_sheet.get_palette() == palette
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
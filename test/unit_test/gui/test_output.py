@@ -0,0 +1,39 @@
+import os
+
+import pygame
+import pytest
+
+from app.common import constants
+from app.gui.output import Output
+
+
+@pytest.fixture(scope="function", autouse=True)
+def display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    yield
+    pygame.display.quit()
+
+
+@pytest.mark.parametrize("scale", [0.5, 1, 2, 2.5])
+def test_frame_fills_the_window(scale: float):
+    output = Output(scale)
+    output.get_surface().fill(constants.RED)
+    output.present()
+    display = pygame.display.get_surface()
+    assert display.get_size() == tuple(
+        int(size * scale) for size in constants.DISPLAY_SIZE
+    )
+    w, h = display.get_size()
+    for corner in (0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1):
+        assert display.get_at(corner) == constants.RED
+
+
+def test_frame_is_drawn_to_the_window_at_scale_1():
+    output = Output(1)
+    assert output.get_surface() is pygame.display.get_surface()
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,40 @@
+import pygame
+import pytest
+
+from app.gui import render_target
+from app.gui.render_target import RenderTarget
+
+
+@pytest.fixture(scope="function")
+def target() -> RenderTarget:
+    return RenderTarget((8, 8), pygame.SRCALPHA)
+
+
+def test_is_stale_only_when_key_changes(target: RenderTarget):
+    assert target.is_stale(1)
+    assert not target.is_stale(1)
+    assert target.is_stale(2)
+
+
+def test_resize_allocates_only_on_new_size(target: RenderTarget, surfaces):
+    allocations = render_target.allocations
+    surface = target.resize((8, 8))
+    assert surface is target.surface
+    assert render_target.allocations == allocations
+    assert surfaces.allocated == 0
+    surface = target.resize((4, 4))
+    assert surface.get_size() == (4, 4)
+    assert surface.get_flags() & pygame.SRCALPHA
+    assert render_target.allocations == allocations + 1
+    assert surfaces.allocated == 1
+
+
+def test_resize_makes_surface_stale(target: RenderTarget):
+    target.is_stale(1)
+    target.resize((4, 4))
+    assert target.is_stale(1)
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
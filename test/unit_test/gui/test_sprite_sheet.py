@@ -0,0 +1,24 @@
+import pygame
+import pytest
+
+from app.common.direction import Direction
+from app.gui.sprite_sheet import SpriteSheet
+
+
+@pytest.fixture(scope="function")
+def sheet() -> SpriteSheet:
+    surface = pygame.Surface((3 * 8, 8 * 10))
+    shadow_positions = [[(4, 8)] * 3 for _ in range(8)]
+    return SpriteSheet("Walk", surface, (8, 10), [4, 4, 4], shadow_positions, {})
+
+
+def test_sprites_are_kept_per_frame(sheet: SpriteSheet):
+    sprite = sheet.get_sprite(Direction.EAST, 2)
+    assert sheet.get_sprite(Direction.EAST, 2) is sprite
+    assert sheet.get_sprite(Direction.WEST, 2) is not sprite
+    assert sprite.get_offset() == (16, sheet.get_row(Direction.EAST) * 10)
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
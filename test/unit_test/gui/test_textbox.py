@@ -0,0 +1,71 @@
+import pygame
+import pytest
+
+from app.gui.textbox import DungeonTextBox, MessageList
+
+
+class FakeText:
+    def __init__(self, shade: int):
+        self.surface = pygame.Surface((8, 13), pygame.SRCALPHA)
+        self.surface.fill((shade, shade, shade))
+
+    def render(self) -> pygame.Surface:
+        return self.surface
+
+
+@pytest.fixture(scope="function")
+def text_box() -> DungeonTextBox:
+    return DungeonTextBox()
+
+
+@pytest.fixture(scope="function")
+def message_list() -> MessageList:
+    return MessageList()
+
+
+def test_only_capacity_lines_are_kept(message_list: MessageList, surfaces):
+    texts = [FakeText(i) for i in range(256)]
+    allocated = surfaces.allocated
+    for i in range(10 * MessageList.CAPACITY):
+        message_list.write_line(texts[i % 256])
+    assert message_list.count == 10 * MessageList.CAPACITY
+    assert message_list.num_lines == MessageList.CAPACITY
+    assert surfaces.allocated == allocated
+
+
+def test_draw_lines_draws_the_lines_kept_in_order(message_list: MessageList):
+    for i in range(MessageList.CAPACITY + 3):
+        message_list.write_line(FakeText(i))
+    surface = pygame.Surface((MessageList.LINE_W, 2 * MessageList.LINE_H))
+    message_list.draw_lines(surface, (0, 0), 0, 2)
+    x, y = MessageList.OFFSET_X, MessageList.OFFSET_Y
+    assert surface.get_at((x, y)) == (3, 3, 3)
+    assert surface.get_at((x, y + MessageList.LINE_H)) == (4, 4, 4)
+
+
+def test_writing_many_messages_allocates_nothing(text_box: DungeonTextBox, surfaces):
+    messages = [FakeText(i).render() for i in range(256)]
+    allocated = surfaces.allocated
+    for i in range(5000):
+        if i % 3 == 0:
+            text_box.new_divider()
+        text_box.write(messages[i % 256])
+        text_box.update()
+        text_box.render()
+    assert text_box.height == 5000 * 13
+    assert surfaces.allocated == allocated
+
+
+def test_latest_message_scrolls_into_view(text_box: DungeonTextBox):
+    for i in range(10):
+        text_box.write(FakeText(i).render())
+    while text_box.t:
+        text_box.update()
+    assert text_box.display_area.bottom == text_box.height + 1
+    surface = text_box.render()
+    assert surface.get_at((12, 10 + text_box.display_area.h - 2)) == (9, 9, 9)
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
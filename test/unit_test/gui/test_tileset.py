@@ -0,0 +1,37 @@
+import pygame
+import pytest
+
+from app.dungeon.tile_type import TileType
+from app.gui.tileset import NUM_MASKS, NUM_VARIATIONS, slice_tiles, tile_index
+
+TILE_SIZE = 2
+INVALID = pygame.Color(255, 0, 255)
+
+
+@pytest.fixture(scope="function")
+def sheets():
+    sheets = tuple(pygame.Surface((18 * TILE_SIZE, 8 * TILE_SIZE)) for _ in range(3))
+    # Only the first tile of the walls has a second variation.
+    sheets[1].fill(INVALID)
+    sheets[1].fill((0, 0, 0), ((0, 0), (TILE_SIZE, TILE_SIZE)))
+    sheets[2].fill(INVALID)
+    return sheets
+
+
+def test_every_tile_is_sliced(sheets):
+    tiles = slice_tiles(sheets, TILE_SIZE, INVALID)
+    assert len(tiles) == len(TileType) * NUM_MASKS * NUM_VARIATIONS
+    assert tiles[tile_index(TileType.TERTIARY, 255)][1] == pygame.Rect(26, 2, 2, 2)
+
+
+def test_missing_variations_fall_back_to_the_first(sheets):
+    tiles = slice_tiles(sheets, TILE_SIZE, INVALID)
+    # Mask 11 is drawn with the top-left tile of the sheet.
+    assert tiles[tile_index(TileType.PRIMARY, 11, 1)][0] is sheets[1]
+    assert tiles[tile_index(TileType.PRIMARY, 11, 2)][0] is sheets[0]
+    assert tiles[tile_index(TileType.SECONDARY, 11, 1)][0] is sheets[0]
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,37 @@
+import pygame
+import pytest
+
+from app.model.palette_animation import PALETTE_SIZE, PaletteAnimation
+
+RED = pygame.Color(255, 0, 0)
+BLUE = pygame.Color(0, 0, 255)
+
+
+@pytest.fixture(scope="function")
+def animation() -> PaletteAnimation:
+    # Colour 0 alternates every 2 ticks, colour 1 every 3 ticks and the rest
+    # stay red.
+    first = [RED] * PALETTE_SIZE
+    second = [BLUE, BLUE] + [RED] * (PALETTE_SIZE - 2)
+    return PaletteAnimation([first, second], [2, 3] + [1] * (PALETTE_SIZE - 2))
+
+
+def test_update_reports_changed_colors(animation: PaletteAnimation):
+    assert [animation.update() for _ in range(6)] == [[], [0], [1], [0], [], [0, 1]]
+
+
+def test_set_palette_pushes_only_given_colors(animation: PaletteAnimation):
+    surface = pygame.Surface((1, 1), 0, 8)
+    surface.set_palette([(0, 0, 0)] * 256)
+    animation.update()
+    animation.update()
+    animation.set_palette(surface, 10, [1])
+    assert surface.get_palette_at(160) == (0, 0, 0, 255)
+    assert surface.get_palette_at(161) == RED
+    animation.set_palette(surface, 10)
+    assert surface.get_palette_at(160) == BLUE
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)
@@ -0,0 +1,150 @@
+import os
+import types
+
+import pygame
+import pytest
+
+import app.db.tileset as tileset_db
+from app.common import constants
+from app.dungeon.darkness_level import DarknessLevel
+from app.dungeon.dungeon_map import DungeonMap
+from app.dungeon.floor import Floor
+from app.dungeon.floor_status import FloorStatus
+from app.dungeon.hud import Hud
+from app.dungeon.minimap import Minimap
+from app.dungeon.weather import Weather
+from app.gui.render_target import RenderTarget
+from app.gui.textbox import DungeonTextBox
+from app.pokemon.animation_id import AnimationId
+from app.pokemon.shadow_size import ShadowSize
+from app.scenes.dungeon_scene import DungeonScene, GameState
+
+
+def value(v: int) -> types.SimpleNamespace:
+    return types.SimpleNamespace(value=v)
+
+
+class FakePokemon:
+    surface = pygame.Surface((24, 24), pygame.SRCALPHA)
+    surface.fill((255, 0, 0))
+
+    def __init__(self, position: tuple[int, int], is_enemy: bool):
+        self.position = position
+        self.is_enemy = is_enemy
+        self.moving_entity = types.SimpleNamespace(
+            x=(position[0] + 5) * 24, y=(position[1] + 5) * 24
+        )
+        self.sprite = types.SimpleNamespace(
+            shadow_size=ShadowSize.MEDIUM, current_shadow_position=(12, 20)
+        )
+        self.animation_id = AnimationId.IDLE
+        self.status = types.SimpleNamespace(
+            hp=types.SimpleNamespace(value=30, max_value=40),
+            belly=value(50),
+            has_status_effect=lambda effect: False,
+        )
+        self.stats = types.SimpleNamespace(hp=value(40), level=value(5))
+
+    @property
+    def y(self) -> int:
+        return self.position[1]
+
+    def render(self) -> pygame.Surface:
+        return self.surface
+
+
+class FakeParty(list):
+    @property
+    def leader(self) -> FakePokemon:
+        return self[0]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    # The darkness is converted for the display when it is loaded.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture(scope="function")
+def scene() -> DungeonScene:
+    floor = Floor(24, 20)
+    for x in range(2, 10):
+        for y in range(3, 10):
+            floor[x, y].room_tile(1)
+    for x in range(10, 20):
+        floor[x, 6].tertiary_tile()
+    floor.update_tile_masks()
+    floor.find_rooms()
+    floor.stairs_spawn = (4, 4)
+    floor.tileset = tileset_db.load(0)
+    floor.status = FloorStatus(DarknessLevel.HEAVY_DARKNESS, Weather.CLOUDY)
+    floor.party = FakeParty([FakePokemon((5, 5), False)])
+    floor.active_enemies = [FakePokemon((7, 6), True)]
+    floor.spawned = floor.party + floor.active_enemies
+
+    dungeon = types.SimpleNamespace(
+        floor=floor,
+        party=floor.party,
+        floor_data=types.SimpleNamespace(floor_number=3),
+        dungeon_data=types.SimpleNamespace(is_below=True),
+    )
+    # The scene is put together from the parts render uses, as building it
+    # whole starts the pregeneration of the next floor.
+    scene = object.__new__(DungeonScene)
+    scene.render_target = RenderTarget(constants.DISPLAY_SIZE)
+    scene.dungeon = dungeon
+    scene.dungeonmap = DungeonMap(floor, True)
+    scene.minimap = Minimap(floor, floor.tileset.minimap_color)
+    scene.hud = Hud(dungeon)
+    scene.dungeon_log = DungeonTextBox()
+    scene.darkness = None
+    scene.darkness_target = RenderTarget(constants.DISPLAY_SIZE, pygame.SRCALPHA)
+    scene.filter_target = RenderTarget(constants.DISPLAY_SIZE, pygame.SRCALPHA)
+    scene.sprite_frames = {}
+    scene.event_queue = []
+    scene.game_state = GameState.PLAYING
+    scene.set_camera_target(floor.party.leader)
+    return scene
+
+
+def test_rendering_again_allocates_nothing(scene: DungeonScene, surfaces):
+    scene.minimap.update()
+    scene.render()
+    allocated = surfaces.allocated
+    scene.render()
+    assert surfaces.allocated == allocated
+
+
+def test_walking_over_seen_ground_allocates_nothing(scene: DungeonScene, surfaces):
+    leader = scene.dungeon.party.leader
+    scene.minimap.update()
+    # The first visit to each chunk of the floor bakes it.
+    for dx in (0, 24, -24):
+        leader.moving_entity.x += dx
+        scene.set_camera_target(leader)
+        scene.render()
+    allocated = surfaces.allocated
+    for dx in (24, -24):
+        leader.moving_entity.x += dx
+        scene.set_camera_target(leader)
+        scene.render()
+    assert surfaces.allocated == allocated
+
+
+def test_view_straying_from_the_room_allocates_nothing(scene: DungeonScene, surfaces):
+    scene.minimap.update()
+    # The room darkness is drawn for the room and a view around it.
+    scene.camera.x += 2 * scene.camera.width
+    scene.render()
+    allocated = surfaces.allocated
+    scene.render()
+    assert surfaces.allocated == allocated
+
+
+if __name__ == "__main__":
+    import sys
+    pytest.main(sys.argv)